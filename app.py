@@ -1,42 +1,201 @@
 import streamlit as st
-import whisper
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.uploaded_file_manager import DeletedFile
 import tempfile
 import os
 import json
-import requests
 import numpy as np
 from datetime import datetime
 import time
-import re
-from io import BytesIO
-import base64
-import subprocess
+import uuid
+import sqlite3
 
-# Whisper 모델 로드
-@st.cache_resource
+import brand_extractor
+import config
+import crm_export
+from cache_store import DiskCache, file_sha256, make_cache_key
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+from live_ingest import FINISHED, LiveIngestServer
+from meeting_index import MeetingIndex
+from metrics import PrometheusFileExporter, get_metrics, merge_snapshots, render_prometheus
+from model_registry import PRECISIONS, get_registry, model_key
+from session_memory import SessionMemoryGovernor, SessionSweepThread
+from meeting_summary import PROMPT_VERSION
+from summarizer import segment_hash, segments_from_text
+from transcription import SEGMENT_FIELDS, splice_segments
+from upload_spool import SpoolFullError, UploadSpool
+
+# 세션 상태 키와 URL 파라미터 이름 (새로고침 후 작업 복구용)
+JOB_STATE_KEYS = [("transcribe_job_id", "transcribe_job"), ("refine_job_id", "refine_job"),
+                  ("summary_job_id", "summary_job"), ("batch_job_id", "batch_job")]
+
+# 변환 방식 선택지
+TRANSCRIBE_MODES = ["기본", "병렬 분할 (긴 미팅용)", "단계별 (빠른 초안 후 정밀 재변환)"]
+
+# 모델 크기 선택지
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]
+
+# 사이드바에서 고른 모델 크기와 추론 정밀도의 모델 키 (변환 캐시/레지스트리/지표를 정밀도별로 구분)
+def get_selected_model_key():
+    return model_key(st.session_state.get("model_size", config.DEFAULT_MODEL_SIZE),
+                     st.session_state.get("inference_mode", config.INFERENCE_MODE))
+
+# Whisper 모델 레지스트리 (메모리 예산 안에서 크기별 모델 상주, 프로세스당 하나)
+def get_model_registry():
+    return get_registry()
+
+# Whisper 모델 로드 (사용이 끝나면 release_whisper_model 호출)
 def load_whisper_model(model_size):
     try:
-        return whisper.load_model(model_size)
+        return get_model_registry().checkout(model_size)
     except Exception as e:
         st.error(f"모델 로드 실패: {e}")
         return None
 
-# 브랜드 이름 추출 함수
+# Whisper 모델 사용 종료 (참조가 없어지면 예산 초과 시 해제 대상이 됨)
+def release_whisper_model(model_size):
+    get_model_registry().release(model_size)
+
+# 변환 결과 디스크 캐시 (프로세스 내 모든 세션이 공유)
+@st.cache_resource
+def get_transcript_cache():
+    return DiskCache(
+        os.path.join(config.CACHE_DIR, "transcripts"),
+        config.TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+# 요약 결과 디스크 캐시 (TTL과 용량 한도로 정리)
+@st.cache_resource
+def get_summary_cache():
+    return DiskCache(
+        os.path.join(config.CACHE_DIR, "summaries"),
+        config.SUMMARY_CACHE_MAX_MB * 1024 * 1024,
+        ttl_seconds=config.SUMMARY_CACHE_TTL_SECONDS,
+    )
+
+# 변환/요약 백그라운드 작업 대기열 (워커 프로세스에서 실행, 동시 실행 수 제한)
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(
+        config.JOB_DB_PATH,
+        config.JOB_WORKERS,
+        poll_interval=config.JOB_POLL_SECONDS,
+        preload_model_size=model_key(config.DEFAULT_MODEL_SIZE, config.INFERENCE_MODE) if config.MODEL_PRELOAD else None,
+    )
+
+# 지난 미팅록/요약 검색 색인 (프로세스 내 모든 세션이 공유)
+@st.cache_resource
+def get_meeting_index():
+    return MeetingIndex(config.MEETING_INDEX_PATH)
+
+# 세일즈포스 내보내기 (설정이 없으면 None), 자동 전송 주기가 있으면 백그라운드 전송 스레드도 시작
+@st.cache_resource
+def get_crm_exporter():
+    if not crm_export.is_configured():
+        return None
+    exporter = crm_export.create_exporter()
+    if config.CRM_SYNC_SECONDS:
+        crm_export.CRMSyncThread(exporter, config.CRM_SYNC_SECONDS)
+    return exporter
+
+# 완성된 요약을 미팅록, 미팅 정보와 함께 검색 색인에 저장하고 세일즈포스 내보내기 대기열에 추가
+# (색인 실패로 요약 표시가 막히지 않도록 경고만)
+def index_meeting(transcript, summary, meeting_info, source="app"):
+    meeting_index = get_meeting_index()
+    try:
+        meeting_id = meeting_index.add(transcript, summary, meeting_info, source=source)
+        exporter = get_crm_exporter()
+        if exporter:
+            exporter.enqueue_meetings([meeting_index.get(meeting_id)])
+    except sqlite3.Error as e:
+        st.warning(f"미팅 검색 색인 저장 실패: {e}")
+
+# 업로드/녹음 오디오 스풀 (내용 해시로 중복 제거, 용량 한도와 TTL로 정리)
+@st.cache_resource
+def get_upload_spool():
+    return UploadSpool(
+        config.SPOOL_DIR,
+        config.SPOOL_QUOTA_MB * 1024 * 1024,
+        config.SPOOL_TTL_SECONDS,
+    )
+
+# 세션 상태 메모리 관리 (미팅록/요약 같은 큰 값은 한도를 넘거나 세션이 유휴 상태가 되면 디스크로)
+@st.cache_resource
+def get_session_memory():
+    governor = SessionMemoryGovernor(
+        os.path.join(config.SPOOL_DIR, "session"),
+        int(config.SESSION_MEMORY_MAX_MB * 1024 * 1024),
+        int(config.SESSION_MEMORY_TOTAL_MB * 1024 * 1024),
+        config.SESSION_IDLE_SECONDS,
+        config.SESSION_SPILL_MIN_KB * 1024,
+    )
+    if config.SESSION_SWEEP_SECONDS:
+        SessionSweepThread(governor, config.SESSION_SWEEP_SECONDS)
+    return governor
+
+# 세션 상태의 큰 값 읽기 (디스크로 내린 값은 이때 다시 불러옴)
+def session_value(key, default=None):
+    return get_session_memory().load(get_session_id(), get_script_run_ctx().session_state, key, default)
+
+# 스풀에 저장한 업로드 원본을 Streamlit 업로드 저장소(메모리)에서 내림
+# 위젯에는 DeletedFile로 남고, 이후 실행에서는 스풀 파일을 사용
+def release_uploaded_file(file_id):
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        ctx.uploaded_file_mgr.remove_file(ctx.session_id, file_id)
+
+# 실시간 녹음 수신 서버 (ffmpeg가 없거나 포트를 열 수 없으면 None, 이 경우 녹음 후 업로드 방식만 사용)
+@st.cache_resource
+def get_live_ingest():
+    if not config.LIVE_ENABLED or not LiveIngestServer.available():
+        return None
+    job_queue = get_job_queue()
+    try:
+        return LiveIngestServer(
+            config.LIVE_HOST or st.get_option("server.address") or "127.0.0.1", config.LIVE_PORT,
+            os.path.join(config.SPOOL_DIR, "live"), submit_live_window, job_queue.get,
+            allowed_origins=[origin.strip() for origin in config.LIVE_ALLOWED_ORIGINS.split(",")],
+            app_port=st.get_option("server.port"),
+        )
+    except OSError:
+        return None
+
+# 실시간 녹음의 완성된 창을 변환 작업으로 제출 (PCM은 DB 대신 .npy 파일로 전달)
+def submit_live_window(audio, offset, settings):
+    window_dir = os.path.join(config.SPOOL_DIR, "live")
+    fd, pcm_path = tempfile.mkstemp(suffix=".npy", dir=window_dir)
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, audio)
+    return get_job_queue().submit("transcribe_window", settings["session_id"], {
+        "pcm_path": pcm_path,
+        "offset": offset,
+        "model_size": settings["model_size"],
+        "language": settings["language"],
+        "vad": settings["vad"],
+    })
+
+# 세션 식별자 (스풀 파일 참조 추적용)
+def get_session_id():
+    if "session_id" not in st.session_state:
+        st.session_state["session_id"] = uuid.uuid4().hex
+    return st.session_state["session_id"]
+
+# 세션의 현재 오디오 파일을 교체하고 이전 파일 참조 해제
+def set_session_audio_file(path):
+    previous = st.session_state.get("audio_file")
+    if previous and previous != path:
+        get_upload_spool().release(get_session_id(), previous)
+    st.session_state["audio_file"] = path
+
+# 실시간 녹음 수신 서버에서 이 세션을 가리키는 토큰 (추측할 수 없도록 세션 id와 별도로 생성)
+def get_live_token():
+    if "live_token" not in st.session_state:
+        st.session_state["live_token"] = uuid.uuid4().hex
+    return st.session_state["live_token"]
+
+# 브랜드 이름 추출 함수 (사전 매칭 후 패턴 매칭, 언급 빈도순)
 def extract_brand_name(text):
-    # 브랜드명 추출 시도
-    brand_patterns = [
-        r'브랜드(?:명|는|측)?\s*(?:은|는|:)?\s*[\"\'"]?([^,\.\"\']+)[\"\'"]?',
-        r'([^,\.]+)?\s*브랜드',
-        r'([^,\.]+)?\s*회사'
-    ]
-    
-    for pattern in brand_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            # 가장 긴 매치를 선택 (보통 더 완전한 이름)
-            return max(matches, key=len).strip()
-    
-    return "미확인 브랜드"
+    return brand_extractor.extract_brand_name(text)
 
 # 복사 버튼을 위한 JavaScript 함수
 def get_copy_button_html():
@@ -97,7 +256,8 @@ def get_copy_button_html():
     """
 
 # 실시간 녹음을 위한 JavaScript 코드
-def get_audio_recorder_html():
+# live_token과 live_url/live_port가 있으면 녹음 조각을 수신 서버로 바로 보내 녹음 중에 변환
+def get_audio_recorder_html(live_token="", live_url="", live_port=0, chunk_ms=100):
     return """
     <style>
     .button {
@@ -137,6 +297,15 @@ def get_audio_recorder_html():
         background-color: #ddffdd;
         border-left: 6px solid #4CAF50;
     }
+    .live-transcript {
+        margin-top: 10px;
+        padding: 10px;
+        max-height: 160px;
+        overflow-y: auto;
+        background-color: #f7f7f7;
+        border-radius: 4px;
+        white-space: pre-wrap;
+    }
     .download-link {
         display: inline-block;
         margin: 10px 0;
@@ -154,6 +323,7 @@ def get_audio_recorder_html():
         <audio id="audio-playback" controls style="display:none;"></audio>
         <div id="download-container"></div>
         <div id="status-message" class="status-message"></div>
+        <div id="live-transcript" class="live-transcript" style="display:none;"></div>
     </div>
 
     <script>
@@ -162,6 +332,10 @@ def get_audio_recorder_html():
         const audioPlayback = document.getElementById('audio-playback');
         const statusMessage = document.getElementById('status-message');
         const downloadContainer = document.getElementById('download-container');
+        const liveTranscript = document.getElementById('live-transcript');
+        const LIVE_URL = __LIVE_URL__;
+        const LIVE_PORT = __LIVE_PORT__;
+        const CHUNK_MS = __CHUNK_MS__;
         
         let mediaRecorder;
         let audioChunks = [];
@@ -169,6 +343,60 @@ def get_audio_recorder_html():
         let timerInterval;
         let audioBlob;
         
+        // 수신 서버 주소: 설정값이 없으면 Streamlit 페이지와 같은 호스트의 LIVE_PORT
+        function liveBase() {
+            if (LIVE_URL) return LIVE_URL.replace(/\\/$/, '');
+            if (!LIVE_PORT) return '';
+            let hostname = 'localhost';
+            try {
+                hostname = window.parent.location.hostname;
+            } catch (e) {
+                if (document.referrer) hostname = new URL(document.referrer).hostname;
+            }
+            return `http://${hostname}:${LIVE_PORT}`;
+        }
+        
+        // 녹음 조각을 순서대로 전송 (base64 없이 Blob 그대로)
+        let liveEndpoint = '';
+        let liveChain = Promise.resolve();
+        let liveSeq = 0;
+        let liveFailed = false;
+        let livePoll;
+        
+        function livePost(action, body, query) {
+            liveChain = liveChain.then(() => fetch(`${liveEndpoint}/${action}${query || ''}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/octet-stream' },
+                body: body || new Blob(),
+            })).then((response) => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            }).catch((err) => {
+                console.error('실시간 전송 오류:', err);
+                liveFailed = true;
+            });
+            return liveChain;
+        }
+        
+        async function pollLiveStatus() {
+            try {
+                const response = await fetch(`${liveEndpoint}/status`);
+                if (!response.ok) return;
+                const status = await response.json();
+                if (status.transcript) {
+                    liveTranscript.style.display = 'block';
+                    liveTranscript.textContent = status.transcript;
+                    liveTranscript.scrollTop = liveTranscript.scrollHeight;
+                }
+                if (status.status === 'finished') {
+                    clearInterval(livePoll);
+                    statusMessage.className = "status-message success";
+                    statusMessage.textContent = "실시간 변환이 끝났습니다. 아래 '녹음 결과 가져오기' 버튼을 눌러 요약을 진행하세요.";
+                }
+            } catch (err) {
+                console.error('실시간 변환 상태 조회 오류:', err);
+            }
+        }
+        
         function updateTimer() {
             const now = new Date();
             const elapsedTime = now - startTime;
@@ -192,6 +420,12 @@ def get_audio_recorder_html():
             } else {
                 // 녹음 시작
                 audioChunks = [];
+                liveEndpoint = '';
+                liveFailed = false;
+                liveSeq = 0;
+                liveTranscript.textContent = '';
+                liveTranscript.style.display = 'none';
+                clearInterval(livePoll);
                 try {
                     const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
                     
@@ -199,8 +433,18 @@ def get_audio_recorder_html():
                     const mimeType = 'audio/webm';
                     mediaRecorder = new MediaRecorder(stream, { mimeType });
                     
+                    const base = liveBase();
+                    if (base) {
+                        liveEndpoint = `${base}/live/__LIVE_TOKEN__`;
+                        livePost('start');
+                        livePoll = setInterval(pollLiveStatus, 2000);
+                    }
+                    
                     mediaRecorder.ondataavailable = (event) => {
                         audioChunks.push(event.data);
+                        if (liveEndpoint && !liveFailed && event.data.size > 0) {
+                            livePost('chunk', event.data, `?seq=${liveSeq++}`);
+                        }
                     };
                     
                     mediaRecorder.onstop = () => {
@@ -224,31 +468,29 @@ def get_audio_recorder_html():
                         downloadLink.textContent = '녹음 파일 다운로드';
                         downloadContainer.appendChild(downloadLink);
                         
-                        // Base64 인코딩하여 Streamlit에 전달
-                        const reader = new FileReader();
-                        reader.readAsDataURL(audioBlob);
-                        reader.onloadend = () => {
-                            const base64data = reader.result.split(',')[1];
-                            
-                            // Streamlit과 커뮤니케이션
-                            window.parent.postMessage({
-                                type: "streamlit:setComponentValue",
-                                value: {
-                                    audio_data: base64data,
-                                    auto_process: true
+                        if (liveEndpoint && !liveFailed) {
+                            // 남은 조각을 보낸 뒤 수신 서버에 녹음 종료 알림 (마지막 창만 변환하면 끝남)
+                            livePost('finish').then(() => {
+                                if (liveFailed) {
+                                    clearInterval(livePoll);
+                                    statusMessage.className = "status-message info";
+                                    statusMessage.textContent = "실시간 변환 서버와 연결이 끊겼습니다. 파일을 다운로드한 후 '파일 업로드' 탭에서 업로드하세요.";
+                                } else {
+                                    statusMessage.className = "status-message info";
+                                    statusMessage.textContent = "마지막 구간을 변환하는 중입니다...";
                                 }
-                            }, "*");
-                            
-                            // 상태 메시지 업데이트
+                            });
+                        } else {
+                            clearInterval(livePoll);
                             statusMessage.className = "status-message success";
                             statusMessage.textContent = "녹음이 완료되었습니다! 파일을 다운로드한 후 '파일 업로드' 탭에서 업로드하세요.";
-                        };
+                        }
                         
                         // 오디오 트랙 중지
                         stream.getTracks().forEach(track => track.stop());
                     };
                     
-                    mediaRecorder.start(100);  // 100ms마다 데이터 수집
+                    mediaRecorder.start(CHUNK_MS);  // CHUNK_MS마다 데이터 수집
                     startTime = new Date();
                     timerInterval = setInterval(updateTimer, 1000);
                     recordButton.textContent = '녹음 중지';
@@ -256,7 +498,9 @@ def get_audio_recorder_html():
                     
                     // 상태 메시지 초기화
                     statusMessage.className = "status-message info";
-                    statusMessage.textContent = "녹음 중입니다. '녹음 중지' 버튼을 클릭하여 녹음을 완료하세요.";
+                    statusMessage.textContent = liveEndpoint
+                        ? "녹음 중입니다. 말하는 동안 텍스트로 변환하고 있습니다."
+                        : "녹음 중입니다. '녹음 중지' 버튼을 클릭하여 녹음을 완료하세요.";
                 } catch (err) {
                     console.error('마이크 접근 오류:', err);
                     statusMessage.className = "status-message error";
@@ -265,51 +509,78 @@ def get_audio_recorder_html():
             }
         });
     </script>
-    """
+    """.replace("__LIVE_URL__", json.dumps(live_url)).replace("__LIVE_PORT__", str(int(live_port))) \
+       .replace("__CHUNK_MS__", str(int(chunk_ms))).replace("__LIVE_TOKEN__", live_token)
 
 # 오디오를 텍스트로 변환하는 함수
 def process_audio_to_text():
     if "audio_file" in st.session_state and st.session_state["audio_file"] and os.path.exists(st.session_state["audio_file"]):
-        # Whisper 모델 로드
-        model = load_whisper_model(model_size)
-        if not model:
-            st.error("Whisper 모델을 로드할 수 없습니다.")
-            st.session_state["recorder_status"] = "error"
-            return False
+        model_size = get_selected_model_key()
+        parallel = st.session_state.get("transcribe_mode") == TRANSCRIBE_MODES[1]
+        cascade = st.session_state.get("transcribe_mode") == TRANSCRIBE_MODES[2]
+        vad = st.session_state.get("vad_enabled", bool(config.VAD_ENABLED))
         
         # 오디오 파일에서 텍스트 변환
         try:
-            with st.spinner("오디오를 텍스트로 변환 중..."):
-                audio_file = st.session_state["audio_file"]
-                
-                # 파일 존재 확인
-                if not os.path.exists(audio_file):
-                    st.error(f"파일을 찾을 수 없습니다: {audio_file}")
-                    st.session_state["recorder_status"] = "error"
-                    return False
-                
-                # 디버깅용 정보
-                file_size = os.path.getsize(audio_file)
-                st.info(f"오디오 파일 정보: 경로={audio_file}, 크기={file_size}바이트")
-                
-                # OpenAI Whisper 모델을 사용한 변환
-                try:
-                    result = model.transcribe(audio_file, language="ko")
-                    transcript = result["text"]
-                except Exception as e:
-                    st.error(f"Whisper 텍스트 변환 중 오류: {e}")
-                    import traceback
-                    st.error(f"상세 오류: {traceback.format_exc()}")
-                    return False
-                
-                if transcript:
-                    st.session_state["transcript_text"] = transcript
+            audio_file = st.session_state["audio_file"]
+            
+            # 파일 존재 확인
+            if not os.path.exists(audio_file):
+                st.error(f"파일을 찾을 수 없습니다: {audio_file}")
+                st.session_state["recorder_status"] = "error"
+                return False
+            
+            # 디버깅용 정보
+            file_size = os.path.getsize(audio_file)
+            st.info(f"오디오 파일 정보: 경로={audio_file}, 크기={file_size}바이트")
+            
+            # 같은 오디오/모델/언어 조합으로 변환한 결과가 있으면 재사용
+            transcript_cache = get_transcript_cache()
+            with get_metrics().stage("transcript_cache_lookup", bytes=file_size) as fields:
+                audio_sha256 = file_sha256(audio_file)
+                cache_key = make_cache_key(audio_sha256, model_size, "ko", vad)
+                if cascade:
+                    draft_model_size = model_key(config.CASCADE_DRAFT_MODEL,
+                                                 st.session_state.get("inference_mode", config.INFERENCE_MODE))
+                    draft_cache_key = cache_key if draft_model_size == model_size else \
+                        make_cache_key(audio_sha256, draft_model_size, "ko", vad)
+                    cache_key = make_cache_key(audio_sha256, model_size, "ko", vad, "cascade", draft_model_size)
+                cached = transcript_cache.get(cache_key)
+                fields["hits"] = 1 if cached and cached.get("text") else 0
+            if cached and cached.get("text"):
+                st.success("이전에 변환한 결과를 캐시에서 불러왔습니다.")
+                set_transcript(cached["text"], cached.get("segments", []))
+                st.session_state["recorder_status"] = "transcribed"
+                display_transcript()
+                return True
+            
+            # 단계별 변환: 작은 모델의 초안을 먼저 보여주고, 초안이 끝나면 재변환 작업을 이어서 제출
+            refine = None
+            if cascade and draft_model_size != model_size:
+                refine = {"model_size": model_size, "cache_key": cache_key}
+                model_size, cache_key = draft_model_size, draft_cache_key
+                draft = transcript_cache.get(cache_key)
+                if draft and draft.get("segments"):
+                    st.info("이전에 변환한 초안을 캐시에서 불러왔습니다. 신뢰도가 낮은 구간을 다시 변환합니다.")
+                    set_transcript(draft["text"], draft["segments"])
                     st.session_state["recorder_status"] = "transcribed"
-                    display_transcript()
+                    submit_refine_job(audio_file, draft["segments"], refine)
                     return True
-                else:
-                    st.error("텍스트 변환에 실패했습니다.")
-                    st.session_state["recorder_status"] = "error"
+
+            # OpenAI Whisper 변환은 백그라운드 작업으로 실행하고 상태는 poll_background_jobs에서 확인
+            job_id = get_job_queue().submit("transcribe", get_session_id(), {
+                "audio_file": audio_file,
+                "model_size": model_size,
+                "language": "ko",
+                "parallel": parallel,
+                "vad": vad,
+                "cache_key": cache_key,
+                "refine": refine,
+            })
+            st.session_state["transcribe_job_id"] = job_id
+            st.query_params["transcribe_job"] = job_id
+            st.session_state["recorder_status"] = "processing"
+            return True
         except Exception as e:
             st.error(f"텍스트 변환 처리 중 오류 발생: {e}")
             import traceback
@@ -321,19 +592,229 @@ def process_audio_to_text():
     
     return False
 
+# 초안에서 신뢰도가 낮은 구간을 선택한 모델로 다시 변환하는 작업 제출
+def submit_refine_job(audio_file, segments, refine):
+    job_id = get_job_queue().submit("refine", get_session_id(), {
+        "audio_file": audio_file,
+        "model_size": refine["model_size"],
+        "language": "ko",
+        "segments": [{key: segment.get(key) for key in SEGMENT_FIELDS} for segment in segments],
+        "cache_key": refine["cache_key"],
+    })
+    st.session_state["refine_job_id"] = job_id
+    st.query_params["refine_job"] = job_id
+
+# 여러 파일 업로드를 스풀에 저장하고 위젯 목록 순서대로 [{"name", "path"}] 반환
+# 처음 본 파일만 저장한 뒤 메모리에서 내리고 (위젯에는 DeletedFile로 남음), 목록에서 뺀 파일은 스풀 참조 해제
+def spool_batch_uploads():
+    upload_spool = get_upload_spool()
+    session_id = get_session_id()
+    spooled = st.session_state.setdefault("batch_upload_files", {})  # file_id -> {"name", "path"}
+    uploads = st.session_state.get("batch_uploads") or []
+    entries = []
+    for upload in uploads[:config.BATCH_MAX_FILES]:
+        entry = spooled.get(upload.file_id)
+        if entry and os.path.exists(entry["path"]):
+            upload_spool.acquire(entry["path"], session_id)
+        elif isinstance(upload, DeletedFile):
+            st.warning("업로드한 파일 일부가 서버에서 정리되었습니다. 해당 파일을 다시 업로드해주세요.")
+            continue
+        else:
+            try:
+                upload.seek(0)
+                with get_metrics().stage("upload_write", bytes=upload.size):
+                    path = upload_spool.ingest(upload, f".{upload.name.split('.')[-1].lower()}", session_id)
+            except SpoolFullError as e:
+                st.error(f"파일 저장 실패 ({upload.name}): {e}")
+                continue
+            entry = spooled[upload.file_id] = {"name": upload.name, "path": path}
+            release_uploaded_file(upload.file_id)
+        entries.append(entry)
+    if len(uploads) > config.BATCH_MAX_FILES:
+        st.warning(f"한 번에 {config.BATCH_MAX_FILES}개까지 변환할 수 있습니다. 나머지 파일은 제외했습니다.")
+
+    current = {upload.file_id for upload in uploads}
+    in_use = {entry["path"] for entry in entries} | {st.session_state.get("audio_file")}
+    for file_id in [file_id for file_id in spooled if file_id not in current]:
+        entry = spooled.pop(file_id)
+        if entry["path"] not in in_use:
+            upload_spool.release(session_id, entry["path"])
+    return entries
+
+# 여러 파일 묶음 변환 작업 제출 (캐시에 있는 파일은 바로 결과에 넣고 나머지만 한 작업으로 묶음)
+def submit_batch_job(entries):
+    model_size = get_selected_model_key()
+    vad = st.session_state.get("vad_enabled", bool(config.VAD_ENABLED))
+    transcript_cache = get_transcript_cache()
+    results = []
+    files = []
+    for position, entry in enumerate(entries):
+        cache_key = make_cache_key(file_sha256(entry["path"]), model_size, "ko", vad)
+        cached = transcript_cache.get(cache_key)
+        if cached and cached.get("text"):
+            results.append({"name": entry["name"], "text": cached["text"], "segments": cached.get("segments", []),
+                            "cached": True})
+        else:
+            results.append(None)
+            files.append({"position": position, "name": entry["name"], "audio_file": entry["path"],
+                          "cache_key": cache_key})
+    st.session_state["batch_results"] = results
+    st.session_state["batch_report"] = None
+    if not files:
+        st.success("모든 파일을 이전에 변환한 결과를 캐시에서 불러왔습니다.")
+        return
+    job_id = get_job_queue().submit("transcribe_batch", get_session_id(), {
+        "files": files,
+        "model_size": model_size,
+        "language": "ko",
+        "vad": vad,
+    })
+    st.session_state["batch_job_id"] = job_id
+    st.query_params["batch_job"] = job_id
+
+# 파일별 변환 결과 반영 (결과는 작업을 제출할 때의 파일 순서 자리에)
+def apply_batch_results(job):
+    results = list(session_value("batch_results") or [])
+    transcript_cache = get_transcript_cache()
+    for item, result in zip(job["payload"]["files"], job["result"]["results"]):
+        if result.get("text"):
+            transcript_cache.put(item["cache_key"], {
+                "text": result["text"],
+                "segments": result.get("segments", []),
+                "language": job["payload"]["language"],
+                "model_size": job["payload"]["model_size"],
+            })
+        # 새로고침으로 세션이 바뀐 경우에도 제자리에 들어가도록 목록을 늘림
+        results += [None] * (item["position"] + 1 - len(results))
+        results[item["position"]] = {"name": item["name"], "text": result.get("text", ""),
+                                     "segments": result.get("segments", []), "cached": False}
+    st.session_state["batch_results"] = results
+    st.session_state["batch_report"] = dict(job["result"]["batch"], model_size=job["payload"]["model_size"])
+
+# 이 모델로 파일 하나씩 변환한 평균 시간 (처리 시간 지표 기준, 기록이 없으면 None)
+def sequential_seconds_per_file(model_size):
+    for item in merge_snapshots(collect_metrics()):
+        if item["stage"] == "whisper" and item["model"] == model_size and item["count"]:
+            return item["sums"].get("wall_seconds", 0) / item["count"]
+    return None
+
+# 여러 파일 한 번에 변환: 업로드, 변환 버튼, 처리량, 파일별 결과
+def display_batch_upload():
+    st.file_uploader(f"오디오 파일 여러 개 선택 (최대 {config.BATCH_MAX_FILES}개)",
+                     type=["mp3", "wav", "m4a", "webm"], accept_multiple_files=True, key="batch_uploads")
+    entries = spool_batch_uploads()
+    if entries and st.button(f"{len(entries)}개 파일 일괄 변환 시작", key="convert_batch",
+                             disabled=bool(st.session_state.get("batch_job_id"))):
+        submit_batch_job(entries)
+
+    report = st.session_state.get("batch_report")
+    if report:
+        if report["batched"]:
+            detail = (f"30초 창 {report['windows']}개를 {report['batches']}번에 나눠 변환, "
+                      f"다시 디코딩한 창 {report['fallback_windows']}개")
+        else:
+            detail = "이 모델은 묶음 디코딩을 지원하지 않아 파일별로 변환"
+        st.caption(f"{report['files']}개 파일 {report['seconds']:.1f}초, 분당 {report['files_per_minute']:.1f}개 ({detail})")
+        sequential = sequential_seconds_per_file(report["model_size"])
+        if sequential:
+            st.caption(f"파일별 변환 평균 {sequential:.1f}초 기준 분당 {60 / sequential:.1f}개 "
+                       f"(묶음 변환 {report['files_per_minute'] * sequential / 60:.1f}배)")
+
+    results = session_value("batch_results") or []
+    done = [result for result in results if result]
+    if done:
+        st.download_button("전체 미팅록 내려받기",
+                           "\n\n".join(f"# {result['name']}\n{result['text']}" for result in done),
+                           file_name="transcripts.txt", mime="text/plain", key="download_batch")
+    for position, result in enumerate(results):
+        if not result:
+            continue
+        with st.expander(f"{result['name']}{' (캐시)' if result.get('cached') else ''}"):
+            st.text_area("변환된 텍스트", result["text"], height=120, key=f"batch_text_{position}", disabled=True)
+            if st.button("이 미팅록으로 요약하기", key=f"use_batch_{position}"):
+                set_transcript(result["text"], result.get("segments", []))
+                st.session_state["recorder_status"] = "transcribed"
+                st.success(f"'{result['name']}'의 미팅록을 불러왔습니다. 아래에서 요약을 시작하세요.")
+
+# 재변환 결과를 세션의 미팅록에 반영 (초안을 받은 뒤 사용자가 고친 세그먼트는 그대로 둠), 건너뛴 교체 수 반환
+def apply_refinement(draft_segments, replacements):
+    current = session_value("transcript_segments") or []
+    if len(current) != len(draft_segments):
+        return len(replacements)
+
+    def keep(index, text):
+        return current[index].get("hash") == segment_hash(text)
+
+    segments = splice_segments(current, replacements, keep)
+    skipped = sum(1 for replacement in replacements
+                  if not all(keep(index, text) for index, text in zip(replacement["indices"], replacement["texts"])))
+    set_transcript("".join(segment["text"] for segment in segments), segments)
+    return skipped
+
+# 세션의 미팅록 교체 (세그먼트가 없으면 문장 단위로 나눠 세그먼트로 저장, 세그먼트마다 내용 해시)
+def set_transcript(text, segments=None):
+    if not segments:
+        segments = [{"text": sentence} for sentence in segments_from_text(text)]
+    st.session_state["transcript_text"] = text
+    st.session_state["transcript_segments"] = [dict(segment, hash=segment_hash(segment["text"]))
+                                               for segment in segments]
+    # 편집기 상태를 새 미팅록 기준으로 초기화
+    st.session_state["transcript_version"] = st.session_state.get("transcript_version", 0) + 1
+
+# 편집기에서 고친 세그먼트 반영 (바뀐 세그먼트 수 반환)
+def apply_transcript_edits(texts):
+    segments = []
+    changed = 0
+    for segment, text in zip(session_value("transcript_segments") or [], texts):
+        text = (text or "").strip()
+        if segment_hash(text) != segment.get("hash"):
+            changed += 1
+            segment = dict(segment, text=text)
+        segments.append(segment)
+    if changed:
+        set_transcript(" ".join(segment["text"].strip() for segment in segments if segment["text"].strip()),
+                       segments)
+    return changed
+
+def format_timestamp(seconds):
+    if seconds is None:
+        return ""
+    return f"{int(seconds) // 60:02d}:{int(seconds) % 60:02d}"
+
 # 텍스트 변환 후 표시 함수
+# 한 번의 실행에서 여러 곳이 호출해도 한 번만 그림 (위젯 key 중복 방지)
 def display_transcript():
-    if "transcript_text" in st.session_state and st.session_state["transcript_text"]:
-        transcript = st.session_state["transcript_text"]
+    if st.session_state.get("transcript_shown"):
+        return True
+    transcript = session_value("transcript_text")
+    if transcript:
+        st.session_state["transcript_shown"] = True
+        segments = session_value("transcript_segments") or []
         
         # 텍스트 표시 영역
         transcript_container = st.container()
         with transcript_container:
             st.subheader("변환된 텍스트")
-            st.text_area("전체 텍스트", transcript, height=200, key="display_transcript")
+            st.text_area("전체 텍스트", transcript, height=200, key="display_transcript", disabled=True)
+            # 잘못 받아 적은 단어는 세그먼트 단위로 고침 (다시 요약할 때 고친 부분만 반영)
+            with st.expander("미팅록 수정", expanded=False):
+                edited = st.data_editor(
+                    [{"시작": format_timestamp(segment.get("start")), "텍스트": segment["text"].strip()}
+                     for segment in segments],
+                    column_config={"시작": st.column_config.TextColumn(disabled=True, width="small"),
+                                   "텍스트": st.column_config.TextColumn(width="large")},
+                    hide_index=True, use_container_width=True,
+                    key=f"transcript_editor_{st.session_state.get('transcript_version', 0)}",
+                )
+                if st.button("수정 내용 저장", key="save_transcript_edits"):
+                    changed = apply_transcript_edits([row["텍스트"] for row in edited])
+                    if changed:
+                        st.success(f"{changed}개 구간을 수정했습니다. 요약을 다시 만들면 수정한 부분만 반영됩니다.")
+                    else:
+                        st.info("바뀐 내용이 없습니다.")
             
             # Claude API 키가 있으면 요약 버튼 표시
-            if claude_api_key:
+            if st.session_state.get("claude_api_key"):
                 if st.button("Claude 요약 시작", key="summarize_button"):
                     summarize_text_with_claude()
             else:
@@ -343,53 +824,93 @@ def display_transcript():
     
     return False
 
-# 녹음 자동 처리 함수
-def process_recording_data(audio_data):
-    if not audio_data:
+# 실시간 녹음 변환 확인: 끝난 녹음은 결과와 원본 파일을 세션에 반영하고, 진행 중이면 True
+def poll_live_recording():
+    live_ingest = get_live_ingest()
+    session = live_ingest.get(get_live_token()) if live_ingest else None
+    if session is None:
         return False
     
-    try:
-        # Base64 데이터를 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-            decoded_data = base64.b64decode(audio_data)
-            temp_file.write(decoded_data)
-            temp_filename = temp_file.name
-        
-        st.session_state["audio_file"] = temp_filename
+    session.refresh(get_job_queue().get)
+    progress = session.progress()
+    if progress["status"] != FINISHED:
+        st.info(f"실시간 변환 중... 녹음 {progress['seconds']:.0f}초, "
+                f"변환 완료 구간 {progress['windows_done']}/{progress['windows']}")
+        transcript = session.transcript()
+        if transcript:
+            st.text(transcript[-1000:])
         return True
-    except Exception as e:
-        st.error(f"오디오 처리 중 오류 발생: {e}")
-        return False
+    
+    try:
+        # 녹음 원본은 스풀로 옮겨 다시 변환하거나 내려받을 수 있게 유지
+        with open(session.raw_path, "rb") as f, get_metrics().stage("upload_write", bytes=progress["bytes"]):
+            set_session_audio_file(get_upload_spool().ingest(f, ".webm", get_session_id()))
+    except (OSError, SpoolFullError) as e:
+        st.warning(f"녹음 파일 저장 실패: {e}")
+    
+    for error in session.errors:
+        st.warning(f"일부 구간 변환 실패: {error}")
+    set_transcript(session.transcript(), session.segments())
+    st.session_state["recorder_status"] = "transcribed"
+    live_ingest.discard(session.token)
+    display_transcript()
+    return False
 
 # Claude로 요약하는 함수
 def summarize_text_with_claude():
-    if "transcript_text" not in st.session_state or not st.session_state["transcript_text"]:
+    transcript = session_value("transcript_text")
+    if not transcript:
         st.error("요약할 텍스트가 없습니다.")
         return False
     
+    claude_api_key = st.session_state.get("claude_api_key")
     if not claude_api_key:
         st.error("Claude API 키가 입력되지 않았습니다. 요약을 진행할 수 없습니다.")
         return False
     
-    transcript = st.session_state["transcript_text"]
-    
     # 텍스트에서 브랜드명 추출
     extracted_brand_name = extract_brand_name(transcript)
     
     # 사이드바에서 입력한 브랜드명이 있으면 그것을 우선 사용
-    final_brand_name = brand_name or extracted_brand_name
+    final_brand_name = st.session_state.get("brand_name") or extracted_brand_name
     
     # 미팅 정보 구성
     meeting_info = {
-        "company_name": our_company_name,
-        "our_participants": our_participants,
-        "meeting_date": meeting_date.strftime("%Y-%m-%d"),
+        "company_name": st.session_state.get("our_company_name", "브랜더진"),
+        "our_participants": st.session_state.get("our_participants", ""),
+        "meeting_date": st.session_state.get("meeting_date", datetime.now()).strftime("%Y-%m-%d"),
         "brand_name": final_brand_name
     }
     
-    # 요약 생성
-    with st.spinner("Claude API로 요약 생성 중..."):
-        summary = summarize_with_claude(transcript, claude_api_key, meeting_info)
+    # 같은 미팅록/미팅 정보/모델/프롬프트로 만든 요약이 있으면 재사용
+    summary_cache = get_summary_cache()
+    cache_key = make_cache_key(transcript, meeting_info, config.CLAUDE_MODEL, PROMPT_VERSION)
+    summary = summary_cache.get(cache_key)
+    segments = [segment["text"] for segment in session_value("transcript_segments") or []]
+    if summary:
+        st.caption("이전에 생성한 요약을 캐시에서 불러왔습니다.")
+        index_meeting(transcript, summary, meeting_info)
+        remember_summary_source(summary, segments, meeting_info)
+    else:
+        # 같은 미팅 정보로 만든 이전 요약이 있으면 미팅록에서 고친 부분만 반영
+        previous = session_value("summary_source")
+        if previous and previous["meeting_info"] != meeting_info:
+            previous = None
+        # 요약은 백그라운드 작업으로 실행 (API 키는 DB에 저장하지 않고 메모리로만 전달)
+        job_id = get_job_queue().submit(
+            "summarize", get_session_id(),
+            {
+                "transcript": transcript,
+                "segments": segments,
+                "previous": {"summary": previous["summary"], "segments": previous["segments"]} if previous else None,
+                "meeting_info": meeting_info,
+                "cache_key": cache_key,
+            },
+            secrets={"api_key": claude_api_key},
+        )
+        st.session_state["summary_job_id"] = job_id
+        st.query_params["summary_job"] = job_id
+        return True
     
     if summary:
         # 요약 결과 저장
@@ -399,73 +920,242 @@ def summarize_text_with_claude():
     
     return False
 
-# 요약 함수 (Claude API 사용)
-def summarize_with_claude(transcript, api_key, meeting_info):
-    if not api_key:
-        return "Claude API 키가 제공되지 않았습니다."
-    
-    # 미팅 정보 구성
-    company_name = meeting_info.get("company_name", "브랜더진")
-    our_participants = meeting_info.get("our_participants", "")
-    meeting_date = meeting_info.get("meeting_date", datetime.now().strftime("%Y-%m-%d"))
-    brand_name = meeting_info.get("brand_name", "")
+# 요청 전 미팅록 정리로 줄인 입력 토큰
+def display_compaction(report):
+    if not report or not report.get("tokens_saved"):
+        return
+    details = ", ".join(
+        f"{label} {report[key]:,}" for key, label in
+        (("fillers", "군말"), ("repeats", "반복"), ("hallucinations", "무음 환각"), ("opening", "회사 소개 구간"))
+        if report.get(key)
+    )
+    st.caption(f"입력 토큰 {report['tokens_before']:,} → {report['tokens_after']:,} "
+               f"({report['tokens_saved'] / max(report['tokens_before'], 1) * 100:.0f}% 절감: {details})")
+
+# 요약의 바탕이 된 세그먼트와 미팅 정보 (미팅록을 고친 뒤 다시 요약할 때 비교 기준)
+def remember_summary_source(summary, segments, meeting_info):
+    st.session_state["summary_source"] = {"summary": summary, "segments": segments, "meeting_info": meeting_info}
+
+# 백그라운드 작업 확인: 끝난 작업 결과를 세션에 반영하고, 진행 중인 작업이 있으면 True
+def poll_background_jobs():
+    job_queue = get_job_queue()
+    pending = False
     
-    # Claude API 요청 데이터
-    prompt = f"""
-너에게 브랜드 세일즈 미팅록을 전달했어. 너는 브랜드 세일즈 미팅록을 요약하여 세일즈포스에 기입할거야. 적절하게 우리의 Knowledge로 만들 수 있도록 요약본을 만들어 줘야해.
-
-(초반에 {company_name}에 대해 설명하는 Participant는 우리 세일즈맨이야. 우리 팀원 얘기 보다는 다른 Participant(고객) 목소리를 좀 더 담아서 요약 부탁.)
-
-💡 요약 시 포함할 내용:
-1. 미팅 개요: 미팅 날짜({meeting_date}), 참석자 (우리 측 & 브랜드 측), 브랜드명 및 담당자 역할
-2. 브랜드 배경: 브랜드의 마케팅 및 세일즈 현황, 현재 고민 또는 니즈
-3. (이 내역은 각각 구조화해서 작성해줘.) 
-   A. 마케터 인원수 혹은 구성 
-   B. 전체 마케팅 중 인플루언서 마케팅의 비중은 어느 정도인지 
-   C. 예산 책정 방식 
-   D. 이외에 어떤 마케팅을 전개하고 있는지 / 어떤 업무에 리소스를 투여하고 있는지
-4. 미팅 주요 논의 사항: 브랜드가 관심을 가진 서비스, 협업 가능성, 가격 협상 여부, 요청 사항
-5. 결론 및 액션 아이템: 브랜드의 관심 수준 (Hot, Warm, Cold), 다음 단계, 우리가 해야 할 일, 브랜드가 해야 할 일
-
-📌 간결하고 핵심적인 내용으로 정리하되, 의미가 명확하게 전달될 수 있도록 작성할 것.
-📌 목록 형식(Bullet Points) 또는 구조화된 섹션으로 정리하여 가독성을 높일 것.
-
-우리 측 참석자: {our_participants}
-브랜드명: {brand_name}
-
-미팅록 내용:
-{transcript}
-"""
+    # 새로고침 후에는 URL에 남은 작업 id로 이어서 확인
+    for state_key, param_key in JOB_STATE_KEYS:
+        if not st.session_state.get(state_key) and param_key in st.query_params:
+            st.session_state[state_key] = st.query_params[param_key]
     
-    headers = {
-        "x-api-key": api_key,
-        "Content-Type": "application/json"
-    }
+    # 변환 작업
+    job_id = st.session_state.get("transcribe_job_id")
+    job = job_queue.get(job_id) if job_id else None
+    if job_id and job is None:
+        clear_background_job("transcribe_job_id", "transcribe_job")
+    elif job and job["status"] in (QUEUED, RUNNING):
+        pending = True
+        if job["status"] == QUEUED:
+            st.info(f"텍스트 변환 대기 중... (대기 순번 {job_queue.queue_position(job_id)})")
+        else:
+            st.progress(job["progress"] or 0.0, text="오디오를 텍스트로 변환 중...")
+    elif job and job["status"] == DONE:
+        result = job["result"]
+        clear_background_job("transcribe_job_id", "transcribe_job")
+        record_job_latency(job)
+        if result and result.get("text"):
+            get_transcript_cache().put(job["payload"]["cache_key"], {
+                "text": result["text"],
+                "segments": result.get("segments", []),
+                "language": job["payload"]["language"],
+                "model_size": job["payload"]["model_size"],
+            })
+            set_transcript(result["text"], result.get("segments", []))
+            st.session_state["recorder_status"] = "transcribed"
+            if job["payload"].get("refine") and result.get("segments"):
+                submit_refine_job(job["payload"]["audio_file"], result["segments"], job["payload"]["refine"])
+                pending = True
+            vad_report = result.get("vad")
+            if vad_report and vad_report["skipped_seconds"] > 0:
+                st.caption(f"무음 구간 {vad_report['skipped_seconds']:.0f}초 건너뜀 "
+                           f"(전체 {vad_report['original_seconds']:.0f}초 중 "
+                           f"{vad_report['skipped_seconds'] / max(vad_report['original_seconds'], 1) * 100:.0f}%)")
+            display_transcript()
+        else:
+            st.error("텍스트 변환에 실패했습니다.")
+            st.session_state["recorder_status"] = "error"
+    elif job and job["status"] == FAILED:
+        clear_background_job("transcribe_job_id", "transcribe_job")
+        st.error(f"Whisper 텍스트 변환 중 오류: {job['error']}")
+        st.session_state["recorder_status"] = "error"
     
-    data = {
-        "model": "claude-3-haiku-20240307",
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 4000
-    }
+    # 재변환 작업 (초안은 이미 표시되어 있고 요약도 바로 시작할 수 있음)
+    job_id = st.session_state.get("refine_job_id")
+    job = job_queue.get(job_id) if job_id else None
+    if job_id and job is None:
+        clear_background_job("refine_job_id", "refine_job")
+    elif job and job["status"] in (QUEUED, RUNNING):
+        pending = True
+        model_name = job["payload"]["model_size"]
+        if job["status"] == QUEUED:
+            st.info(f"초안입니다. {model_name} 모델 재변환 대기 중... (대기 순번 {job_queue.queue_position(job_id)})")
+        else:
+            st.progress(job["progress"] or 0.0,
+                        text=f"초안입니다. 신뢰도가 낮은 구간을 {model_name} 모델로 다시 변환 중...")
+    elif job and job["status"] == DONE:
+        result = job["result"]
+        clear_background_job("refine_job_id", "refine_job")
+        record_job_latency(job)
+        get_transcript_cache().put(job["payload"]["cache_key"], {
+            "text": result["text"],
+            "segments": result["segments"],
+            "language": job["payload"]["language"],
+            "model_size": job["payload"]["model_size"],
+        })
+        skipped = apply_refinement(job["payload"]["segments"], result["replacements"])
+        report = result["cascade"]
+        st.caption(f"신뢰도가 낮은 세그먼트 {report['refined_segments']}/{report['total_segments']}개 "
+                   f"({report['refined_seconds']:.0f}초, 전체 {report['total_seconds']:.0f}초의 "
+                   f"{report['refined_seconds'] / max(report['total_seconds'], 1) * 100:.0f}%)를 "
+                   f"{job['payload']['model_size']} 모델로 다시 변환했습니다.")
+        if skipped:
+            st.caption(f"초안에서 직접 고친 구간 {skipped}곳은 재변환 결과로 바꾸지 않았습니다.")
+        display_transcript()
+    elif job and job["status"] == FAILED:
+        clear_background_job("refine_job_id", "refine_job")
+        st.warning(f"정밀 재변환 중 오류가 발생해 초안을 유지합니다: {job['error']}")
+
+    # 여러 파일 묶음 변환 작업 (결과는 파일 업로드 탭에 파일별로 표시)
+    job_id = st.session_state.get("batch_job_id")
+    job = job_queue.get(job_id) if job_id else None
+    if job_id and job is None:
+        clear_background_job("batch_job_id", "batch_job")
+    elif job and job["status"] in (QUEUED, RUNNING):
+        pending = True
+        file_count = len(job["payload"]["files"])
+        if job["status"] == QUEUED:
+            st.info(f"파일 {file_count}개 일괄 변환 대기 중... (대기 순번 {job_queue.queue_position(job_id)})")
+        else:
+            st.progress(job["progress"] or 0.0, text=f"파일 {file_count}개를 묶어서 텍스트로 변환 중...")
+    elif job and job["status"] == DONE:
+        clear_background_job("batch_job_id", "batch_job")
+        record_job_latency(job)
+        apply_batch_results(job)
+        st.success(f"파일 {len(job['payload']['files'])}개를 변환했습니다. '파일 업로드' 탭에서 파일별 결과를 확인하세요.")
+    elif job and job["status"] == FAILED:
+        clear_background_job("batch_job_id", "batch_job")
+        st.error(f"일괄 변환 중 오류: {job['error']}")
+
+    # 요약 작업
+    job_id = st.session_state.get("summary_job_id")
+    job = job_queue.get(job_id) if job_id else None
+    if job_id and job is None:
+        clear_background_job("summary_job_id", "summary_job")
+    elif job and job["status"] in (QUEUED, RUNNING):
+        # 진행 상황은 실행 끝에서 stream_summary_job이 표시
+        pending = True
+    elif job and job["status"] == DONE:
+        clear_background_job("summary_job_id", "summary_job")
+        record_job_latency(job)
+        summary = job["result"]["summary"]
+        display_compaction(job["result"].get("compaction"))
+        # 오류 메시지는 저장하지 않음
+        if summary and not summary.startswith("요약 생성 중 오류 발생"):
+            get_summary_cache().put(job["payload"]["cache_key"], summary)
+            index_meeting(job["payload"]["transcript"], summary, job["payload"]["meeting_info"])
+            remember_summary_source(summary, job["payload"].get("segments") or [], job["payload"]["meeting_info"])
+        if summary:
+            st.session_state["summary_result"] = summary
+            display_summary(summary, job["payload"]["meeting_info"]["brand_name"])
+    elif job and job["status"] == FAILED:
+        clear_background_job("summary_job_id", "summary_job")
+        st.error(f"요약 생성 중 오류 발생: {job['error']}")
     
-    try:
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers=headers,
-            json=data
-        )
-        response.raise_for_status()
-        
-        result = response.json()
-        summary = result["content"][0]["text"]
-        return summary
-    except Exception as e:
-        return f"요약 생성 중 오류 발생: {str(e)}"
+    return pending
+
+# 진행 중인 요약을 전체 재실행 없이 짧은 간격으로 표시 (받은 부분은 DB에서 상태와 함께만 읽음)
+# 요약이 끝나거나 limit초가 지나면 반환, 그 뒤 재실행에서 결과 표시 (작업 진행 상황 확인용 대기도 겸함)
+def stream_summary_job(container, limit):
+    job_queue = get_job_queue()
+    job_id = st.session_state.get("summary_job_id")
+    placeholder = container.empty()
+    deadline = time.monotonic() + limit
+    shown = None
+    while True:
+        status, partial = job_queue.partial(job_id)
+        if status not in (QUEUED, RUNNING):
+            return
+        if status == QUEUED:
+            content = ("info", f"요약 대기 중... (대기 순번 {job_queue.queue_position(job_id)})")
+        elif partial:
+            # 받은 만큼 표시
+            content = ("markdown", partial + "▌")
+        else:
+            content = ("info", "Claude API로 요약 생성 중...")
+        if content != shown:
+            getattr(placeholder, content[0])(content[1])
+            shown = content
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(config.SUMMARY_STREAM_POLL_SECONDS)
+
+# 요청부터 완료까지 걸린 시간 (대기열에서 기다린 시간 포함, CPU는 워커 쪽 단계에 기록됨)
+def record_job_latency(job):
+    if job["finished_at"] and job["started_at"]:
+        get_metrics().record(f"{job['kind']}_job", job["finished_at"] - job["created_at"], 0.0,
+                             model=job["payload"].get("model_size", ""),
+                             queue_seconds=job["started_at"] - job["created_at"])
+
+# 이 프로세스와 작업 워커 프로세스들의 지표 집계 목록
+def collect_metrics(job_queue=None):
+    workers = (job_queue or get_job_queue()).stats()["workers"]
+    return [get_metrics().snapshot()] + [stats.get("metrics", []) for stats in workers.values()]
+
+# 지표를 Prometheus 텍스트 파일로 주기적으로 내보내기 (경로가 비어 있으면 사용 안 함)
+@st.cache_resource
+def get_metrics_exporter():
+    if not config.METRICS_PROM_PATH:
+        return None
+    # 내보내기 스레드는 Streamlit 실행 컨텍스트 밖이므로 대기열을 미리 넘겨둠
+    job_queue = get_job_queue()
+    return PrometheusFileExporter(config.METRICS_PROM_PATH, lambda: collect_metrics(job_queue),
+                                  config.METRICS_EXPORT_SECONDS)
+
+# 단계별 처리 시간 표
+def display_metrics():
+    rows = []
+    for item in merge_snapshots(collect_metrics()):
+        sums = item["sums"]
+        count = max(item["count"], 1)
+        rows.append({
+            "단계": item["stage"],
+            "모델": item["model"],
+            "횟수": item["count"],
+            "오류": item["errors"],
+            "평균 시간(초)": round(sums.get("wall_seconds", 0) / count, 3),
+            "평균 CPU(초)": round(sums.get("cpu_seconds", 0) / count, 3),
+            "오디오(초)": round(sums.get("audio_seconds", 0), 1),
+            "실시간 배율": round(sums["wall_seconds"] / sums["audio_seconds"], 3) if sums.get("audio_seconds") else None,
+            "입력 토큰": sums.get("prompt_tokens"),
+            "출력 토큰": sums.get("response_tokens"),
+            "대기(초)": round(sums["queue_seconds"] / count, 3) if "queue_seconds" in sums else None,
+        })
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.write("아직 기록된 처리 시간이 없습니다.")
+    st.download_button("Prometheus 형식으로 내려받기", render_prometheus(collect_metrics()),
+                       file_name="notetaker-metrics.prom", mime="text/plain")
+    st.caption(f"JSONL 기록: {config.METRICS_LOG_PATH or '사용 안 함'} / "
+               f"Prometheus 파일: {config.METRICS_PROM_PATH or '사용 안 함'}")
+
+# 끝난 작업 id를 세션과 URL에서 제거
+def clear_background_job(state_key, param_key):
+    st.session_state[state_key] = None
+    if param_key in st.query_params:
+        del st.query_params[param_key]
 
 # 요약 결과 표시 함수
 def display_summary(summary, brand_name_value):
+    meeting_date = st.session_state.get("meeting_date", datetime.now())
     st.subheader("브랜드 세일즈 미팅 요약")
     
     # 1. 마크다운으로 표시
@@ -493,13 +1183,83 @@ def display_summary(summary, brand_name_value):
             key=f"download_md_{datetime.now().strftime('%H%M%S')}"
         )
 
-# 임시 파일 정리
+# 지난 미팅 검색 (관련도순 상위 결과의 발췌만 표시하고 본문은 펼칠 때 한 건씩 조회)
+def display_meeting_search():
+    meeting_index = get_meeting_index()
+    st.caption(f"색인된 미팅 {meeting_index.count()}건. 여러 단어는 모두 포함된 미팅을, OR는 둘 중 하나를, "
+               "따옴표는 정확한 구절을 찾습니다.")
+    query = st.text_input("검색어", key="search_query", placeholder="예: 예산 삭감 OR \"예산 축소\"")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        brand_filter = st.text_input("브랜드명", key="search_brand")
+    with col2:
+        date_from = st.date_input("시작 날짜", value=None, key="search_date_from")
+    with col3:
+        date_to = st.date_input("종료 날짜", value=None, key="search_date_to")
+    if not query:
+        return
+
+    started = time.perf_counter()
+    hits = meeting_index.search(
+        query, limit=config.MEETING_SEARCH_LIMIT, brand_name=brand_filter,
+        date_from=date_from.strftime("%Y-%m-%d") if date_from else "",
+        date_to=date_to.strftime("%Y-%m-%d") if date_to else "",
+    )
+    st.caption(f"검색 결과 {len(hits)}건 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+    for hit in hits:
+        st.markdown(f"**{hit['brand_name'] or '브랜드 미상'}** · {hit['meeting_date']} · {hit['our_participants']}")
+        st.markdown(hit["snippet"])
+        if st.toggle("요약 보기", key=f"search_open_{hit['id']}"):
+            meeting = meeting_index.get(hit["id"])
+            if meeting:
+                st.markdown(meeting["summary"])
+                st.download_button(
+                    label="미팅록 다운로드 (.txt)",
+                    data=meeting["transcript"],
+                    file_name=f"미팅록_{meeting['meeting_date']}_{meeting['brand_name']}.txt",
+                    mime="text/plain",
+                    key=f"search_download_{hit['id']}",
+                )
+        st.markdown("---")
+
+# 세일즈포스 내보내기: 기간 내 저장된 미팅을 대기열에 넣고 묶음 단위로 전송
+def display_crm_export():
+    exporter = get_crm_exporter()
+    if exporter is None:
+        st.caption("NOTETAKER_CRM_INSTANCE_URL과 NOTETAKER_CRM_ACCESS_TOKEN을 설정하면 세일즈포스로 내보낼 수 있습니다.")
+        return
+    counts = exporter.queue.counts()
+    st.caption(f"대기 {counts.get(crm_export.PENDING, 0)}건 · 전송 완료 {counts.get(crm_export.SENT, 0)}건 · "
+               f"실패 {counts.get(crm_export.FAILED, 0)}건")
+    col1, col2 = st.columns(2)
+    with col1:
+        date_from = st.date_input("시작 날짜", value=None, key="crm_date_from")
+    with col2:
+        date_to = st.date_input("종료 날짜", value=None, key="crm_date_to")
+    if st.button("세일즈포스로 보내기", key="crm_sync"):
+        queued = exporter.enqueue_meetings(get_meeting_index().iter_meetings(
+            date_from.strftime("%Y-%m-%d") if date_from else "",
+            date_to.strftime("%Y-%m-%d") if date_to else "",
+        ))
+        with st.spinner("세일즈포스로 전송 중..."):
+            try:
+                report = exporter.sync()
+            except crm_export.CRMError as e:
+                st.error(f"세일즈포스 전송 실패: {e}")
+                return
+        st.success(f"새로 추가 {queued}건, 전송 {report['sent']}건 ({report['seconds']:.1f}초)")
+        if report["retry"]:
+            st.warning(f"{report['retry']}건은 전송하지 못해 잠시 후 다시 시도합니다.")
+    errors = exporter.queue.errors()
+    if errors:
+        st.dataframe(errors, use_container_width=True)
+
+# 임시 파일 정리 (참조가 끊기고 TTL이 지난 스풀 파일 삭제)
 def cleanup_temp_files():
-    if "audio_file" in st.session_state and st.session_state["audio_file"]:
-        try:
-            os.remove(st.session_state["audio_file"])
-        except:
-            pass
+    try:
+        get_upload_spool().sweep()
+    except Exception:
+        pass
 
 # 앱 종료 시 임시 파일 정리
 import atexit
@@ -519,64 +1279,103 @@ def main():
     3. 구조화된 브랜드 미팅 요약을 복사하거나 다운로드할 수 있습니다.
     """)
 
+    # 작업 워커를 띄워 기본 Whisper 모델을 첫 화면을 그리는 동안 백그라운드에서 로드
+    get_job_queue()
+    get_metrics_exporter()
+
     # 세션 상태 초기화
-    if "audio_data" not in st.session_state:
-        st.session_state["audio_data"] = None
-    if "auto_process" not in st.session_state:
-        st.session_state["auto_process"] = False
     if "audio_file" not in st.session_state:
         st.session_state["audio_file"] = None
     if "transcript_text" not in st.session_state:
         st.session_state["transcript_text"] = None
+    if "transcript_segments" not in st.session_state:
+        st.session_state["transcript_segments"] = []
     if "summary_result" not in st.session_state:
         st.session_state["summary_result"] = None
     if "processed_data" not in st.session_state:
         st.session_state["processed_data"] = None
+    if "transcribe_job_id" not in st.session_state:
+        st.session_state["transcribe_job_id"] = None
+    if "refine_job_id" not in st.session_state:
+        st.session_state["refine_job_id"] = None
+    if "summary_job_id" not in st.session_state:
+        st.session_state["summary_job_id"] = None
+    if "batch_job_id" not in st.session_state:
+        st.session_state["batch_job_id"] = None
     if "recorder_status" not in st.session_state:
         st.session_state["recorder_status"] = "idle"  # 상태: idle, recording, processing, transcribed
+    st.session_state["transcript_shown"] = False
 
     # 탭 생성
-    tab1, tab2, tab3 = st.tabs(["실시간 녹음", "파일 업로드", "텍스트 직접 입력"])
+    tab1, tab2, tab3, tab4 = st.tabs(["실시간 녹음", "파일 업로드", "텍스트 직접 입력", "미팅 검색"])
 
     # Claude API 키 입력
     with st.sidebar:
         st.header("설정")
-        claude_api_key = st.text_input("Claude API 키", type="password")
+        claude_api_key = st.text_input("Claude API 키", type="password", key="claude_api_key")
         st.markdown("---")
         st.subheader("Whisper 모델 (음성 변환용)")
-        model_size = st.selectbox("모델 크기", ["tiny", "base", "small", "medium", "large"], index=1)
+        model_size = st.selectbox("모델 크기", MODEL_SIZES, index=MODEL_SIZES.index(config.DEFAULT_MODEL_SIZE),
+                                  key="model_size")
+        inference_mode = st.selectbox("추론 정밀도", PRECISIONS, index=PRECISIONS.index(config.INFERENCE_MODE),
+                                      key="inference_mode",
+                                      help="int8은 가중치를 8비트로 양자화해 CPU에서 더 빠르고 메모리를 적게 씁니다. "
+                                           "정확도 차이는 benchmark.py --accuracy로 확인할 수 있습니다.")
+        transcribe_mode = st.radio("변환 방식", TRANSCRIBE_MODES, key="transcribe_mode",
+                                   help="병렬 분할은 긴 녹음을 무음 구간에서 나눠 여러 코어로 동시에 변환합니다. "
+                                        f"단계별은 {config.CASCADE_DRAFT_MODEL} 모델로 만든 초안을 먼저 보여주고, "
+                                        "신뢰도가 낮은 구간만 위에서 고른 모델로 다시 변환합니다.")
+        vad_enabled = st.checkbox("무음 구간 건너뛰기", value=bool(config.VAD_ENABLED), key="vad_enabled",
+                                  help="음성이 없는 구간을 잘라낸 뒤 변환합니다. 타임스탬프는 원본 기준으로 유지됩니다.")
         st.markdown("---")
         st.subheader("브랜드 미팅 정보")
-        our_company_name = st.text_input("자사명", value="브랜더진")
-        our_participants = st.text_input("자사 참석자 (쉼표로 구분)")
-        meeting_date = st.date_input("미팅 날짜", datetime.now())
-        brand_name = st.text_input("브랜드명 (자동 추출되지 않을 경우 사용)")
+        our_company_name = st.text_input("자사명", value="브랜더진", key="our_company_name")
+        our_participants = st.text_input("자사 참석자 (쉼표로 구분)", key="our_participants")
+        meeting_date = st.date_input("미팅 날짜", datetime.now(), key="meeting_date")
+        brand_name = st.text_input("브랜드명 (자동 추출되지 않을 경우 사용)", key="brand_name")
 
-    # 결과 표시를 위한 컨테이너
+    # 결과 표시를 위한 컨테이너 (백그라운드 작업 진행 상황과 결과)
     result_container = st.container()
+    with result_container:
+        jobs_pending = poll_background_jobs()
 
     # 실시간 녹음 탭
     with tab1:
         st.header("실시간 녹음")
-        st.markdown("""
-        1. 아래 '녹음 시작' 버튼을 클릭하여 브랜드 미팅을 실시간으로 녹음하세요.
-        2. 녹음이 완료되면 '녹음 파일 다운로드' 버튼이 나타납니다.
-        3. 다운로드한 파일을 '파일 업로드' 탭에서 업로드하여 텍스트로 변환하세요.
-        """)
+        live_ingest = get_live_ingest()
+        if live_ingest:
+            st.markdown("""
+            1. 아래 '녹음 시작' 버튼을 클릭하여 브랜드 미팅을 실시간으로 녹음하세요.
+            2. 녹음하는 동안 약 20초 단위로 텍스트 변환이 진행됩니다.
+            3. 녹음을 중지하고 '녹음 결과 가져오기' 버튼을 클릭하면 변환된 텍스트로 요약을 진행할 수 있습니다.
+            """)
+            # 사이드바 설정을 다음 녹음에 적용
+            live_token = get_live_token()
+            live_ingest.register(live_token, {
+                "session_id": get_session_id(),
+                "model_size": get_selected_model_key(),
+                "language": "ko",
+                "vad": bool(st.session_state.get("vad_enabled", config.VAD_ENABLED)),
+            })
+            recorder_html = get_audio_recorder_html(live_token, config.LIVE_PUBLIC_URL, live_ingest.port,
+                                                    config.LIVE_CHUNK_MS)
+        else:
+            st.markdown("""
+            1. 아래 '녹음 시작' 버튼을 클릭하여 브랜드 미팅을 실시간으로 녹음하세요.
+            2. 녹음이 완료되면 '녹음 파일 다운로드' 버튼이 나타납니다.
+            3. 다운로드한 파일을 '파일 업로드' 탭에서 업로드하여 텍스트로 변환하세요.
+            """)
+            recorder_html = get_audio_recorder_html()
         
         # 오디오 레코더 HTML 삽입 - 높이 증가
-        audio_receiver = st.components.v1.html(get_audio_recorder_html(), height=300)
+        st.components.v1.html(recorder_html, height=450 if live_ingest else 300)
         
-        # 녹음 처리 상태 표시 영역
-        recorder_status_container = st.empty()
-        
-        # JavaScript로부터 데이터 수신 처리
-        if audio_receiver and isinstance(audio_receiver, dict):
-            if "audio_data" in audio_receiver:
-                st.session_state["audio_data"] = audio_receiver["audio_data"]
-                st.session_state["auto_process"] = audio_receiver.get("auto_process", False)
-                st.session_state["recorder_status"] = "recorded"  # 상태를 "처리 중"이 아닌 "녹음 완료"로 변경
-                recorder_status_container.success("녹음이 완료되었습니다! 다운로드 버튼을 클릭하여 파일을 저장한 후, '파일 업로드' 탭에서 업로드해 주세요.")
+        if live_ingest:
+            # 누르면 다시 실행되면서 녹음 상태를 확인 (진행 중이면 끝날 때까지 자동 갱신)
+            st.button("녹음 결과 가져오기", key="collect_live")
+            live_pending = poll_live_recording()
+        else:
+            live_pending = False
 
     # 파일 업로드 탭
     with tab2:
@@ -588,38 +1387,67 @@ def main():
         """)
         
         uploaded_file = st.file_uploader("오디오 파일(.mp3, .wav, .m4a, .webm) 또는 텍스트 파일(.txt) 선택", 
-                                        type=["mp3", "wav", "m4a", "webm", "txt"])
+                                        type=["mp3", "wav", "m4a", "webm", "txt"], key="audio_upload")
+        
+        # 스풀에 저장한 오디오 업로드는 메모리에서 내리므로 위젯에는 DeletedFile로 남음
+        upload_name = uploaded_file.name if uploaded_file is not None else None
+        released_upload = st.session_state.get("audio_upload")
+        if (uploaded_file is None and isinstance(released_upload, DeletedFile)
+                and released_upload.file_id == st.session_state.get("uploaded_file_id")):
+            upload_name = st.session_state.get("uploaded_file_name")
         
-        if uploaded_file is not None:
-            file_extension = uploaded_file.name.split('.')[-1].lower()
+        if upload_name is not None:
+            file_extension = upload_name.split('.')[-1].lower()
             
             if file_extension in ['mp3', 'wav', 'm4a', 'webm']:
                 # 오디오 파일 처리
-                st.success(f"오디오 파일 '{uploaded_file.name}'이(가) 업로드되었습니다.")
+                st.success(f"오디오 파일 '{upload_name}'이(가) 업로드되었습니다.")
                 
-                # 임시 파일로 저장
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
-                    temp_file.write(uploaded_file.getbuffer())
-                    temp_filename = temp_file.name
-                
-                st.session_state["audio_file"] = temp_filename
-                
-                # 파일 정보 표시
-                file_size = os.path.getsize(temp_filename)
-                st.info(f"업로드된 파일 크기: {file_size} 바이트")
+                # 스풀에 저장 (같은 업로드는 재실행마다 다시 쓰지 않음)
+                upload_spool = get_upload_spool()
+                session_id = get_session_id()
+                temp_filename = st.session_state.get("audio_file")
+                if uploaded_file is not None and (st.session_state.get("uploaded_file_id") != uploaded_file.file_id
+                                                  or not temp_filename or not os.path.exists(temp_filename)):
+                    try:
+                        uploaded_file.seek(0)
+                        with get_metrics().stage("upload_write", bytes=uploaded_file.size):
+                            temp_filename = upload_spool.ingest(uploaded_file, f".{file_extension}", session_id)
+                        set_session_audio_file(temp_filename)
+                        st.session_state["uploaded_file_id"] = uploaded_file.file_id
+                        st.session_state["uploaded_file_name"] = upload_name
+                        # 원본은 디스크에 있으므로 세션이 끝날 때까지 메모리에 들고 있지 않음
+                        release_uploaded_file(uploaded_file.file_id)
+                    except SpoolFullError as e:
+                        st.error(f"파일 저장 실패: {e}")
+                        temp_filename = None
+                elif temp_filename and os.path.exists(temp_filename):
+                    # 세션이 계속 사용 중임을 갱신
+                    upload_spool.acquire(temp_filename, session_id)
+                else:
+                    st.warning("업로드한 파일이 서버에서 정리되었습니다. 파일을 다시 업로드해주세요.")
+                    temp_filename = None
                 
-                # 텍스트 변환 버튼
-                if st.button("텍스트 변환 시작", key="convert_audio"):
-                    process_audio_to_text()
+                if temp_filename:
+                    # 파일 정보 표시
+                    file_size = os.path.getsize(temp_filename)
+                    st.info(f"업로드된 파일 크기: {file_size} 바이트")
+                    
+                    # 텍스트 변환 버튼
+                    if st.button("텍스트 변환 시작", key="convert_audio"):
+                        process_audio_to_text()
             
             elif file_extension == 'txt':
                 # 텍스트 파일 처리
                 st.success(f"텍스트 파일 '{uploaded_file.name}'이(가) 업로드되었습니다.")
                 
-                # 파일 내용 읽기
+                # 파일 내용 읽기 (같은 업로드는 재실행마다 다시 반영하지 않아 고친 내용이 유지됨)
+                uploaded_file.seek(0)
                 text_content = uploaded_file.read().decode('utf-8')
-                st.session_state["transcript_text"] = text_content
-                st.session_state["recorder_status"] = "transcribed"
+                if st.session_state.get("uploaded_file_id") != uploaded_file.file_id:
+                    set_transcript(text_content)
+                    st.session_state["uploaded_file_id"] = uploaded_file.file_id
+                    st.session_state["recorder_status"] = "transcribed"
                 
                 # 텍스트 미리보기
                 with st.expander("텍스트 미리보기"):
@@ -627,6 +1455,12 @@ def main():
                 
                 # 텍스트 표시
                 display_transcript()
+        
+        # 짧은 음성 메모/통화 녹음 여러 개는 묶어서 한 번에 변환
+        st.markdown("---")
+        st.subheader("여러 파일 한 번에 변환")
+        st.caption("짧은 음성 메모나 통화 녹음 여러 개를 묶어서 한 번에 변환합니다. 파일별 결과에서 요약할 미팅록을 고를 수 있습니다.")
+        display_batch_upload()
 
     # 텍스트 직접 입력 탭
     with tab3:
@@ -634,13 +1468,25 @@ def main():
         transcript_text = st.text_area("미팅 내용을 여기에 붙여넣기하세요", height=300, key="direct_input_text")
         if st.button("텍스트 저장", key="save_text"):
             if transcript_text:
-                st.session_state["transcript_text"] = transcript_text
+                set_transcript(transcript_text)
                 st.session_state["recorder_status"] = "transcribed"
                 st.success("텍스트가 저장되었습니다.")
                 display_transcript()
             else:
                 st.error("텍스트를 입력해주세요.")
 
+    # 지난 미팅 검색 탭
+    with tab4:
+        st.header("미팅 검색")
+        display_meeting_search()
+        with st.expander("세일즈포스 내보내기"):
+            display_crm_export()
+
+    # 미팅록이 버튼을 누른 실행에서만 그려지면 다음 실행(요약 버튼 클릭)에서 사라지므로,
+    # 이번 실행에서 아직 표시하지 않았으면 결과 영역에 계속 표시
+    with result_container:
+        display_transcript()
+
     # 디버깅 정보 표시 영역
     with st.expander("디버깅 정보", expanded=False):
         if "audio_file" in st.session_state and st.session_state["audio_file"] is not None:
@@ -653,7 +1499,65 @@ def main():
             st.write("오디오 파일이 아직 생성되지 않았습니다.")
         
         st.write(f"현재 상태: {st.session_state['recorder_status']}")
+        live_ingest = get_live_ingest()
+        st.write(f"실시간 변환 수신 서버: {f'포트 {live_ingest.port}' if live_ingest else '사용 안 함 (ffmpeg 없음 또는 비활성화)'}")
+        job_stats = get_job_queue().stats()
+        st.write(f"작업 대기열: 실행 중 {job_stats['running']}/{job_stats['max_workers']}, 상태별 {job_stats['counts']}")
         st.write(f"텍스트 변환 여부: {'있음' if 'transcript_text' in st.session_state and st.session_state['transcript_text'] else '없음'}")
+        
+        spool_usage = get_upload_spool().usage()
+        st.write(f"업로드 스풀: {spool_usage['files']}개 파일 (사용 중 {spool_usage['referenced']}개), "
+                 f"{spool_usage['bytes'] / 1024 / 1024:.1f}MB + 녹음/세션/PCM {spool_usage['other_bytes'] / 1024 / 1024:.1f}MB "
+                 f"/ {spool_usage['quota_bytes'] / 1024 / 1024:.0f}MB")
+        
+        cache_stats = get_transcript_cache().stats()
+        st.write(f"변환 캐시: 적중 {cache_stats['hits']}회, 미적중 {cache_stats['misses']}회, "
+                 f"{cache_stats['entries']}개 항목, {cache_stats['bytes'] / 1024 / 1024:.1f}MB")
+        # 모델은 작업 워커 프로세스마다 따로 상주
+        for pid, registry_stats in job_stats["workers"].items():
+            resident = ", ".join(
+                f"{model['model_size']}({model['bytes'] / 1024 / 1024:.0f}MB, 로드 {model['load_seconds']:.1f}초, 사용 중 {model['refs']})"
+                for model in registry_stats["models"]
+            ) or "없음"
+            st.write(f"워커 {pid} 상주 Whisper 모델: {resident} / 예산 {registry_stats['budget_bytes'] / 1024 / 1024:.0f}MB")
+        
+        # 세션 상태 메모리 (직전 실행 끝 기준)
+        session_memory = get_session_memory()
+        memory_stats = session_memory.stats()
+        session_stats = session_memory.session_stats(get_session_id())
+        st.write(f"세션 메모리: 이 세션 {session_stats['bytes'] / 1024 / 1024:.2f}MB "
+                 f"(디스크로 내린 항목 {session_stats['spilled_bytes'] / 1024 / 1024:.2f}MB), "
+                 f"전체 {memory_stats['sessions']}개 세션 {memory_stats['bytes'] / 1024 / 1024:.1f}MB "
+                 f"/ 한도 세션당 {memory_stats['session_max_bytes'] / 1024 / 1024:.0f}MB, "
+                 f"전체 {memory_stats['total_max_bytes'] / 1024 / 1024:.0f}MB "
+                 f"(내림 {memory_stats['spills']}회, 다시 불러옴 {memory_stats['reloads']}회, "
+                 f"유휴 세션 정리 {memory_stats['evicted_sessions']}회)")
+        largest = ", ".join(f"{key} {size / 1024:.0f}KB" for key, size in session_stats["top"])
+        st.write(f"큰 항목: {largest or '없음'}")
+        
+        summary_stats = get_summary_cache().stats()
+        st.write(f"요약 캐시: 적중 {summary_stats['hits']}회, 미적중 {summary_stats['misses']}회, "
+                 f"{summary_stats['entries']}개 항목 (프롬프트 버전 {PROMPT_VERSION})")
+
+    # 단계별 처리 시간 (업로드 저장, 디코딩, Whisper, Claude 요청)
+    with st.expander("처리 시간 지표", expanded=False):
+        display_metrics()
+
+    # 이번 실행의 세션 상태 크기를 집계하고 한도를 넘은 큰 값은 디스크로
+    get_session_memory().enforce(get_session_id(), get_script_run_ctx().session_state)
+
+    # 진행 중인 작업이 있으면 잠시 후 다시 실행해 상태 갱신 (이번 실행에서 새로 제출한 작업 포함)
+    # 요약만 진행 중이면 끝날 때까지 받은 부분을 바로 표시하고, 다른 작업도 있으면 JOB_POLL_SECONDS만큼만
+    jobs_pending = jobs_pending or any(st.session_state.get(state_key) for state_key, _ in JOB_STATE_KEYS)
+    if jobs_pending or live_pending:
+        if st.session_state.get("summary_job_id"):
+            others = live_pending or any(st.session_state.get(state_key) for state_key, _ in JOB_STATE_KEYS
+                                         if state_key != "summary_job_id")
+            stream_summary_job(result_container,
+                               config.JOB_POLL_SECONDS if others else config.SUMMARY_STREAM_SECONDS)
+        else:
+            time.sleep(config.JOB_POLL_SECONDS)
+        st.rerun()
 
 # 앱 실행
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import os
+import uuid
+import shutil
+import subprocess
+
+import numpy as np
+
+import config
+
+SAMPLE_RATE = 16000
+# 스풀 파일 형식: 16kHz mono signed 16-bit little-endian (float32의 절반 크기, 1시간에 약 115MB)
+PCM_DTYPE = np.dtype("<i2")
+# ffmpeg 출력 읽기 단위 (바이트)
+PCM_READ_SIZE = 1024 * 1024
+
+
+def ffmpeg_available():
+    return shutil.which("ffmpeg") is not None
+
+
+# 입력 파일을 16kHz mono s16le로 stdout에 내보내는 ffmpeg 명령 (whisper.load_audio와 같은 변환)
+def _ffmpeg_command(path):
+    return ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-threads", "0", "-i", path,
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "pipe:1"]
+
+
+# ffmpeg 파이프에서 PCM 바이트를 고정 크기로 읽음 (전체를 메모리에 모으지 않음)
+def _iter_pcm_bytes(path, read_size):
+    process = subprocess.Popen(_ffmpeg_command(path), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(read_size)
+            if not data:
+                break
+            yield data
+        error = process.stderr.read().decode("utf-8", "replace").strip()
+        if process.wait() != 0:
+            raise RuntimeError(f"오디오 디코딩 실패: {error or process.returncode}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+# 16-bit PCM -> whisper 입력용 float32 [-1, 1)
+def to_float32(samples):
+    return samples.astype(np.float32) / 32768.0
+
+
+# 입력 파일을 PCM 스풀 파일로 디코딩, 샘플 수 반환
+def decode_to_pcm(path, pcm_path):
+    written = 0
+    with open(pcm_path, "wb") as f:
+        for data in _iter_pcm_bytes(path, PCM_READ_SIZE):
+            f.write(data)
+            written += len(data)
+    return written // PCM_DTYPE.itemsize
+
+
+# PCM 스풀 파일을 배열처럼 읽는 객체 (len, dtype, 슬라이스만 지원)
+# 슬라이스할 때 그 구간만 파일에서 읽으므로 메모리 매핑과 달리 읽은 페이지가 프로세스 메모리에 남지 않음
+class PcmFile:
+    dtype = PCM_DTYPE
+
+    def __init__(self, path):
+        self.path = path
+        self.length = os.path.getsize(path) // PCM_DTYPE.itemsize
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("PcmFile은 연속 구간 슬라이스만 지원합니다.")
+        start, stop, _ = item.indices(self.length)
+        if stop <= start:
+            return np.zeros(0, dtype=PCM_DTYPE)
+        with open(self.path, "rb") as f:
+            f.seek(start * PCM_DTYPE.itemsize)
+            return np.fromfile(f, dtype=PCM_DTYPE, count=stop - start)
+
+
+# PCM 스풀 파일의 [start, end) 구간을 float32로 읽기
+def read_pcm(pcm_path, start, end):
+    return to_float32(PcmFile(pcm_path)[start:end])
+
+
+# 긴 녹음을 디스크의 PCM 스풀로 디코딩해 두고 창 단위로 읽음
+# with PcmSpool(path) as spool: spool.audio[start:end] (int16), 끝나면 스풀 파일 삭제
+class PcmSpool:
+    def __init__(self, audio_file, spool_dir=None):
+        self.audio_file = audio_file
+        self.spool_dir = os.path.join(spool_dir or config.SPOOL_DIR, "pcm")
+        self.path = os.path.join(self.spool_dir, f"{uuid.uuid4().hex}.s16le")
+        self.audio = None
+
+    def __enter__(self):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        try:
+            decode_to_pcm(self.audio_file, self.path)
+            self.audio = PcmFile(self.path)
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def seconds(self):
+        return len(self.audio) / SAMPLE_RATE if self.audio is not None else 0.0
+
+    def close(self):
+        self.audio = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,316 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import config
+from cache_store import file_sha256, make_cache_key
+from model_registry import PRECISIONS, model_key
+
+# 앱에서 사용하는 확장자와 동일
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".webm"}
+TEXT_EXTENSIONS = {".txt"}
+MANIFEST_NAME = "manifest.jsonl"
+# 감시 모드에서 아직 쓰는 중인 파일을 피하기 위한 최소 경과 시간 (초)
+STABLE_SECONDS = 5
+SUMMARY_ERROR_PREFIX = "요약 생성 중 오류 발생"
+
+# 헤드리스 일괄 처리: 디렉터리의 녹음 파일을 변환/요약해 파일별 요약본과 JSONL 매니페스트를 기록
+# - CPU 변환은 프로세스 풀, 네트워크 요약은 스레드 풀로 분리
+# - 매니페스트에 완료로 기록된 파일(내용 해시 기준)은 재시작 시 건너뜀
+#
+# 사용 예:
+#   python batch.py recordings/ --output-dir summaries/ --model-size small
+#   python batch.py inbox/ --watch 30
+
+
+# 변환 워커 프로세스별 Whisper 모델
+_worker_model = None
+_worker_model_size = ""
+
+
+def _init_transcriber(model_size, threads):
+    global _worker_model, _worker_model_size
+    from model_registry import configure_torch_threads
+    configure_torch_threads(threads)
+    from app import load_whisper_model
+    _worker_model = load_whisper_model(model_size)
+    _worker_model_size = model_size
+    if _worker_model is None:
+        raise RuntimeError(f"Whisper 모델을 로드할 수 없습니다: {model_size}")
+
+
+def _transcribe(path, language, vad):
+    from transcription import transcribe_audio
+    return transcribe_audio(_worker_model, path, language=language, vad=vad, model_size=_worker_model_size)
+
+
+# 매니페스트 기록 (여러 스레드에서 호출되므로 잠금 후 한 줄씩 추가)
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    # 파일 해시별 마지막 상태
+    def load(self):
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 비정상 종료로 잘린 마지막 줄
+                    continue
+                records[record["sha256"]] = record
+        return records
+
+    def append(self, record):
+        record = dict(record, recorded_at=datetime.now().isoformat(timespec="seconds"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class BatchProcessor:
+    def __init__(self, output_dir, api_key, model_size="base", language="ko",
+                 transcribe_workers=1, summary_workers=4, meeting_info=None):
+        import app
+        self.app = app
+        self.output_dir = output_dir
+        self.api_key = api_key
+        self.model_size = model_size
+        self.language = language
+        self.vad = bool(config.VAD_ENABLED)
+        self.meeting_info = meeting_info or {}
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.manifest = Manifest(os.path.join(output_dir, MANIFEST_NAME))
+        self.records = self.manifest.load()
+        self.transcript_cache = app.get_transcript_cache()
+        self.meeting_index = app.get_meeting_index()
+        self.crm_exporter = app.get_crm_exporter()
+        self._pending = set()
+        self._attempted = set()  # 이번 실행에서 이미 시도한 파일 (실패 시 재시작 때 재시도)
+        self._lock = threading.Lock()
+
+        cpu_count = os.cpu_count() or 1
+        threads = max(1, cpu_count // transcribe_workers)
+        self.transcribe_pool = ProcessPoolExecutor(
+            max_workers=transcribe_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_transcriber,
+            initargs=(model_size, threads),
+        )
+        self.summary_pool = ThreadPoolExecutor(max_workers=summary_workers)
+
+    # 출력 파일 이름에 확장자까지 포함 (meeting.mp3와 meeting.wav의 결과가 서로 덮어쓰지 않도록)
+    def _output_path(self, source, suffix):
+        return os.path.join(self.output_dir, f"{os.path.basename(source)}{suffix}")
+
+    def _record(self, source, sha256, status, **fields):
+        record = {"file": source, "sha256": sha256, "status": status, "model_size": self.model_size}
+        record.update(fields)
+        self.manifest.append(record)
+        with self._lock:
+            self.records[sha256] = record
+            if status in ("done", "failed"):
+                self._pending.discard(sha256)
+
+    # 디렉터리의 새 파일 제출 (완료/진행 중/이번 실행에서 시도한 파일 제외)
+    def submit_directory(self, input_dir):
+        submitted = 0
+        for name in sorted(os.listdir(input_dir)):
+            path = os.path.join(input_dir, name)
+            extension = os.path.splitext(name)[1].lower()
+            if not os.path.isfile(path) or extension not in AUDIO_EXTENSIONS | TEXT_EXTENSIONS:
+                continue
+            if time.time() - os.path.getmtime(path) < STABLE_SECONDS:
+                continue
+            sha256 = file_sha256(path)
+            with self._lock:
+                previous = self.records.get(sha256)
+                if sha256 in self._pending or sha256 in self._attempted:
+                    continue
+                if previous and previous["status"] == "done" and os.path.exists(previous.get("summary_path", "")):
+                    continue
+                self._pending.add(sha256)
+                self._attempted.add(sha256)
+            self._submit(path, sha256, extension)
+            submitted += 1
+        return submitted
+
+    def _submit(self, path, sha256, extension):
+        previous = self.records.get(sha256)
+        # 변환까지 끝난 파일은 저장된 변환본에서 요약만 다시 수행
+        if previous and previous["status"] == "transcribed" and os.path.exists(previous.get("transcript_path", "")):
+            with open(previous["transcript_path"], "r", encoding="utf-8") as f:
+                self.summary_pool.submit(self._summarize, path, sha256, f.read())
+            return
+
+        if extension in TEXT_EXTENSIONS:
+            with open(path, "r", encoding="utf-8") as f:
+                self.summary_pool.submit(self._summarize, path, sha256, f.read())
+            return
+
+        cache_key = make_cache_key(sha256, self.model_size, self.language, self.vad)
+        cached = self.transcript_cache.get(cache_key)
+        if cached and cached.get("text"):
+            self._on_transcribed(path, sha256, cached)
+            return
+
+        future = self.transcribe_pool.submit(_transcribe, path, self.language, self.vad)
+        future.add_done_callback(lambda f: self._on_transcription_done(f, path, sha256, cache_key))
+
+    def _on_transcription_done(self, future, path, sha256, cache_key):
+        try:
+            result = future.result()
+        except Exception as e:
+            self._record(path, sha256, "failed", stage="transcribe", error=str(e))
+            return
+        if not result["text"]:
+            self._record(path, sha256, "failed", stage="transcribe", error="변환 결과가 비어 있습니다.")
+            return
+        try:
+            self.transcript_cache.put(cache_key, dict(result, model_size=self.model_size))
+        except Exception as e:
+            self._record(path, sha256, "failed", stage="transcribe", error=str(e))
+            return
+        self._on_transcribed(path, sha256, result)
+
+    # 변환본 저장 후 요약 제출 (작업 완료 콜백에서도 불리므로 실패는 매니페스트에 기록해 wait()가 끝나도록)
+    def _on_transcribed(self, path, sha256, result):
+        try:
+            transcript_path = self._output_path(path, ".transcript.txt")
+            with open(transcript_path, "w", encoding="utf-8") as f:
+                f.write(result["text"])
+            self._record(path, sha256, "transcribed", transcript_path=transcript_path)
+            self.summary_pool.submit(self._summarize, path, sha256, result["text"])
+        except Exception as e:
+            self._record(path, sha256, "failed", stage="transcribe", error=str(e))
+
+    # 요약 스레드에서 실행 (예외는 실행기에 묻히므로 실패로 기록해 wait()가 끝나도록)
+    def _summarize(self, path, sha256, transcript):
+        try:
+            self._summarize_file(path, sha256, transcript)
+        except Exception as e:
+            self._record(path, sha256, "failed", stage="summarize", error=str(e))
+
+    def _summarize_file(self, path, sha256, transcript):
+        started = time.time()
+        brand_name = self.meeting_info.get("brand_name") or self.app.extract_brand_name(transcript)
+        meeting_date = self.meeting_info.get("meeting_date") or \
+            datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+        meeting_info = {
+            "company_name": self.meeting_info.get("company_name", "브랜더진"),
+            "our_participants": self.meeting_info.get("our_participants", ""),
+            "meeting_date": meeting_date,
+            "brand_name": brand_name,
+        }
+        summary = self.app.summarize_with_claude(transcript, self.api_key, meeting_info)
+        if not summary or summary.startswith(SUMMARY_ERROR_PREFIX):
+            self._record(path, sha256, "failed", stage="summarize", error=summary)
+            return
+
+        summary_path = self._output_path(path, ".summary.md")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(summary)
+        meeting_id = self.meeting_index.add(transcript, summary, meeting_info, source=path)
+        if self.crm_exporter:
+            self.crm_exporter.enqueue_meetings([self.meeting_index.get(meeting_id)])
+        transcript_path = self._output_path(path, ".transcript.txt")
+        self._record(
+            path, sha256, "done",
+            summary_path=summary_path,
+            transcript_path=transcript_path if os.path.exists(transcript_path) else None,
+            brand_name=brand_name,
+            meeting_date=meeting_date,
+            summary_seconds=round(time.time() - started, 2),
+        )
+
+    # 제출한 작업이 모두 끝날 때까지 대기
+    def wait(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+            time.sleep(0.5)
+
+    def close(self):
+        self.transcribe_pool.shutdown(wait=True)
+        self.summary_pool.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹음 파일 일괄 변환/요약")
+    parser.add_argument("input_dir", help="녹음 파일(.mp3, .wav, .m4a, .webm, .txt) 디렉터리")
+    parser.add_argument("--output-dir", default=None, help="요약본과 매니페스트를 저장할 디렉터리 (기본: input_dir/summaries)")
+    parser.add_argument("--watch", type=float, default=0, metavar="SECONDS", help="디렉터리를 주기적으로 감시")
+    parser.add_argument("--model-size", default="base", choices=["tiny", "base", "small", "medium", "large"])
+    parser.add_argument("--precision", default=config.INFERENCE_MODE, choices=list(PRECISIONS),
+                        help="int8은 Linear 층을 동적 양자화해 CPU에서 더 빠르게 변환")
+    parser.add_argument("--language", default="ko")
+    parser.add_argument("--transcribe-workers", type=int, default=1, help="변환 프로세스 수")
+    parser.add_argument("--summary-workers", type=int, default=4, help="동시 요약 요청 수")
+    parser.add_argument("--api-key", default=os.environ.get("ANTHROPIC_API_KEY"), help="Claude API 키 (기본: ANTHROPIC_API_KEY)")
+    parser.add_argument("--company-name", default="브랜더진")
+    parser.add_argument("--participants", default="")
+    parser.add_argument("--brand-name", default="", help="지정하지 않으면 미팅록에서 추출")
+    parser.add_argument("--meeting-date", default="", help="YYYY-MM-DD (기본: 파일 수정 날짜)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("Claude API 키가 필요합니다 (--api-key 또는 ANTHROPIC_API_KEY).")
+
+    output_dir = args.output_dir or os.path.join(args.input_dir, "summaries")
+    processor = BatchProcessor(
+        output_dir,
+        args.api_key,
+        model_size=model_key(args.model_size, args.precision),
+        language=args.language,
+        transcribe_workers=max(1, args.transcribe_workers),
+        summary_workers=max(1, args.summary_workers),
+        meeting_info={
+            "company_name": args.company_name,
+            "our_participants": args.participants,
+            "brand_name": args.brand_name,
+            "meeting_date": args.meeting_date,
+        },
+    )
+    try:
+        while True:
+            submitted = processor.submit_directory(args.input_dir)
+            if submitted:
+                print(f"{submitted}개 파일 처리 시작")
+            if not args.watch:
+                processor.wait()
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        print("중단합니다. 완료된 파일은 매니페스트에 기록되어 있습니다.")
+    finally:
+        processor.close()
+
+    records = processor.records.values()
+    done = sum(1 for record in records if record["status"] == "done")
+    failed = sum(1 for record in records if record["status"] == "failed")
+    print(f"완료 {done}개, 실패 {failed}개 -> {processor.manifest.path}")
+    if processor.crm_exporter:
+        report = processor.crm_exporter.sync()
+        print(f"세일즈포스 전송 {report['sent']}건, 재시도 대기 {report['retry']}건")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
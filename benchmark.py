@@ -0,0 +1,570 @@
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import platform
+import resource
+import statistics
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import config
+from model_registry import PRECISIONS, model_key, parse_model_key
+
+SAMPLE_RATE = 16000
+# Streamlit 프로세스에서 불러오지 않아야 하는 무거운 모듈
+HEAVY_MODULES = ("whisper", "torch")
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+# 기준값보다 이만큼(비율) 넘게 느려지거나 커지면 회귀로 판단
+DEFAULT_TOLERANCE = 0.25
+# 값이 아주 작을 때 측정 잡음으로 회귀 판정이 나지 않도록 지표 종류별로 허용하는 절대 차이
+ABSOLUTE_SLACK = {"seconds": 0.02, "ms": 0.5, "rtf": 0.01, "mb": 32.0, "cer": 0.01, "ratio": 0.05}
+# int8 변환 결과의 fp32 대비 문자 오류율(CER)이 이 값을 넘으면 실패
+DEFAULT_MAX_CER = 0.05
+# 정확도 비교용 녹음 파일 확장자 (같은 이름의 .txt가 있으면 정답 미팅록으로 사용)
+ACCURACY_EXTENSIONS = (".wav", ".mp3", ".m4a", ".webm")
+
+# 묶음 변환 측정용 짧은 녹음 길이 (초)
+BATCH_FIXTURE_SECONDS = [8, 15, 22, 5, 30, 12, 40, 18]
+
+# 요약 벤치마크용 문장 (브랜드명 추출 대상 포함)
+TRANSCRIPT_SENTENCES = [
+    "안녕하세요 저희는 브랜더진이고 인플루언서 마케팅을 도와드리고 있습니다.",
+    "브랜드명은 라운드랩입니다. 올해 신제품 출시에 맞춰 캠페인을 준비하고 있어요.",
+    "마케터는 세 명이고 인플루언서 마케팅 비중은 전체 예산의 삼십 퍼센트 정도입니다.",
+    "예산은 분기별로 책정하고 있고 성과를 보고 다음 분기에 조정합니다.",
+    "라운드랩 브랜드는 유튜브와 인스타그램 위주로 콘텐츠를 운영하고 있습니다.",
+    "다음 주까지 제안서를 보내주시면 내부 검토 후에 회신드리겠습니다.",
+]
+
+# 전사/요약 파이프라인 벤치마크
+# - 합성 오디오(여러 길이)로 모델 크기별 콜드 로드 시간, 실시간 배율(RTF), 최대 RSS 측정
+# - 로컬 Claude 스텁 서버로 요약 지연 시간 측정 (단일 요청, 분할 요약, 스트리밍)
+# - 기준 JSON과 비교해 회귀가 있으면 종료 코드 1
+#
+# 사용 예:
+#   python benchmark.py --models tiny base --lengths 30 120 600 --save-baseline
+#   python benchmark.py --models tiny base --lengths 30 120 600
+#   python benchmark.py --models base --accuracy --accuracy-dir fixtures/meetings
+#   python benchmark.py --models --cascade base medium --accuracy-dir fixtures/meetings
+#   python benchmark.py --models --batch base --batch-files 12
+
+
+# 말소리와 비슷한 합성 오디오: 음절 속도로 진폭이 변하는 배음 + 사이사이 쉬는 구간 + 약한 잡음
+def synth_speech(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = rng.normal(0, 0.003, total).astype(np.float32)
+    position = 0
+    while position < total:
+        voiced = int(rng.uniform(0.3, 2.0) * SAMPLE_RATE)
+        end = min(total, position + voiced)
+        t = np.arange(end - position) / SAMPLE_RATE
+        f0 = rng.uniform(100, 250)
+        tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = 0.5 * (1 - np.cos(2 * np.pi * rng.uniform(3, 6) * t))
+        audio[position:end] += (0.15 * tone * envelope).astype(np.float32)
+        position = end + int(rng.uniform(0.1, 0.8) * SAMPLE_RATE)
+    return np.clip(audio, -1.0, 1.0)
+
+
+def write_wav(path, audio):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((audio * 32767).astype(np.int16).tobytes())
+
+
+# 길이별 고정 시드 합성 오디오 파일 (실행마다 같은 입력)
+def make_audio_fixtures(directory, lengths):
+    fixtures = {}
+    for seconds in lengths:
+        path = os.path.join(directory, f"synthetic_{seconds}s.wav")
+        if not os.path.exists(path):
+            write_wav(path, synth_speech(seconds, seed=seconds))
+        fixtures[seconds] = path
+    return fixtures
+
+
+# 묶음 변환 측정용 짧은 녹음 (음성 메모/통화 조각처럼 5~40초, 파일마다 길이와 시드가 다름)
+def make_batch_fixtures(directory, count):
+    paths = []
+    for index in range(count):
+        seconds = BATCH_FIXTURE_SECONDS[index % len(BATCH_FIXTURE_SECONDS)]
+        path = os.path.join(directory, f"memo_{index}_{seconds}s.wav")
+        if not os.path.exists(path):
+            write_wav(path, synth_speech(seconds, seed=1000 + index))
+        paths.append(path)
+    return paths
+
+
+def make_transcript(tokens):
+    from summarizer import estimate_tokens
+    sentences = []
+    index = 0
+    while estimate_tokens(" ".join(sentences)) < tokens:
+        sentences.append(TRANSCRIPT_SENTENCES[index % len(TRANSCRIPT_SENTENCES)])
+        index += 1
+    return " ".join(sentences)
+
+
+# 정확도 비교용 고정 녹음 [(이름, 경로, 정답 또는 None)]
+def load_accuracy_fixtures(directory):
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension.lower() not in ACCURACY_EXTENSIONS:
+            continue
+        reference_path = os.path.join(directory, stem + ".txt")
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, encoding="utf-8") as f:
+                reference = f.read()
+        fixtures.append((stem, os.path.join(directory, name), reference))
+    return fixtures
+
+
+# 문자 단위 편집 거리 / 기준 길이 (공백 무시)
+# 행 단위 DP를 numpy로 계산: 삽입 비용은 누적 최소값으로 한 번에 반영
+def character_error_rate(reference, hypothesis):
+    reference = np.array([ord(c) for c in "".join(reference.split())], dtype=np.int32)
+    hypothesis = np.array([ord(c) for c in "".join(hypothesis.split())], dtype=np.int32)
+    if len(reference) == 0:
+        return float(len(hypothesis) > 0)
+    steps = np.arange(len(hypothesis) + 1)
+    previous = steps.copy()
+    for index, char in enumerate(reference, start=1):
+        current = np.empty_like(previous)
+        current[0] = index
+        current[1:] = np.minimum(previous[:-1] + (hypothesis != char), previous[1:] + 1)
+        previous = np.minimum.accumulate(current - steps) + steps
+    return float(previous[-1]) / len(reference)
+
+
+def peak_rss_mb():
+    # Linux의 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# 새 프로세스에서 앱 시작 비용 측정
+# - import 시간, AppTest로 첫 화면을 그리는 데 걸린 시간, 최대 RSS
+# - whisper/torch가 Streamlit 프로세스에 올라왔는지 (텍스트만 쓰는 경로에서는 0이어야 함)
+def _bench_startup(app_path):
+    results = {}
+    started = time.perf_counter()
+    import app  # noqa: F401
+    results["startup.import_seconds"] = time.perf_counter() - started
+    results["startup.import_rss_mb"] = peak_rss_mb()
+
+    from streamlit.testing.v1 import AppTest
+    started = time.perf_counter()
+    at = AppTest.from_file(app_path, default_timeout=120).run()
+    results["startup.first_run_seconds"] = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"앱 실행 오류: {at.exception[0].value}")
+    results["startup.peak_rss_mb"] = peak_rss_mb()
+    results["startup.heavy_modules_loaded"] = sum(name in sys.modules for name in HEAVY_MODULES)
+    return results
+
+
+# 새 프로세스에서 한 모델 크기 측정 (콜드 로드와 최대 RSS가 다른 모델 측정에 섞이지 않도록)
+def _bench_model(model_size, fixtures, repeat, vad):
+    results = {}
+    started = time.perf_counter()
+    import app
+    from transcription import transcribe_audio
+    results["import_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    model = app.load_whisper_model(model_size)
+    results["cold_load_seconds"] = time.perf_counter() - started
+    if model is None:
+        raise RuntimeError(f"Whisper 모델을 로드할 수 없습니다: {model_size}")
+
+    started = time.perf_counter()
+    app.release_whisper_model(model_size)
+    app.load_whisper_model(model_size)
+    results["warm_load_seconds"] = time.perf_counter() - started
+
+    try:
+        for seconds, path in sorted(fixtures.items()):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                transcribe_audio(model, path, language="ko", vad=vad, model_size=model_size)
+                timings.append(time.perf_counter() - started)
+            results[f"rtf.{seconds}s"] = statistics.median(timings) / seconds
+    finally:
+        app.release_whisper_model(model_size)
+        app.release_whisper_model(model_size)
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+# 새 프로세스에서 같은 녹음을 fp32와 int8로 변환해 속도와 결과 차이 비교
+# 정답이 있으면 두 정밀도 모두 정답 대비 CER, 없으면 fp32 결과를 기준으로 int8의 CER
+def _bench_accuracy(model_size, fixtures):
+    from model_registry import load_whisper, model_key
+    from transcription import SAMPLE_RATE as WHISPER_RATE, load_audio, transcribe_audio
+
+    models = {precision: load_whisper(model_key(model_size, precision)) for precision in ("fp32", "int8")}
+    results = {}
+    seconds = {"fp32": 0.0, "int8": 0.0}
+    total_audio = 0.0
+    for name, path, reference in fixtures:
+        audio = load_audio(path)
+        total_audio += len(audio) / WHISPER_RATE
+        texts = {}
+        for precision, model in models.items():
+            started = time.perf_counter()
+            texts[precision] = transcribe_audio(model, audio, language="ko")["text"]
+            seconds[precision] += time.perf_counter() - started
+        if reference is not None:
+            results[f"accuracy.{model_size}.{name}.fp32.cer"] = character_error_rate(reference, texts["fp32"])
+            results[f"accuracy.{model_size}.{name}.int8.cer"] = character_error_rate(reference, texts["int8"])
+        else:
+            results[f"accuracy.{model_size}.{name}.int8_vs_fp32.cer"] = character_error_rate(texts["fp32"], texts["int8"])
+    results[f"accuracy.{model_size}.fp32.rtf"] = seconds["fp32"] / total_audio
+    results[f"accuracy.{model_size}.int8.rtf"] = seconds["int8"] / total_audio
+    # int8 변환 시간 / fp32 변환 시간 (1보다 작을수록 빠름)
+    results[f"accuracy.{model_size}.int8_time_ratio"] = seconds["int8"] / seconds["fp32"] if seconds["fp32"] else 0.0
+    return results
+
+
+# 새 프로세스에서 단계별 변환(작은 모델 초안 + 신뢰도 낮은 구간만 큰 모델로 재변환)과 큰 모델 단독 변환 비교
+# 정답이 있으면 초안/단계별/큰 모델 각각의 CER, 없으면 큰 모델 결과를 기준으로 단계별 변환의 CER
+def _bench_cascade(draft_size, refine_size, fixtures, precision):
+    from model_registry import load_whisper
+    from transcription import refine_segments, splice_segments, transcribe_audio
+
+    draft_model = load_whisper(model_key(draft_size, precision))
+    refine_model = load_whisper(model_key(refine_size, precision))
+    prefix = f"cascade.{draft_size}-{refine_size}"
+    results = {}
+    cpu = {"cascade": 0.0, "full": 0.0}
+    refined_seconds = total_seconds = 0.0
+    for name, path, reference in fixtures:
+        started = time.process_time()
+        draft = transcribe_audio(draft_model, path, language="ko")
+        replacements, report = refine_segments(refine_model, path, draft["segments"], language="ko")
+        cascade_text = "".join(segment["text"] for segment in splice_segments(draft["segments"], replacements))
+        cpu["cascade"] += time.process_time() - started
+        refined_seconds += report["refined_seconds"]
+        total_seconds += report["total_seconds"]
+
+        started = time.process_time()
+        full_text = transcribe_audio(refine_model, path, language="ko")["text"]
+        cpu["full"] += time.process_time() - started
+
+        if reference is not None:
+            results[f"{prefix}.{name}.draft.cer"] = character_error_rate(reference, draft["text"])
+            results[f"{prefix}.{name}.cascade.cer"] = character_error_rate(reference, cascade_text)
+            results[f"{prefix}.{name}.full.cer"] = character_error_rate(reference, full_text)
+        else:
+            results[f"{prefix}.{name}.cascade_vs_full.cer"] = character_error_rate(full_text, cascade_text)
+    # 단계별 변환 CPU 시간 / 큰 모델 단독 CPU 시간, 재변환한 오디오 비율
+    results[f"{prefix}.cpu_ratio"] = cpu["cascade"] / cpu["full"] if cpu["full"] else 0.0
+    results[f"{prefix}.refined_ratio"] = refined_seconds / total_seconds if total_seconds else 0.0
+    return results
+
+
+# 새 프로세스에서 짧은 녹음 여러 개를 파일별로 차례로 변환한 경우와 묶음 변환한 경우 비교
+# 결과 차이는 파일별 변환 결과를 기준으로 한 묶음 변환의 CER
+def _bench_batch(model_size, paths, batch_size):
+    from model_registry import load_whisper
+    from transcription import transcribe_audio, transcribe_batch
+
+    model = load_whisper(model_size)
+    # 첫 호출의 준비 비용이 한쪽에만 들어가지 않도록 한 번 변환
+    transcribe_audio(model, paths[0], language="ko")
+
+    started = time.perf_counter()
+    sequential = [transcribe_audio(model, path, language="ko")["text"] for path in paths]
+    sequential_seconds = time.perf_counter() - started
+    batched, report = transcribe_batch(model, paths, language="ko", batch_size=batch_size)
+
+    prefix = f"batch.{model_size}"
+    reference = "".join(sequential)
+    return {
+        f"{prefix}.sequential.file_seconds": sequential_seconds / len(paths),
+        f"{prefix}.batched.file_seconds": report["seconds"] / len(paths),
+        # 묶음 변환 시간 / 파일별 변환 시간 (1보다 작을수록 빠름)
+        f"{prefix}.time_ratio": report["seconds"] / sequential_seconds if sequential_seconds else 0.0,
+        f"{prefix}.vs_sequential.cer": character_error_rate(reference, "".join(result["text"] for result in batched))
+        if reference.strip() else 0.0,
+    }
+
+
+# int8 CER이 fp32보다 max_cer 넘게 나빠진 녹음 (정답이 없으면 fp32 대비 CER 자체)
+def accuracy_failures(results, max_cer):
+    failures = []
+    for name, value in results.items():
+        if name.endswith(".int8_vs_fp32.cer") and value > max_cer:
+            failures.append(name)
+        elif name.endswith(".int8.cer") and name.startswith("accuracy."):
+            baseline = results.get(name[:-len(".int8.cer")] + ".fp32.cer", 0.0)
+            if value - baseline > max_cer:
+                failures.append(name)
+    return failures
+
+
+# 앱이 변환 버튼에서 제출하는 것과 같은 작업을 대기열로 보내 제출부터 완료까지 측정
+def _bench_job_queue(model_size, fixtures, vad, db_path):
+    from job_queue import DONE, FAILED, JobQueue
+
+    def run_job(path):
+        started = time.perf_counter()
+        job_id = job_queue.submit("transcribe", "benchmark", {
+            "audio_file": path,
+            "model_size": model_size,
+            "language": "ko",
+            "parallel": False,
+            "vad": vad,
+            "cache_key": "",
+        })
+        while True:
+            job = job_queue.get(job_id)
+            if job["status"] in (DONE, FAILED):
+                break
+            time.sleep(0.02)
+        if job["status"] == FAILED:
+            raise RuntimeError(f"변환 작업 실패: {job['error']}")
+        return time.perf_counter() - started
+
+    results = {}
+    job_queue = JobQueue(db_path, 1, poll_interval=0.05, preload_model_size=model_size)
+    try:
+        # 워커 프로세스 기동과 모델 로드는 첫 작업에만 포함되므로 따로 기록
+        results[f"job.{model_size}.first_latency_seconds"] = run_job(fixtures[min(fixtures)])
+        for seconds, path in sorted(fixtures.items()):
+            results[f"job.{model_size}.{seconds}s.latency_seconds"] = run_job(path)
+    finally:
+        job_queue.close()
+    return results
+
+
+def _median_seconds(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+# 스텁 서버를 상대로 요약 지연 시간 측정 (네트워크 지연은 stub_delay로 흉내)
+def bench_summary(repeat, stub_delay, token_delay, long_tokens):
+    import app
+    import claude_client
+    from claude_stub import start_stub_server
+    from meeting_summary import summarize_with_claude
+
+    server, url = start_stub_server(delay=stub_delay, token_delay=token_delay)
+    config.CLAUDE_API_URL = url
+    claude_client._client = None  # 스텁 주소로 새 클라이언트 생성
+    meeting_info = {"company_name": "브랜더진", "our_participants": "김영업", "meeting_date": "2024-01-01",
+                    "brand_name": "라운드랩"}
+
+    short_transcript = make_transcript(2000)
+    long_transcript = make_transcript(long_tokens)
+    results = {}
+    try:
+        def summarize(transcript, on_text=None):
+            summary = summarize_with_claude(transcript, "benchmark-key", meeting_info, on_text=on_text)
+            if summary.startswith("요약 생성 중 오류 발생"):
+                raise RuntimeError(summary)
+
+        results["summary.single.latency_seconds"] = _median_seconds(lambda: summarize(short_transcript), repeat)
+        results["summary.stream.latency_seconds"] = _median_seconds(
+            lambda: summarize(short_transcript, on_text=lambda text: None), repeat)
+        results["summary.map_reduce.latency_seconds"] = _median_seconds(lambda: summarize(long_transcript), repeat)
+        results["brand.extract_ms"] = _median_seconds(lambda: app.extract_brand_name(long_transcript), repeat) * 1000
+    finally:
+        server.shutdown()
+    return results
+
+
+def run_benchmarks(models, lengths, repeat=3, vad=False, queue=False, stub_delay=0.2, token_delay=0.0,
+                   long_tokens=30000, fixture_dir=None, startup=False, precision="fp32", accuracy=False,
+                   accuracy_dir=None, cascade=None, batch=None, batch_files=8, batch_size=None):
+    fixture_dir = fixture_dir or os.path.join(tempfile.gettempdir(), "meeting-notetaker-bench")
+    os.makedirs(fixture_dir, exist_ok=True)
+    fixtures = make_audio_fixtures(fixture_dir, lengths)
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    if startup:
+        app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.update(pool.submit(_bench_startup, app_path).result())
+        print(f"시작: import {results['startup.import_seconds']:.2f}초, 첫 실행 {results['startup.first_run_seconds']:.2f}초, "
+              f"최대 RSS {results['startup.peak_rss_mb']:.0f}MB", file=sys.stderr)
+
+    models = [model_key(model_size, precision) for model_size in models]
+    for model_size in models:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            measured = pool.submit(_bench_model, model_size, fixtures, repeat, vad).result()
+        for name, value in measured.items():
+            results[f"whisper.{model_size}.{name}"] = value
+        print(f"{model_size}: 콜드 로드 {measured['cold_load_seconds']:.2f}초, 최대 RSS {measured['peak_rss_mb']:.0f}MB",
+              file=sys.stderr)
+
+    # 정답 녹음이 없으면 합성 오디오로 결과 차이만 비교
+    accuracy_fixtures = load_accuracy_fixtures(accuracy_dir) if accuracy_dir else [
+        (f"synthetic_{seconds}s", path, None) for seconds, path in sorted(fixtures.items())
+    ]
+    if accuracy:
+        for model_size in {parse_model_key(key)[0]: None for key in models}:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                measured = pool.submit(_bench_accuracy, model_size, accuracy_fixtures).result()
+            results.update(measured)
+            print(f"{model_size}: int8/fp32 변환 시간 {measured[f'accuracy.{model_size}.int8_time_ratio']:.2f}배",
+                  file=sys.stderr)
+
+    if cascade:
+        draft_size, refine_size = cascade
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            measured = pool.submit(_bench_cascade, draft_size, refine_size, accuracy_fixtures, precision).result()
+        results.update(measured)
+        prefix = f"cascade.{draft_size}-{refine_size}"
+        print(f"{prefix}: CPU 시간 {measured[f'{prefix}.cpu_ratio']:.2f}배, "
+              f"재변환 {measured[f'{prefix}.refined_ratio'] * 100:.0f}%", file=sys.stderr)
+
+    if batch:
+        paths = make_batch_fixtures(fixture_dir, batch_files)
+        for model_size in [model_key(model_size, precision) for model_size in batch]:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                measured = pool.submit(_bench_batch, model_size, paths, batch_size).result()
+            results.update(measured)
+            prefix = f"batch.{model_size}"
+            print(f"{prefix}: 파일별 변환 분당 {60 / measured[f'{prefix}.sequential.file_seconds']:.1f}개, "
+                  f"묶음 변환 분당 {60 / measured[f'{prefix}.batched.file_seconds']:.1f}개 "
+                  f"({len(paths)}개 파일, 시간 {measured[f'{prefix}.time_ratio']:.2f}배)", file=sys.stderr)
+
+    if queue and models:
+        with tempfile.TemporaryDirectory() as db_dir:
+            results.update(_bench_job_queue(models[0], fixtures, vad, os.path.join(db_dir, "jobs.db")))
+
+    results.update(bench_summary(repeat, stub_delay, token_delay, long_tokens))
+    return {
+        "results": results,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "models": models,
+            "lengths": lengths,
+            "repeat": repeat,
+            "vad": vad,
+            "stub_delay": stub_delay,
+            "startup": startup,
+            "precision": precision,
+            "accuracy_dir": accuracy_dir,
+            "cascade": cascade,
+            "batch": batch,
+            "batch_files": batch_files,
+            "batch_size": batch_size or config.BATCH_DECODE_SIZE,
+        },
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def _slack(name):
+    for suffix, slack in ABSOLUTE_SLACK.items():
+        if name.endswith(suffix) or f".{suffix}." in name:
+            return slack
+    return 0.0
+
+
+# 기준값과 비교 (모든 지표는 작을수록 좋음), [(이름, 기준, 현재, 변화율, 회귀 여부)] 반환
+def compare(results, baseline, tolerance):
+    rows = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, None, current, None, False))
+            continue
+        change = (current - previous) / previous if previous else 0.0
+        regressed = current > previous * (1 + tolerance) + _slack(name)
+        rows.append((name, previous, current, change, regressed))
+    return rows
+
+
+def print_report(rows):
+    width = max(len(name) for name, *_ in rows)
+    for name, previous, current, change, regressed in rows:
+        if previous is None:
+            print(f"{name:<{width}}  {current:>10.4f}  (기준 없음)")
+        else:
+            mark = "  << 회귀" if regressed else ""
+            print(f"{name:<{width}}  {current:>10.4f}  기준 {previous:>10.4f}  {change * 100:+6.1f}%{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="변환/요약 파이프라인 벤치마크")
+    parser.add_argument("--models", nargs="*", default=["tiny", "base"], choices=["tiny", "base", "small", "medium", "large"])
+    parser.add_argument("--lengths", nargs="+", type=int, default=[30, 120, 600], help="합성 오디오 길이 (초)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--vad", action="store_true", help="무음 구간 제거를 켠 상태로 측정")
+    parser.add_argument("--queue", action="store_true", help="작업 대기열을 거친 제출~완료 시간도 측정")
+    parser.add_argument("--startup", action="store_true", help="앱 import/첫 화면 시간과 메모리도 측정")
+    parser.add_argument("--stub-delay", type=float, default=0.2, help="스텁 Claude 응답 지연 (초)")
+    parser.add_argument("--long-tokens", type=int, default=30000, help="분할 요약 측정용 미팅록 길이 (토큰)")
+    parser.add_argument("--precision", default="fp32", choices=list(PRECISIONS), help="모델 측정에 쓸 추론 정밀도")
+    parser.add_argument("--accuracy", action="store_true", help="모델 크기별로 int8과 fp32의 변환 속도와 결과 차이 비교")
+    parser.add_argument("--accuracy-dir", default=None,
+                        help="정확도 비교용 녹음 디렉터리 (녹음과 같은 이름의 .txt를 정답으로 사용, 기본: 합성 오디오)")
+    parser.add_argument("--cascade", nargs=2, metavar=("DRAFT", "REFINE"), default=None,
+                        choices=["tiny", "base", "small", "medium", "large"],
+                        help="단계별 변환(DRAFT 초안 + REFINE 재변환)과 REFINE 단독 변환의 CPU 시간과 결과 비교")
+    parser.add_argument("--batch", nargs="+", default=None, choices=["tiny", "base", "small", "medium", "large"],
+                        help="짧은 녹음 여러 개를 파일별로 변환한 경우와 묶음 변환한 경우의 분당 파일 수 비교")
+    parser.add_argument("--batch-files", type=int, default=8, help="묶음 변환 측정에 쓸 짧은 녹음 수")
+    parser.add_argument("--batch-size", type=int, default=None, help="한 번에 인코더/디코더에 넣는 창 수 (기본: 설정값)")
+    parser.add_argument("--max-cer", type=float, default=DEFAULT_MAX_CER, help="int8 변환에서 허용하는 CER 증가")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="회귀로 볼 증가 비율")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.models, args.lengths, repeat=args.repeat, vad=args.vad, queue=args.queue,
+                            stub_delay=args.stub_delay, long_tokens=args.long_tokens, startup=args.startup,
+                            precision=args.precision, accuracy=args.accuracy, accuracy_dir=args.accuracy_dir,
+                            cascade=args.cascade, batch=args.batch, batch_files=args.batch_files,
+                            batch_size=args.batch_size)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    rows = compare(report["results"], baseline, args.tolerance)
+    print_report(rows)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준 저장: {args.baseline}")
+        return 0
+
+    regressions = [name for name, _, _, _, regressed in rows if regressed]
+    regressions += accuracy_failures(report["results"], args.max_cer)
+    if regressions:
+        print(f"회귀 {len(regressions)}건: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import os
+import re
+import csv
+import threading
+from collections import Counter
+
+import config
+
+try:
+    import ahocorasick  # pyahocorasick (C 구현, 없으면 순수 파이썬 트라이 사용)
+except ImportError:
+    ahocorasick = None
+
+UNKNOWN_BRAND = "미확인 브랜드"
+
+# 브랜드명 패턴
+# 문장 조각 전체가 잡히지 않도록 이름은 최대 두 어절로 제한
+_NAME = r"([^\s,\.\"'“”‘’]{1,20}(?:\s[A-Za-z0-9][^\s,\.\"'“”‘’]{0,19})?)"
+# 이름을 직접 밝히는 표현 ("브랜드명은 X", "브랜드 이름은 X", "회사명: X"), 언급 횟수와 관계없이 다른 후보보다 우선
+EXPLICIT_PATTERNS = [
+    re.compile(r"(?:브랜드|회사)\s*(?:명|이름)\s*(?:은|는|:)\s*[\"'“‘]?" + _NAME),
+    re.compile(r"브랜드\s*:\s*[\"'“‘]?" + _NAME),
+]
+# 이름 앞뒤에 자주 오는 표현 (후보는 글 전체 언급 횟수순, 횟수가 같으면 앞에 있는 패턴의 후보 우선)
+MENTION_PATTERNS = [
+    re.compile(r"브랜드(?:측)?\s*(?:은|는)\s*[\"'“‘]?" + _NAME),
+    re.compile(r"([^\s,\.\"'“”‘’]{2,20})\s+브랜드"),
+    re.compile(r"([^\s,\.\"'“”‘’]{2,20})\s+회사"),
+]
+BRAND_PATTERNS = EXPLICIT_PATTERNS + MENTION_PATTERNS
+
+# 이름 끝에 붙은 조사/서술격 조사 (에서도, 입니다처럼 두 개까지 이어 붙은 경우 포함)
+_PARTICLES = (r"(?:입니다|이에요|이라고|이라는|이랑|에서|으로|에게|부터|까지|예요|이고|이며|라고|라는"
+              r"|은|는|이|가|을|를|의|에|와|과|랑|도|로)")
+PARTICLE_SUFFIX = re.compile(_PARTICLES + "{1,2}$")
+# 이름 바로 뒤에 오는 조사 (조사 뒤에서 단어가 끝나야 함)
+PARTICLE_PREFIX = re.compile(_PARTICLES + r"{1,2}(?!\w)")
+
+# 브랜드명이 아닌 흔한 앞말과 일반 명사 ("회사 브랜드", "대행사 회사"처럼 패턴에 걸리는 말)
+STOPWORDS = {
+    "저희", "우리", "우리의", "제", "저", "그", "이", "해당", "어떤", "다른", "모든", "많은", "여러", "같은",
+    "어느", "자체", "신규", "기존", "전체", "이런", "그런", "저런", "국내", "해외", "큰", "작은",
+    "회사", "대행사", "업체", "브랜드", "고객사", "광고주", "광고대행사", "에이전시", "본사", "자사", "타사",
+    "경쟁사", "협력사", "파트너사", "제조사", "유통사", "벤더", "스타트업", "중소기업", "대기업",
+    "화장품", "뷰티", "코스메틱", "패션", "식품", "제품", "자사몰", "온라인", "오프라인", "인플루언서",
+}
+
+# CRM 내보내기 CSV에서 브랜드명으로 읽을 열 이름
+NAME_COLUMNS = ("Account Name", "Name", "Brand", "brand", "brand_name", "브랜드명", "브랜드")
+
+
+# 한글/영문/숫자 (사전 매칭 시 단어 중간에서 시작하는 매칭 제외용)
+def _is_word_char(char):
+    return char.isalnum()
+
+
+# text[start:end]가 독립된 이름인지 (앞은 단어 경계, 뒤는 글 끝/단어 경계/조사)
+def _is_mention(text, start, end):
+    if start > 0 and _is_word_char(text[start - 1]):
+        return False
+    return end >= len(text) or not _is_word_char(text[end]) or PARTICLE_PREFIX.match(text, end) is not None
+
+
+# 글에서 name이 독립된 이름으로 언급된 횟수 (대소문자 무시)
+def count_mentions(text, name):
+    lowered, name = text.lower(), name.lower()
+    count = 0
+    start = lowered.find(name)
+    while start >= 0:
+        if _is_mention(lowered, start, start + len(name)):
+            count += 1
+        start = lowered.find(name, start + 1)
+    return count
+
+
+# 사전 단어를 한 번의 선형 스캔으로 찾는 Aho-Corasick 자동자 (순수 파이썬 구현)
+class AhoCorasick:
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for index, word in enumerate(words):
+            self._add(word, index)
+        self._build()
+
+    def _add(self, word, index):
+        state = 0
+        for char in word:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(index)
+
+    # 너비 우선으로 실패 링크 연결, 출력은 실패 링크를 따라 합침
+    def _build(self):
+        queue = list(self.goto[0].values())
+        position = 0
+        while position < len(queue):
+            state = queue[position]
+            position += 1
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    # (끝 위치, 단어 번호) 생성
+    def iter(self, text):
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for index in output[state]:
+                    yield end, index
+
+
+# CRM 내보내기 파일에서 브랜드명 목록 읽기 (CSV는 이름 열, 그 외에는 한 줄에 하나)
+def load_brand_dictionary(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if not path.lower().endswith(".csv"):
+            return [line.strip() for line in f if line.strip()]
+        reader = csv.DictReader(f)
+        column = next((name for name in NAME_COLUMNS if name in (reader.fieldnames or [])), None)
+        if column is None and reader.fieldnames:
+            column = reader.fieldnames[0]
+        return [row[column].strip() for row in reader if column and (row.get(column) or "").strip()]
+
+
+# 브랜드명 추출기
+# - 사전이 있으면 사전에 있는 브랜드 중 가장 많이 언급된 이름을 우선
+# - 없거나 사전 매칭이 없으면 미리 컴파일한 패턴들로 후보를 모아, 이름을 직접 밝힌 후보를 먼저, 그다음 글 전체 언급 횟수순
+class BrandExtractor:
+    def __init__(self, brands=()):
+        # 대소문자만 다른 항목은 처음 나온 표기로 통일
+        self.brands = []
+        seen = set()
+        for brand in brands:
+            key = brand.strip().lower()
+            if len(key) >= 2 and key not in seen:
+                seen.add(key)
+                self.brands.append(brand.strip())
+        keys = [brand.lower() for brand in self.brands]
+        self._keys = keys
+        if not keys:
+            self._automaton = None
+        elif ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for index, key in enumerate(keys):
+                self._automaton.add_word(key, index)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = AhoCorasick(keys)
+
+    # 사전 브랜드별 언급 횟수
+    # 겹치는 항목(이니/이니스프리)은 같은 위치에서 가장 긴 것만, 이미 센 이름 안쪽에서 시작하는 매칭은 제외
+    def dictionary_matches(self, text):
+        counts = Counter()
+        if self._automaton is None:
+            return counts
+        lowered = text.lower()
+        keys = self._keys
+        longest = {}
+        for end, index in self._automaton.iter(lowered):
+            start = end - len(keys[index]) + 1
+            if not _is_mention(lowered, start, end + 1):
+                continue
+            if start not in longest or len(keys[index]) > len(keys[longest[start]]):
+                longest[start] = index
+        covered = 0
+        for start in sorted(longest):
+            if start < covered:
+                continue
+            index = longest[start]
+            counts[index] += 1
+            covered = start + len(keys[index])
+        return Counter({self.brands[index]: count for index, count in counts.items()})
+
+    # 모든 패턴의 후보별 (글 전체 언급 횟수, 후보가 나온 가장 앞선 패턴 순번)
+    def pattern_matches(self, text):
+        candidates = {}
+        for priority, pattern in enumerate(BRAND_PATTERNS):
+            for match in pattern.finditer(text):
+                name = PARTICLE_SUFFIX.sub("", match.group(1).strip())
+                if len(name) >= 2 and name not in STOPWORDS and name not in candidates:
+                    candidates[name] = priority
+        return {name: (max(1, count_mentions(text, name)), priority) for name, priority in candidates.items()}
+
+    # 빈도순 후보 목록 [(이름, 횟수), ...]
+    # 사전 매칭이 있으면 사전 후보만, 없으면 패턴 후보를 이름을 직접 밝힌 후보 먼저, 그다음 언급 횟수순
+    # (같으면 앞선 패턴, 먼저 나온 후보 순)
+    def rank(self, text):
+        counts = self.dictionary_matches(text)
+        if counts:
+            # Counter.most_common은 같은 횟수일 때 먼저 나온 후보를 앞에 둠
+            return counts.most_common()
+        candidates = self.pattern_matches(text)
+        explicit = len(EXPLICIT_PATTERNS)
+        ranked = sorted(candidates.items(), key=lambda item: (item[1][1] >= explicit, -item[1][0], item[1][1]))
+        return [(name, count) for name, (count, _) in ranked]
+
+    def extract(self, text):
+        ranked = self.rank(text or "")
+        return ranked[0][0] if ranked else UNKNOWN_BRAND
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 추출기 (사전은 처음 사용할 때 한 번만 읽어 색인)
+def get_brand_extractor():
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            path = config.BRAND_DICTIONARY_PATH
+            brands = load_brand_dictionary(path) if path and os.path.exists(path) else []
+            _extractor = BrandExtractor(brands)
+        return _extractor
+
+
+def extract_brand_name(text):
+    return get_brand_extractor().extract(text)
@@ -0,0 +1,180 @@
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from metrics import get_metrics
+
+# 재시도 대상 상태 코드 (529: Anthropic 과부하)
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+
+
+class ClaudeAPIError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# Retry-After 헤더를 초 단위로 변환 (숫자 또는 HTTP 날짜 형식)
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# 응답 본문에서 오류 메시지 추출
+def _error_message(response):
+    try:
+        error = response.json().get("error", {})
+        return f"{response.status_code} {error.get('type', '')}: {error.get('message', '')}".strip()
+    except ValueError:
+        return f"{response.status_code} {response.text[:200]}"
+
+
+# 연결 풀을 공유하는 Claude Messages API 클라이언트
+# - keep-alive 세션 재사용, 연결/읽기 타임아웃 분리
+# - 429/5xx/529 및 연결 오류는 지수 백오프(지터 포함)로 재시도, Retry-After 우선
+# - stream_message는 SSE로 받은 텍스트 조각을 순서대로 반환
+class ClaudeClient:
+    def __init__(self, api_url=None, api_version=None, connect_timeout=None, read_timeout=None,
+                 max_retries=None, backoff_base=None, backoff_max=None, pool_size=None):
+        self.api_url = api_url or config.CLAUDE_API_URL
+        self.api_version = api_version or config.CLAUDE_API_VERSION
+        self.timeout = (
+            connect_timeout or config.CLAUDE_CONNECT_TIMEOUT,
+            read_timeout or config.CLAUDE_READ_TIMEOUT,
+        )
+        self.max_retries = config.CLAUDE_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base or config.CLAUDE_BACKOFF_BASE
+        self.backoff_max = backoff_max or config.CLAUDE_BACKOFF_MAX
+
+        pool_size = pool_size or config.CLAUDE_POOL_SIZE
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # full jitter: 0 ~ base * 2^attempt
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, api_key, payload, stream=False, api_url=None):
+        headers = {
+            "x-api-key": api_key,
+            "anthropic-version": self.api_version,
+            "Content-Type": "application/json"
+        }
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(
+                    api_url or self.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise ClaudeAPIError(f"Claude API 연결 실패: {e}") from e
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code < 400:
+                return response
+
+            message = _error_message(response)
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            response.close()
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                raise ClaudeAPIError(f"Claude API 오류: {message}", response.status_code)
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def _payload(self, prompt, max_tokens, model, stream):
+        payload = {
+            "model": model or config.CLAUDE_MODEL,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    # 전체 응답을 한 번에 받아 텍스트 반환 (요청별 시간과 토큰 사용량을 지표로 기록)
+    def create_message(self, prompt, api_key, max_tokens=4000, model=None, api_url=None):
+        model = model or config.CLAUDE_MODEL
+        with get_metrics().stage("claude_request", model=model, stream=False) as fields:
+            response = self._post(api_key, self._payload(prompt, max_tokens, model, False), api_url=api_url)
+            result = response.json()
+            usage = result.get("usage", {})
+            fields["prompt_tokens"] = usage.get("input_tokens", 0)
+            fields["response_tokens"] = usage.get("output_tokens", 0)
+        return "".join(block.get("text", "") for block in result["content"] if block.get("type") == "text")
+
+    # SSE 스트리밍으로 텍스트 조각을 도착하는 대로 반환
+    def stream_message(self, prompt, api_key, max_tokens=4000, model=None, api_url=None):
+        model = model or config.CLAUDE_MODEL
+        with get_metrics().stage("claude_request", model=model, stream=True) as fields:
+            yield from self._stream_events(prompt, api_key, max_tokens, model, api_url, fields)
+
+    def _stream_events(self, prompt, api_key, max_tokens, model, api_url, fields):
+        response = self._post(api_key, self._payload(prompt, max_tokens, model, True), stream=True, api_url=api_url)
+        with response:
+            event_type = None
+            for line in response.iter_lines(decode_unicode=False):
+                if not line:
+                    event_type = None
+                    continue
+                line = line.decode("utf-8")
+                if line.startswith("event:"):
+                    event_type = line[len("event:"):].strip()
+                    continue
+                if not line.startswith("data:"):
+                    continue
+                data = json.loads(line[len("data:"):].strip())
+                event_type = data.get("type", event_type)
+                if event_type == "message_start":
+                    usage = data.get("message", {}).get("usage", {})
+                    fields["prompt_tokens"] = usage.get("input_tokens", 0)
+                elif event_type == "message_delta":
+                    fields["response_tokens"] = data.get("usage", {}).get("output_tokens", 0)
+                elif event_type == "content_block_delta":
+                    delta = data.get("delta", {})
+                    if delta.get("type") == "text_delta":
+                        yield delta.get("text", "")
+                elif event_type == "error":
+                    error = data.get("error", {})
+                    raise ClaudeAPIError(f"Claude API 스트림 오류: {error.get('type', '')}: {error.get('message', '')}")
+                elif event_type == "message_stop":
+                    return
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 클라이언트
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ClaudeClient()
+        return _client
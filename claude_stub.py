@@ -0,0 +1,119 @@
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 로컬 개발/테스트용 Claude Messages API 스텁 서버
+# NOTETAKER_CLAUDE_API_URL=http://127.0.0.1:<port>/v1/messages 로 지정해서 사용
+
+
+class ClaudeStubHandler(BaseHTTPRequestHandler):
+    # 지연(초), 응답 생성 함수, 주입할 실패 상태 코드는 서버 객체에서 가져옴
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/messages":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests.append(body)
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        # 실패 응답 주입 (재시도 확인용): fail_statuses에서 하나씩 꺼내 사용
+        if self.server.fail_statuses:
+            status = self.server.fail_statuses.pop(0)
+            payload = json.dumps({"type": "error", "error": {"type": "overloaded_error", "message": "stub"}}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("retry-after", "0")
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        prompt = body["messages"][-1]["content"]
+        text = self.server.responder(prompt)
+        usage = {"input_tokens": len(prompt), "output_tokens": len(text)}
+        if body.get("stream"):
+            self._send_stream(body, text, usage)
+            return
+
+        payload = json.dumps({
+            "id": f"msg_stub_{len(self.server.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": usage,
+        }, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # SSE 형식으로 몇 글자씩 나눠 전송
+    def _send_stream(self, body, text, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def send(event, data):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send("message_start", {"type": "message_start", "message": {
+            "id": f"msg_stub_{len(self.server.requests)}", "type": "message", "role": "assistant",
+            "model": body.get("model"), "content": [], "usage": {"input_tokens": usage["input_tokens"], "output_tokens": 0},
+        }})
+        send("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        for start in range(0, len(text), 8):
+            send("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                         "delta": {"type": "text_delta", "text": text[start:start + 8]}})
+            if self.server.token_delay:
+                time.sleep(self.server.token_delay)
+        send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        send("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                               "usage": {"output_tokens": usage["output_tokens"]}})
+        send("message_stop", {"type": "message_stop"})
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def default_responder(prompt):
+    return f"- 스텁 응답 (프롬프트 {len(prompt)}자)"
+
+
+# 백그라운드 스레드에서 스텁 서버 시작, (서버, API URL) 반환
+def start_stub_server(port=0, delay=0.0, responder=default_responder, token_delay=0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), ClaudeStubHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.responder = responder
+    server.token_delay = token_delay
+    server.fail_statuses = []
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/messages"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Claude Messages API 스텁 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연(초)")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.delay)
+    print(f"스텁 서버 실행 중: {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
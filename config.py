@@ -0,0 +1,170 @@
+import os
+import tempfile
+
+# 환경 변수 기반 설정 (NOTETAKER_ 접두사)
+ENV_PREFIX = "NOTETAKER_"
+
+
+def _env(name, default, cast=str):
+    value = os.environ.get(ENV_PREFIX + name)
+    if value is None or value == "":
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        return default
+
+
+# 병렬 분할 변환 설정
+# 작업 대기열에서 실행할 때는 코어와 모델 메모리 예산(MODEL_MEMORY_BUDGET_MB)을 JOB_WORKERS개 작업이 나눈 만큼으로 제한
+TRANSCRIBE_WORKERS = _env("TRANSCRIBE_WORKERS", os.cpu_count() or 1, int)
+TRANSCRIBE_WINDOW_SECONDS = _env("TRANSCRIBE_WINDOW_SECONDS", 120.0, float)
+TRANSCRIBE_OVERLAP_SECONDS = _env("TRANSCRIBE_OVERLAP_SECONDS", 3.0, float)
+TRANSCRIBE_SILENCE_SEARCH_SECONDS = _env("TRANSCRIBE_SILENCE_SEARCH_SECONDS", 10.0, float)
+
+# 스트리밍 디코딩 설정 (녹음을 디스크의 PCM 스풀로 디코딩하고 창 단위로 읽어 메모리 사용량을 녹음 길이와 무관하게 유지)
+# 0이면 파일 전체를 float32 배열로 디코딩 (1시간에 약 230MB)
+STREAM_DECODE = _env("STREAM_DECODE", 1, int)
+# 단일 모델 변환에서 한 번에 메모리에 올리는 창 길이 (초, 10분에 약 38MB)
+STREAM_WINDOW_SECONDS = _env("STREAM_WINDOW_SECONDS", 600.0, float)
+
+# 단계별 변환 설정: 작은 모델로 전체 초안을 만든 뒤 신뢰도가 낮은 구간만 선택한 모델로 다시 변환
+CASCADE_DRAFT_MODEL = _env("CASCADE_DRAFT_MODEL", "base")
+# 세그먼트 평균 로그 확률이 이보다 낮거나 압축률(같은 말 반복)이 이보다 높으면 재변환 대상
+CASCADE_LOGPROB_THRESHOLD = _env("CASCADE_LOGPROB_THRESHOLD", -0.8, float)
+CASCADE_COMPRESSION_THRESHOLD = _env("CASCADE_COMPRESSION_THRESHOLD", 2.4, float)
+# 재변환 구간 앞뒤 여유와, 이 간격보다 가까운 구간은 하나로 합침 (초)
+CASCADE_PADDING_SECONDS = _env("CASCADE_PADDING_SECONDS", 0.5, float)
+CASCADE_MERGE_GAP_SECONDS = _env("CASCADE_MERGE_GAP_SECONDS", 2.0, float)
+
+# 여러 파일 묶음 변환 설정: 파일들을 30초 창으로 나눠 여러 창을 한 번에 인코더/디코더에 넣음
+# 한 번에 넣는 창 수 (클수록 행렬 연산 효율이 좋지만 메모리를 더 씀)
+BATCH_DECODE_SIZE = _env("BATCH_DECODE_SIZE", 8, int)
+# 한 번에 올릴 수 있는 파일 수
+BATCH_MAX_FILES = _env("BATCH_MAX_FILES", 20, int)
+
+# 디스크 캐시 설정
+CACHE_DIR = _env("CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "meeting-notetaker"))
+TRANSCRIPT_CACHE_MAX_MB = _env("TRANSCRIPT_CACHE_MAX_MB", 512, int)
+
+# 업로드 스풀 설정
+SPOOL_DIR = _env("SPOOL_DIR", os.path.join(tempfile.gettempdir(), "meeting-notetaker-spool"))
+SPOOL_QUOTA_MB = _env("SPOOL_QUOTA_MB", 4096, int)
+SPOOL_TTL_SECONDS = _env("SPOOL_TTL_SECONDS", 6 * 3600, int)
+
+# 세션 상태 메모리 설정 (미팅록/세그먼트/요약을 SPOOL_DIR/session 아래로 내림)
+# 세션당 또는 전체 합계가 한도를 넘거나, 유휴 시간 동안 실행이 없던 세션의 큰 값을 내리고 읽을 때 다시 불러옴
+SESSION_MEMORY_MAX_MB = _env("SESSION_MEMORY_MAX_MB", 8.0, float)
+SESSION_MEMORY_TOTAL_MB = _env("SESSION_MEMORY_TOTAL_MB", 256.0, float)
+SESSION_IDLE_SECONDS = _env("SESSION_IDLE_SECONDS", 900, int)
+# 이보다 작은 항목은 내리지 않음
+SESSION_SPILL_MIN_KB = _env("SESSION_SPILL_MIN_KB", 16, int)
+# 실행이 없어도 유휴 세션을 정리하는 주기 (0이면 실행 끝에만 정리)
+SESSION_SWEEP_SECONDS = _env("SESSION_SWEEP_SECONDS", 60.0, float)
+
+# Claude API 설정
+CLAUDE_API_URL = _env("CLAUDE_API_URL", "https://api.anthropic.com/v1/messages")
+CLAUDE_MODEL = _env("CLAUDE_MODEL", "claude-3-haiku-20240307")
+CLAUDE_API_VERSION = _env("CLAUDE_API_VERSION", "2023-06-01")
+
+# 긴 미팅록 분할 요약 설정
+SUMMARY_SINGLE_PASS_TOKENS = _env("SUMMARY_SINGLE_PASS_TOKENS", 12000, int)
+SUMMARY_CHUNK_TOKENS = _env("SUMMARY_CHUNK_TOKENS", 6000, int)
+SUMMARY_CHUNK_OVERLAP_TOKENS = _env("SUMMARY_CHUNK_OVERLAP_TOKENS", 200, int)
+SUMMARY_MAP_WORKERS = _env("SUMMARY_MAP_WORKERS", 8, int)
+SUMMARY_MAP_MAX_TOKENS = _env("SUMMARY_MAP_MAX_TOKENS", 1200, int)
+# 미팅록을 고친 뒤 다시 요약할 때, 바뀐 부분이 이 비율 이하이면 이전 요약을 바뀐 부분만으로 수정
+SUMMARY_UPDATE_MAX_RATIO = _env("SUMMARY_UPDATE_MAX_RATIO", 0.3, float)
+
+# 요약 요청 전 미팅록 정리 (군말/반복 제거, 토큰 예산)
+COMPACT_ENABLED = _env("COMPACT_ENABLED", 1, int)
+# 정리 후에도 넘으면 앞부분(회사 소개) 구간을 줄이는 토큰 예산 (기본: 단일 요청 한도, 0이면 줄이지 않음)
+COMPACT_TOKEN_BUDGET = _env("COMPACT_TOKEN_BUDGET", SUMMARY_SINGLE_PASS_TOKENS, int)
+COMPACT_MAX_NGRAM = _env("COMPACT_MAX_NGRAM", 8, int)
+COMPACT_OPENING_RATIO = _env("COMPACT_OPENING_RATIO", 0.2, float)
+COMPACT_OPENING_KEEP_TOKENS = _env("COMPACT_OPENING_KEEP_TOKENS", 300, int)
+
+# Claude API 연결/재시도 설정
+CLAUDE_CONNECT_TIMEOUT = _env("CLAUDE_CONNECT_TIMEOUT", 10.0, float)
+CLAUDE_READ_TIMEOUT = _env("CLAUDE_READ_TIMEOUT", 120.0, float)
+CLAUDE_MAX_RETRIES = _env("CLAUDE_MAX_RETRIES", 4, int)
+CLAUDE_BACKOFF_BASE = _env("CLAUDE_BACKOFF_BASE", 1.0, float)
+CLAUDE_BACKOFF_MAX = _env("CLAUDE_BACKOFF_MAX", 30.0, float)
+CLAUDE_POOL_SIZE = _env("CLAUDE_POOL_SIZE", 16, int)
+SUMMARY_CACHE_MAX_MB = _env("SUMMARY_CACHE_MAX_MB", 64, int)
+SUMMARY_CACHE_TTL_SECONDS = _env("SUMMARY_CACHE_TTL_SECONDS", 7 * 24 * 3600, int)
+
+# Whisper 모델 레지스트리 설정
+DEFAULT_MODEL_SIZE = _env("DEFAULT_MODEL_SIZE", "base")
+MODEL_MEMORY_BUDGET_MB = _env("MODEL_MEMORY_BUDGET_MB", 4096, int)
+MODEL_PRELOAD = _env("MODEL_PRELOAD", 1, int)
+# 모델 미리 로드를 끈 경우에도 작업 워커에서 whisper/torch import는 백그라운드로 미리 시작
+WHISPER_IMPORT_WARMUP = _env("WHISPER_IMPORT_WARMUP", 1, int)
+
+# 백그라운드 작업 대기열 설정
+JOB_WORKERS = _env("JOB_WORKERS", max(1, (os.cpu_count() or 1) // 2), int)
+JOB_DB_PATH = _env("JOB_DB_PATH", os.path.join(CACHE_DIR, "jobs.sqlite3"))
+JOB_POLL_SECONDS = _env("JOB_POLL_SECONDS", 1.0, float)
+# 요약이 진행 중이면 전체 재실행 대신 이 간격으로 받은 부분만 갱신 (최대 SUMMARY_STREAM_SECONDS 동안, 이후 재실행)
+SUMMARY_STREAM_POLL_SECONDS = _env("SUMMARY_STREAM_POLL_SECONDS", 0.1, float)
+SUMMARY_STREAM_SECONDS = _env("SUMMARY_STREAM_SECONDS", 30.0, float)
+
+# 지난 미팅 검색 색인 (SQLite FTS5)
+MEETING_INDEX_PATH = _env("MEETING_INDEX_PATH", os.path.join(CACHE_DIR, "meetings.sqlite3"))
+MEETING_SEARCH_LIMIT = _env("MEETING_SEARCH_LIMIT", 20, int)
+
+# 세일즈포스 내보내기 (인스턴스 URL과 액세스 토큰이 없으면 비활성화)
+CRM_INSTANCE_URL = _env("CRM_INSTANCE_URL", "")
+CRM_ACCESS_TOKEN = _env("CRM_ACCESS_TOKEN", "")
+CRM_API_VERSION = _env("CRM_API_VERSION", "v59.0")
+CRM_OBJECT = _env("CRM_OBJECT", "Brand_Meeting__c")
+CRM_EXTERNAL_ID_FIELD = _env("CRM_EXTERNAL_ID_FIELD", "Meeting_Key__c")
+CRM_BATCH_SIZE = _env("CRM_BATCH_SIZE", 200, int)
+CRM_WORKERS = _env("CRM_WORKERS", 4, int)
+CRM_REQUESTS_PER_SECOND = _env("CRM_REQUESTS_PER_SECOND", 10.0, float)
+CRM_MAX_ATTEMPTS = _env("CRM_MAX_ATTEMPTS", 8, int)
+CRM_BACKOFF_BASE = _env("CRM_BACKOFF_BASE", 1.0, float)
+CRM_BACKOFF_MAX = _env("CRM_BACKOFF_MAX", 300.0, float)
+CRM_CONNECT_TIMEOUT = _env("CRM_CONNECT_TIMEOUT", 10.0, float)
+CRM_READ_TIMEOUT = _env("CRM_READ_TIMEOUT", 120.0, float)
+CRM_QUEUE_PATH = _env("CRM_QUEUE_PATH", os.path.join(CACHE_DIR, "crm_export.sqlite3"))
+# 백그라운드 자동 전송 주기 (초, 0이면 수동 전송만)
+CRM_SYNC_SECONDS = _env("CRM_SYNC_SECONDS", 60.0, float)
+
+# CPU 추론 설정
+# fp32: 원본 가중치, int8: Linear 층 동적 양자화 (CPU에서 더 빠르고 메모리가 적음)
+INFERENCE_MODE = _env("INFERENCE_MODE", "fp32")
+# 프로세스당 torch 연산 스레드 수 (기본: 코어를 작업 워커 수로 나눈 값)
+WHISPER_THREADS = _env("WHISPER_THREADS", max(1, (os.cpu_count() or 1) // max(1, JOB_WORKERS)), int)
+
+# 무음 구간 제거(VAD) 설정
+VAD_ENABLED = _env("VAD_ENABLED", 1, int)
+VAD_FRAME_SECONDS = _env("VAD_FRAME_SECONDS", 0.03, float)
+VAD_THRESHOLD_DB = _env("VAD_THRESHOLD_DB", 12.0, float)
+VAD_MIN_SILENCE_SECONDS = _env("VAD_MIN_SILENCE_SECONDS", 1.0, float)
+VAD_MIN_SPEECH_SECONDS = _env("VAD_MIN_SPEECH_SECONDS", 0.3, float)
+VAD_PADDING_SECONDS = _env("VAD_PADDING_SECONDS", 0.3, float)
+
+# 실시간 녹음 변환 설정 (녹음 조각을 별도 포트의 수신 서버로 바이너리 전송)
+LIVE_ENABLED = _env("LIVE_ENABLED", 1, int)
+# 수신 서버 주소 (비어 있으면 Streamlit의 server.address, 그것도 없으면 127.0.0.1)
+# 다른 기기의 브라우저에서 녹음하려면 0.0.0.0 등으로 지정
+LIVE_HOST = _env("LIVE_HOST", "")
+LIVE_PORT = _env("LIVE_PORT", 8502, int)
+# 프록시 뒤에서 실행할 때 브라우저가 접속할 수신 서버 주소 (비어 있으면 같은 호스트의 LIVE_PORT)
+LIVE_PUBLIC_URL = _env("LIVE_PUBLIC_URL", "")
+# 수신 서버에 조각을 보낼 수 있는 앱 주소 (쉼표로 구분, 비어 있으면 수신 서버에 접속한 호스트의 Streamlit 포트만)
+LIVE_ALLOWED_ORIGINS = _env("LIVE_ALLOWED_ORIGINS", "")
+LIVE_CHUNK_MS = _env("LIVE_CHUNK_MS", 1000, int)
+LIVE_WINDOW_SECONDS = _env("LIVE_WINDOW_SECONDS", 20.0, float)
+LIVE_MAX_BYTES = _env("LIVE_MAX_MB", 512, int) * 1024 * 1024
+LIVE_SESSION_TTL_SECONDS = _env("LIVE_SESSION_TTL_SECONDS", 3600, int)
+
+# 브랜드명 사전 (CRM 내보내기 CSV 또는 한 줄에 하나씩 적은 텍스트 파일, 비어 있으면 패턴만 사용)
+BRAND_DICTIONARY_PATH = _env("BRAND_DICTIONARY_PATH", "")
+
+# 처리 시간 지표 설정 (JSONL 기록과 Prometheus 텍스트 파일, 경로를 비우면 해당 출력 끔)
+METRICS_LOG_PATH = _env("METRICS_LOG_PATH", os.path.join(CACHE_DIR, "metrics.jsonl"))
+METRICS_LOG_MAX_MB = _env("METRICS_LOG_MAX_MB", 64, int)
+METRICS_PROM_PATH = _env("METRICS_PROM_PATH", os.path.join(CACHE_DIR, "metrics.prom"))
+METRICS_EXPORT_SECONDS = _env("METRICS_EXPORT_SECONDS", 15.0, float)
@@ -0,0 +1,398 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from claude_client import parse_retry_after
+from metrics import get_metrics
+
+# 내보내기 상태
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# 요약 섹션 -> 세일즈포스 필드 (요약 프롬프트의 1~5번 섹션 순서)
+SECTION_FIELDS = [
+    ("overview", "Overview__c"),
+    ("background", "Background__c"),
+    ("marketing", "Marketing_Structure__c"),
+    ("discussion", "Discussion__c"),
+    ("next_steps", "Next_Steps__c"),
+]
+# 번호 없이 제목만 있는 경우를 위한 섹션 제목 키워드
+SECTION_KEYWORDS = {
+    "overview": ("미팅 개요",),
+    "background": ("브랜드 배경",),
+    "marketing": ("마케터", "마케팅 구조", "마케팅 현황", "마케팅 구성"),
+    "discussion": ("주요 논의", "논의 사항"),
+    "next_steps": ("결론", "액션 아이템"),
+}
+INTEREST_LEVELS = ("Hot", "Warm", "Cold")
+
+# 재시도 대상 상태 코드 (요청 전체 재시도)
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# 세일즈포스 sObject Collections 요청 한 번의 최대 레코드 수
+MAX_BATCH_SIZE = 200
+
+_HEADING_PATTERN = re.compile(r"^((?:#{1,6}\s*)?(?:\*\*)?)\s*([1-5])\s*[\.\)]\s*(.*)$")
+_INTEREST_PATTERN = re.compile(r"\b(hot|warm|cold)\b", re.IGNORECASE)
+
+
+class CRMError(Exception):
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# 요약 마크다운을 섹션별로 분리 {"overview": ..., ..., "interest_level": "Hot" | "Warm" | "Cold" | ""}
+# 섹션 제목은 1~5번이 차례대로 나오는 줄 (하위 목록의 번호와 구분하려고 다음 번호만 제목으로 인정,
+# 요약이 "## 1." / "**1." 형식의 제목을 쓰면 그 형식의 줄만 제목으로 인정)
+def parse_summary(summary):
+    sections = {name: [] for name, _ in SECTION_FIELDS}
+    names = [name for name, _ in SECTION_FIELDS]
+    lines = (summary or "").splitlines()
+    styled = any(match and match.group(1) for match in map(_HEADING_PATTERN.match, lines))
+    current = None
+    for line in lines:
+        position = names.index(current) + 1 if current else 0
+        match = _HEADING_PATTERN.match(line)
+        if match and (match.group(1) or not styled) and int(match.group(2)) == position + 1:
+            current = names[position]
+            title = match.group(3).strip(" *#")
+            # 제목 줄에 내용이 이어 붙은 경우 ("1. 미팅 개요: 2024-01-01 ...")
+            if ":" in title:
+                sections[current].append(title.split(":", 1)[1].strip())
+            continue
+        # 번호 없는 제목 ("## 주요 논의 사항")
+        keyword_section = next((name for name in names[position:] if _is_keyword_heading(line, name)), None)
+        if keyword_section:
+            current = keyword_section
+            continue
+        if current:
+            sections[current].append(line)
+
+    parsed = {name: "\n".join(lines).strip() for name, lines in sections.items()}
+    if not any(parsed.values()):
+        parsed["overview"] = (summary or "").strip()
+    parsed["interest_level"] = _interest_level(parsed["next_steps"]) or _interest_level(summary)
+    return parsed
+
+
+def _is_keyword_heading(line, section):
+    if not line.lstrip().startswith(("#", "**")):
+        return False
+    stripped = line.strip().strip("#* ")
+    return len(stripped) <= 30 and any(keyword in stripped for keyword in SECTION_KEYWORDS[section])
+
+
+# 관심 수준: "관심"이 들어간 줄을 먼저 보고, 프롬프트처럼 세 값을 모두 나열한 줄은 건너뜀
+def _interest_level(text):
+    lines = (text or "").splitlines()
+    for line in sorted(lines, key=lambda line: "관심" not in line):
+        levels = {level.capitalize() for level in _INTEREST_PATTERN.findall(line)}
+        if len(levels) == 1:
+            return levels.pop()
+    return ""
+
+
+# 저장된 미팅(검색 색인의 행)을 세일즈포스 레코드로 변환
+# 외부 ID(미팅 키)로 upsert하므로 같은 미팅을 여러 번 보내도 레코드는 하나
+def build_record(meeting):
+    parsed = parse_summary(meeting["summary"])
+    record = {
+        "attributes": {"type": config.CRM_OBJECT},
+        config.CRM_EXTERNAL_ID_FIELD: meeting["meeting_key"],
+        "Name": f"{meeting['brand_name'] or '브랜드 미상'} 미팅 ({meeting['meeting_date']})"[:80],
+        "Brand__c": meeting["brand_name"],
+        "Meeting_Date__c": meeting["meeting_date"] or None,
+        "Participants__c": meeting["our_participants"],
+        "Interest_Level__c": parsed["interest_level"] or None,
+    }
+    for name, field in SECTION_FIELDS:
+        record[field] = parsed[name]
+    return record
+
+
+# 초당 요청 수 제한 (토큰 버킷, 여러 스레드가 공유)
+class RateLimiter:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# 세일즈포스 REST 클라이언트 (keep-alive 연결 풀 공유, 요청 수 제한)
+# upsert는 sObject Collections로 최대 200건을 한 요청에 보내고 레코드별 결과를 반환
+class CRMClient:
+    def __init__(self, instance_url, access_token, api_version=None, pool_size=None, rate=None):
+        self.instance_url = instance_url.rstrip("/")
+        self.access_token = access_token
+        self.api_version = api_version or config.CRM_API_VERSION
+        self.timeout = (config.CRM_CONNECT_TIMEOUT, config.CRM_READ_TIMEOUT)
+        self.limiter = RateLimiter(config.CRM_REQUESTS_PER_SECOND if rate is None else rate)
+
+        pool_size = pool_size or config.CRM_WORKERS
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def upsert_url(self):
+        return (f"{self.instance_url}/services/data/{self.api_version}/composite/sobjects/"
+                f"{config.CRM_OBJECT}/{config.CRM_EXTERNAL_ID_FIELD}")
+
+    # [{"id", "success", "errors", "created"}] (요청한 레코드 순서), 요청 전체가 실패하면 CRMError
+    def upsert(self, records):
+        self.limiter.acquire()
+        with get_metrics().stage("crm_upsert", records=len(records)) as fields:
+            try:
+                response = self.session.patch(
+                    self.upsert_url(),
+                    headers={"Authorization": f"Bearer {self.access_token}", "Content-Type": "application/json"},
+                    data=json.dumps({"allOrNone": False, "records": records}, ensure_ascii=False).encode("utf-8"),
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                raise CRMError(f"CRM 연결 실패: {e}") from e
+            if response.status_code >= 400:
+                raise CRMError(f"CRM 오류: {response.status_code} {response.text[:200]}", response.status_code,
+                               parse_retry_after(response.headers.get("retry-after")))
+            results = response.json()
+            fields["failed_records"] = sum(1 for result in results if not result.get("success"))
+        return results
+
+
+# 내보내기 대기열 (SQLite, 재시작해도 보내지 못한 레코드 유지)
+# 미팅 키가 같은 레코드는 한 행으로 유지하고, 내용이 바뀌었을 때만 다시 보냄
+class ExportQueue:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crm_exports (
+                    idempotency_key TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    crm_id TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS crm_exports_due ON crm_exports (status, next_attempt_at)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # 대기열에 추가 (내용이 같은 레코드가 이미 대기 중이거나 보낸 상태면 건너뜀), 새로 대기 상태가 된 수 반환
+    def enqueue(self, records):
+        queued = 0
+        now = time.time()
+        with self._connect() as conn:
+            for record in records:
+                key = record[config.CRM_EXTERNAL_ID_FIELD]
+                body = json.dumps(record, ensure_ascii=False, sort_keys=True)
+                row = conn.execute("SELECT record, status FROM crm_exports WHERE idempotency_key = ?",
+                                   (key,)).fetchone()
+                if row and row["record"] == body and row["status"] != FAILED:
+                    continue
+                conn.execute(
+                    "INSERT OR REPLACE INTO crm_exports (idempotency_key, record, status, attempts, "
+                    "next_attempt_at, updated_at) VALUES (?, ?, ?, 0, 0, ?)",
+                    (key, body, PENDING, now),
+                )
+                queued += 1
+        return queued
+
+    # 지금 보낼 차례인 레코드 [(키, 레코드, 시도 횟수)]
+    def due(self, limit):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT idempotency_key, record, attempts FROM crm_exports "
+                "WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, time.time(), limit),
+            ).fetchall()
+        return [(row["idempotency_key"], json.loads(row["record"]), row["attempts"]) for row in rows]
+
+    def mark_sent(self, results):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE crm_exports SET status = ?, crm_id = ?, last_error = NULL, updated_at = ? "
+                "WHERE idempotency_key = ?",
+                [(SENT, crm_id, now, key) for key, crm_id in results],
+            )
+
+    # 실패한 레코드: 최대 시도 횟수 전까지는 백오프 후 다시 대기, 넘으면 실패로 기록
+    def mark_retry(self, failures, retry_after=None):
+        now = time.time()
+        updates = []
+        for key, attempts, error in failures:
+            attempts += 1
+            if attempts >= config.CRM_MAX_ATTEMPTS:
+                updates.append((FAILED, attempts, now, error, now, key))
+                continue
+            delay = retry_after if retry_after is not None else \
+                random.uniform(0, min(config.CRM_BACKOFF_MAX, config.CRM_BACKOFF_BASE * (2 ** attempts)))
+            updates.append((PENDING, attempts, now + delay, error, now, key))
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE crm_exports SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+                "updated_at = ? WHERE idempotency_key = ?",
+                updates,
+            )
+
+    def counts(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM crm_exports GROUP BY status").fetchall())
+
+    def errors(self, limit=20):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT idempotency_key, status, attempts, last_error FROM crm_exports "
+                "WHERE last_error IS NOT NULL ORDER BY updated_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+# 대기열의 레코드를 묶음 단위로 여러 연결에서 동시에 보냄
+class CRMExporter:
+    def __init__(self, queue, client, batch_size=None, workers=None):
+        self.queue = queue
+        self.client = client
+        self.batch_size = min(MAX_BATCH_SIZE, batch_size or config.CRM_BATCH_SIZE)
+        self.workers = workers or config.CRM_WORKERS
+        self._sync_lock = threading.Lock()
+
+    # 미팅 목록을 레코드로 바꿔 대기열에 추가, 새로 추가한 수 반환
+    def enqueue_meetings(self, meetings):
+        return self.queue.enqueue(build_record(meeting) for meeting in meetings if meeting["summary"])
+
+    def _send(self, batch):
+        records = [record for _, record, _ in batch]
+        try:
+            results = self.client.upsert(records)
+        except CRMError as e:
+            # 인증/권한 오류는 다시 보내도 같은 결과이므로 이번 동기화를 중단
+            if e.status_code in (401, 403):
+                raise
+            retry_after = e.retry_after if e.status_code in RETRY_STATUS_CODES else None
+            self.queue.mark_retry([(key, attempts, str(e)) for key, _, attempts in batch], retry_after)
+            return 0, len(batch)
+        sent, failures = [], []
+        for (key, _, attempts), result in zip(batch, results):
+            if result.get("success"):
+                sent.append((key, result.get("id")))
+            else:
+                errors = "; ".join(f"{error.get('statusCode', '')}: {error.get('message', '')}"
+                                   for error in result.get("errors", []))
+                failures.append((key, attempts, errors or "알 수 없는 오류"))
+        if sent:
+            self.queue.mark_sent(sent)
+        if failures:
+            self.queue.mark_retry(failures)
+        return len(sent), len(failures)
+
+    # 지금 보낼 수 있는 레코드를 모두 보냄 (재시도 대기 중인 레코드는 다음 동기화에서)
+    def sync(self):
+        report = {"sent": 0, "retry": 0, "batches": 0}
+        started = time.perf_counter()
+        with self._sync_lock, ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                due = self.queue.due(self.batch_size * self.workers)
+                if not due:
+                    break
+                batches = [due[start:start + self.batch_size] for start in range(0, len(due), self.batch_size)]
+                for sent, failed in pool.map(self._send, batches):
+                    report["sent"] += sent
+                    report["retry"] += failed
+                report["batches"] += len(batches)
+        report["seconds"] = time.perf_counter() - started
+        return report
+
+
+# 설정된 주기로 대기열을 비우는 스레드 (요약이 끝날 때마다 쌓인 레코드를 백그라운드로 전송)
+class CRMSyncThread:
+    def __init__(self, exporter, interval):
+        self.exporter = exporter
+        self.interval = interval
+        self._thread = threading.Thread(target=self._loop, name="crm-sync", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.exporter.sync()
+            except Exception:
+                pass
+
+
+def is_configured():
+    return bool(config.CRM_INSTANCE_URL and config.CRM_ACCESS_TOKEN)
+
+
+def create_exporter():
+    client = CRMClient(config.CRM_INSTANCE_URL, config.CRM_ACCESS_TOKEN)
+    return CRMExporter(ExportQueue(config.CRM_QUEUE_PATH), client)
+
+
+# 명령행: 기간 내 저장된 미팅을 대기열에 넣고 전송
+#   python crm_export.py --since 2024-01-01 --until 2024-01-07
+def main(argv=None):
+    from meeting_index import MeetingIndex
+
+    parser = argparse.ArgumentParser(description="저장된 미팅 요약을 세일즈포스로 내보내기")
+    parser.add_argument("--since", default="", help="YYYY-MM-DD (미팅 날짜 기준)")
+    parser.add_argument("--until", default="", help="YYYY-MM-DD")
+    parser.add_argument("--retry-only", action="store_true", help="새 미팅은 추가하지 않고 대기열만 전송")
+    args = parser.parse_args(argv)
+
+    if not is_configured():
+        parser.error("NOTETAKER_CRM_INSTANCE_URL과 NOTETAKER_CRM_ACCESS_TOKEN이 필요합니다.")
+    exporter = create_exporter()
+    if not args.retry_only:
+        meetings = MeetingIndex(config.MEETING_INDEX_PATH).iter_meetings(args.since, args.until)
+        print(f"대기열 추가: {exporter.enqueue_meetings(meetings)}건")
+    report = exporter.sync()
+    print(f"전송 {report['sent']}건, 재시도 대기 {report['retry']}건, 요청 {report['batches']}회, "
+          f"{report['seconds']:.1f}초")
+    print(f"대기열 상태: {exporter.queue.counts()}")
+    return 0 if not exporter.queue.counts().get(FAILED) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
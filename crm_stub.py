@@ -0,0 +1,106 @@
+import json
+import time
+import uuid
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 로컬 개발/테스트용 세일즈포스 REST API 스텁 서버 (sObject Collections upsert만 구현)
+# NOTETAKER_CRM_INSTANCE_URL=http://127.0.0.1:<port> NOTETAKER_CRM_ACCESS_TOKEN=stub 으로 지정해서 사용
+
+MAX_RECORDS = 200
+
+
+class CRMStubHandler(BaseHTTPRequestHandler):
+    # PATCH /services/data/<버전>/composite/sobjects/<오브젝트>/<외부 ID 필드>
+    def do_PATCH(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 7 or parts[:2] != ["services", "data"] or parts[3:5] != ["composite", "sobjects"]:
+            self._send_json(404, [{"errorCode": "NOT_FOUND", "message": "stub"}])
+            return
+        object_name, id_field = parts[5], parts[6]
+        if self.headers.get("Authorization") != f"Bearer {self.server.token}":
+            self._send_json(401, [{"errorCode": "INVALID_SESSION_ID", "message": "Session expired or invalid"}])
+            return
+
+        records = body.get("records", [])
+        self.server.requests.append({"object": object_name, "records": len(records)})
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        # 실패 응답 주입 (재시도 확인용): fail_statuses에서 하나씩 꺼내 사용
+        with self.server.lock:
+            status = self.server.fail_statuses.pop(0) if self.server.fail_statuses else None
+        if status:
+            self._send_json(status, [{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": "stub"}],
+                            {"Retry-After": "0"})
+            return
+        if len(records) > MAX_RECORDS:
+            self._send_json(400, [{"errorCode": "EXCEEDED_ID_LIMIT",
+                                   "message": f"record limit is {MAX_RECORDS}"}])
+            return
+
+        results = []
+        with self.server.lock:
+            for record in records:
+                key = record.get(id_field)
+                # 레코드 단위 실패 주입: fail_keys에 있는 키는 한 번 실패
+                if not key or key in self.server.fail_keys:
+                    self.server.fail_keys.discard(key)
+                    results.append({"id": None, "success": False, "errors": [
+                        {"statusCode": "FIELD_INTEGRITY_EXCEPTION", "message": "stub", "fields": [id_field]}]})
+                    continue
+                stored = self.server.records.setdefault(object_name, {})
+                created = key not in stored
+                record_id = stored[key]["Id"] if not created else "a0" + uuid.uuid4().hex[:16]
+                stored[key] = dict(record, Id=record_id)
+                results.append({"id": record_id, "success": True, "errors": [], "created": created})
+        self._send_json(200, results)
+
+    def _send_json(self, status, data, headers=None):
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# 백그라운드 스레드에서 스텁 서버 시작, (서버, 인스턴스 URL) 반환
+# 저장된 레코드는 server.records[오브젝트][외부 ID]
+def start_stub_server(port=0, delay=0.0, token="stub"):
+    server = ThreadingHTTPServer(("127.0.0.1", port), CRMStubHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.token = token
+    server.lock = threading.Lock()
+    server.fail_statuses = []
+    server.fail_keys = set()
+    server.records = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="세일즈포스 REST API 스텁 서버")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--token", default="stub", help="허용할 액세스 토큰")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.delay, args.token)
+    print(f"스텁 서버 실행 중: {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,427 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 진행 중 요약 텍스트를 DB에 반영하는 최소 간격 (초, 화면은 SUMMARY_STREAM_POLL_SECONDS마다 읽음)
+PARTIAL_UPDATE_INTERVAL = 0.1
+
+
+# 작업 기록 저장소 (SQLite, 여러 프로세스에서 동시에 접근)
+class JobStore:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    progress REAL DEFAULT 0,
+                    partial TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS workers (
+                    pid INTEGER PRIMARY KEY,
+                    stats TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, kind, session_id, payload):
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, session_id, status, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, session_id, QUEUED, json.dumps(payload, ensure_ascii=False), time.time()),
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    # 진행 중 요약 확인용 (상태, 받은 부분)만 읽음, 작업이 없으면 (None, None)
+    def partial(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, partial FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return (row["status"], row["partial"]) if row else (None, None)
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    # 대기열 순번 (1부터, 대기 중이 아니면 0)
+    def queue_position(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at <= "
+                "(SELECT created_at FROM jobs WHERE id = ? AND status = ?)",
+                (QUEUED, job_id, QUEUED),
+            ).fetchone()
+        return row[0]
+
+    # 다음에 실행할 작업: 실행 중인 작업이 적은 세션 우선, 같으면 먼저 들어온 작업
+    def next_queued(self):
+        with self._connect() as conn:
+            running = dict(conn.execute(
+                "SELECT session_id, COUNT(*) FROM jobs WHERE status = ? GROUP BY session_id", (RUNNING,)
+            ).fetchall())
+            queued = conn.execute(
+                "SELECT id, kind, session_id, payload, created_at FROM jobs WHERE status = ? ORDER BY created_at",
+                (QUEUED,),
+            ).fetchall()
+        if not queued:
+            return None
+        row = min(queued, key=lambda job: (running.get(job["session_id"], 0), job["created_at"]))
+        return dict(row, payload=json.loads(row["payload"]))
+
+    # 서버 재시작으로 중단된 실행 중 작업을 다시 대기열로
+    def requeue_running(self):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING))
+
+    # 워커 프로세스별 모델 레지스트리 상태
+    def put_worker_stats(self, pid, stats):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (pid, stats, updated_at) VALUES (?, ?, ?)",
+                (pid, json.dumps(stats), time.time()),
+            )
+
+    def worker_stats(self, pids):
+        if not pids:
+            return {}
+        placeholders = ", ".join("?" for _ in pids)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT pid, stats FROM workers WHERE pid IN ({placeholders})", list(pids)).fetchall()
+        return {row["pid"]: json.loads(row["stats"]) for row in rows}
+
+    def counts(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+# Whisper 모델 빌려 오기 (워커는 Streamlit 앱을 import하지 않고 레지스트리를 직접 사용, 끝나면 _release_model 호출)
+def _checkout_model(model_size):
+    from model_registry import get_registry
+    try:
+        return get_registry().checkout(model_size)
+    except Exception as e:
+        raise RuntimeError(f"Whisper 모델을 로드할 수 없습니다: {model_size} ({e})") from e
+
+
+def _release_model(model_size):
+    from model_registry import get_registry
+    get_registry().release(model_size)
+
+
+# 워커 프로세스의 모델 레지스트리 상태와 처리 시간 지표 기록 (디버깅 정보/지표 내보내기용)
+def _report_worker(store):
+    from metrics import get_metrics
+    from model_registry import get_registry
+    store.put_worker_stats(os.getpid(), dict(get_registry().stats(), metrics=get_metrics().snapshot()))
+
+
+# 워커 시작 직후 기본 모델을 미리 로드 (모델 미리 로드를 끈 경우에도 설정에 따라 whisper import만 미리 시작)
+def _warm_up(db_path, model_size):
+    import config
+    if model_size:
+        _checkout_model(model_size)
+        _release_model(model_size)
+    elif config.WHISPER_IMPORT_WARMUP:
+        from transcription import start_whisper_warmup
+        start_whisper_warmup()
+    _report_worker(JobStore(db_path))
+
+
+# 워커 프로세스에서 작업 실행 (secrets는 DB에 저장하지 않고 메모리로만 전달)
+def _run_job(db_path, job_id, kind, payload, secrets):
+    store = JobStore(db_path)
+    try:
+        if kind == "transcribe":
+            return _run_transcription(store, job_id, payload)
+        if kind == "refine":
+            return _run_refinement(store, job_id, payload)
+        if kind == "transcribe_batch":
+            return _run_batch_transcription(store, job_id, payload)
+        if kind == "transcribe_window":
+            return _run_window_transcription(payload)
+        if kind == "summarize":
+            return _run_summary(store, job_id, payload, secrets)
+        raise ValueError(f"알 수 없는 작업 종류: {kind}")
+    finally:
+        _report_worker(store)
+
+
+def _run_transcription(store, job_id, payload):
+    import config
+    from transcription import transcribe_audio, transcribe_parallel
+
+    model_size = payload["model_size"]
+    language = payload.get("language", "ko")
+    if payload.get("parallel"):
+        return transcribe_parallel(
+            payload["audio_file"], model_size, language=language,
+            progress_callback=lambda done, total: store.update(job_id, progress=done / total),
+            vad=payload.get("vad", False), slots=config.JOB_WORKERS,
+        )
+
+    model = _checkout_model(model_size)
+    try:
+        return transcribe_audio(model, payload["audio_file"], language=language, vad=payload.get("vad", False),
+                                model_size=model_size)
+    finally:
+        _release_model(model_size)
+
+
+# 단계별 변환의 두 번째 단계: 초안에서 신뢰도가 낮은 구간만 큰 모델로 다시 변환
+def _run_refinement(store, job_id, payload):
+    from transcription import refine_segments, splice_segments
+
+    model_size = payload["model_size"]
+    model = _checkout_model(model_size)
+    try:
+        replacements, report = refine_segments(
+            model, payload["audio_file"], payload["segments"], language=payload.get("language", "ko"),
+            model_size=model_size, progress_callback=lambda done, total: store.update(job_id, progress=done / total),
+        )
+    finally:
+        _release_model(model_size)
+    # 초안을 고치지 않은 경우의 최종 결과 (캐시 저장용)
+    segments = splice_segments(payload["segments"], replacements)
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "replacements": replacements,
+        "cascade": report,
+    }
+
+
+# 여러 파일 묶음 변환 (파일들의 30초 창을 묶어 한 모델로 변환, 결과는 payload["files"] 순서)
+def _run_batch_transcription(store, job_id, payload):
+    from transcription import transcribe_batch
+
+    model_size = payload["model_size"]
+    model = _checkout_model(model_size)
+    try:
+        results, report = transcribe_batch(
+            model, [item["audio_file"] for item in payload["files"]], language=payload.get("language", "ko"),
+            vad=payload.get("vad", False), model_size=model_size,
+            progress_callback=lambda done, total: store.update(job_id, progress=done / total),
+        )
+    finally:
+        _release_model(model_size)
+    return {"results": results, "batch": report}
+
+
+# 실시간 녹음의 한 창(16kHz PCM .npy) 변환, 세그먼트 시각은 녹음 시작 기준으로 이동
+def _run_window_transcription(payload):
+    import numpy as np
+
+    from transcription import _shift_segment, transcribe_audio
+
+    model_size = payload["model_size"]
+    model = _checkout_model(model_size)
+    try:
+        audio = np.load(payload["pcm_path"])
+        result = transcribe_audio(model, audio, language=payload.get("language", "ko"), vad=payload.get("vad", False),
+                                  model_size=model_size)
+    finally:
+        _release_model(model_size)
+        if os.path.exists(payload["pcm_path"]):
+            os.remove(payload["pcm_path"])
+    offset = payload["offset"]
+    segments = [_shift_segment(segment, offset) for segment in result["segments"]]
+    return {"text": result["text"], "segments": segments, "language": result["language"]}
+
+
+def _run_summary(store, job_id, payload, secrets):
+    from meeting_summary import summarize_with_claude
+
+    api_key = secrets.get("api_key")
+    if not api_key:
+        raise RuntimeError("Claude API 키가 없습니다. 서버가 재시작되었다면 요약을 다시 요청해주세요.")
+
+    last_update = [0.0]
+
+    def on_text(text):
+        now = time.time()
+        if now - last_update[0] >= PARTIAL_UPDATE_INTERVAL:
+            store.update(job_id, partial=text)
+            last_update[0] = now
+
+    compaction = {}
+    summary = summarize_with_claude(payload["transcript"], api_key, payload["meeting_info"], on_text=on_text,
+                                        segments=payload.get("segments"), previous=payload.get("previous"),
+                                        report=compaction)
+    return {"summary": summary, "compaction": compaction}
+
+
+# 변환/요약 작업을 워커 프로세스에서 실행하는 대기열
+# - 동시 실행 수는 max_workers로 제한
+# - 작업 상태와 결과는 SQLite에 기록되어 페이지를 새로고침해도 job id로 조회 가능
+# - preload_model_size가 있으면 시작하자마자 워커를 띄워 해당 모델을 백그라운드로 로드
+# - 워커가 비정상 종료되면(메모리 부족 등) 그 풀에서 실행 중이던 작업은 실패로 기록하고 새 풀로 교체
+class JobQueue:
+    def __init__(self, db_path, max_workers, poll_interval=1.0, preload_model_size=None):
+        self.store = JobStore(db_path)
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._secrets = {}
+        self._running = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.preload_model_size = preload_model_size
+        self.pool_restarts = 0
+        self._pool = self._create_pool()
+        self.store.requeue_running()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def _create_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        for _ in range(self.max_workers):
+            pool.submit(_warm_up, self.store.db_path, self.preload_model_size)
+        return pool
+
+    # 깨진 풀을 새 풀로 교체 (같은 풀에서 실패한 작업 여러 개가 동시에 불러도 한 번만)
+    def _replace_pool(self, broken):
+        with self._lock:
+            if self._pool is not broken or self._closed:
+                return
+            self._pool = self._create_pool()
+            self.pool_restarts += 1
+        broken.shutdown(wait=False)
+
+    def submit(self, kind, session_id, payload, secrets=None):
+        job_id = self.store.add(kind, session_id, payload)
+        if secrets:
+            self._secrets[job_id] = secrets
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def partial(self, job_id):
+        return self.store.partial(job_id)
+
+    def queue_position(self, job_id):
+        return self.store.queue_position(job_id)
+
+    def _dispatch_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            while True:
+                with self._lock:
+                    if self._running >= self.max_workers:
+                        break
+                job = self.store.next_queued()
+                if job is None:
+                    break
+                self._start(job)
+
+    def _start(self, job):
+        job_id = job["id"]
+        self.store.update(job_id, status=RUNNING, started_at=time.time())
+        with self._lock:
+            self._running += 1
+        secrets = self._secrets.pop(job_id, {})
+        pool = self._pool
+        try:
+            future = pool.submit(_run_job, self.store.db_path, job_id, job["kind"], job["payload"], secrets)
+        except BrokenProcessPool:
+            # 이전 작업 중 워커가 죽어 풀이 깨졌으면 새 풀에서 한 번 더 시도
+            self._replace_pool(pool)
+            pool = self._pool
+            try:
+                future = pool.submit(_run_job, self.store.db_path, job_id, job["kind"], job["payload"], secrets)
+            except Exception as e:
+                self._fail_start(job_id, e)
+                return
+        except Exception as e:
+            self._fail_start(job_id, e)
+            return
+        future.add_done_callback(lambda f: self._finish(job_id, pool, f))
+
+    # 워커에 넘기지 못한 작업은 실패로 기록하고 실행 수 되돌림
+    def _fail_start(self, job_id, error):
+        self.store.update(job_id, status=FAILED, error=f"작업을 시작할 수 없습니다: {error}", finished_at=time.time())
+        with self._lock:
+            self._running -= 1
+
+    def _finish(self, job_id, pool, future):
+        try:
+            result = future.result()
+            self.store.update(job_id, status=DONE, result=result, progress=1.0, finished_at=time.time())
+        except BrokenProcessPool:
+            self.store.update(job_id, status=FAILED, finished_at=time.time(),
+                              error="작업 프로세스가 비정상 종료되었습니다 (메모리 부족 등). 다시 시도해주세요.")
+            self._replace_pool(pool)
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._wakeup.set()
+
+    # 디스패처와 워커 종료 (실행 중인 작업은 끝날 때까지 기다림)
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+
+    def stats(self):
+        with self._lock:
+            running = self._running
+        pids = list(getattr(self._pool, "_processes", None) or {})
+        return {
+            "max_workers": self.max_workers,
+            "running": running,
+            "pool_restarts": self.pool_restarts,
+            "counts": self.store.counts(),
+            "workers": self.store.worker_stats(pids),
+        }
@@ -0,0 +1,385 @@
+import os
+import json
+import time
+import shutil
+import threading
+import subprocess
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import config
+
+SAMPLE_RATE = 16000
+# ffmpeg 출력 읽기 단위 (바이트)
+PCM_READ_SIZE = 64 * 1024
+# 창을 자를 무음 지점을 찾는 범위 (창 끝에서 거슬러 올라가는 초)
+CUT_SEARCH_SECONDS = 5.0
+CUT_FRAME_SECONDS = 0.03
+
+# 녹음 상태
+RECORDING = "recording"
+FINISHING = "finishing"
+FINISHED = "finished"
+
+
+# ffmpeg 디코더가 종료되어 조각을 더 받을 수 없음
+class LiveDecoderError(Exception):
+    pass
+
+
+# 창 끝 부근에서 에너지가 가장 낮은 지점(샘플 위치) 찾기
+def find_cut(audio, search_seconds=CUT_SEARCH_SECONDS):
+    frame = int(CUT_FRAME_SECONDS * SAMPLE_RATE)
+    search = min(len(audio), int(search_seconds * SAMPLE_RATE))
+    tail = audio[len(audio) - search:]
+    count = len(tail) // frame
+    if count == 0:
+        return len(audio)
+    frames = tail[:count * frame].reshape(count, frame)
+    energy = np.mean(frames * frames, axis=1)
+    return len(audio) - search + int(np.argmin(energy)) * frame + frame // 2
+
+
+# 녹음 하나의 실시간 변환 상태
+# - 브라우저가 보낸 MediaRecorder 조각(webm)을 원본 파일과 ffmpeg stdin에 순서대로 기록
+# - ffmpeg가 내보내는 16kHz PCM을 모아 창 길이를 넘으면 무음 지점에서 잘라 변환 작업으로 제출
+# - submit_window(audio, offset, settings) -> job id, fetch_job(job id) -> 작업 기록
+class LiveSession:
+    def __init__(self, token, spool_dir, submit_window, settings, window_seconds=None):
+        self.token = token
+        self.spool_dir = spool_dir
+        self.submit_window = submit_window
+        self.settings = dict(settings)
+        self.window_samples = int((window_seconds or config.LIVE_WINDOW_SECONDS) * SAMPLE_RATE)
+
+        self.status = RECORDING
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.next_seq = 0
+        self.bytes_received = 0
+        self.raw_path = os.path.join(spool_dir, f"live-{token}-{int(self.started_at)}.webm")
+        self._raw = open(self.raw_path, "wb")
+
+        self._lock = threading.Lock()
+        self._pending = []  # 아직 창으로 제출하지 않은 PCM 조각
+        self._pending_samples = 0
+        self._offset_samples = 0  # 제출한 창들의 누적 길이
+        self.window_jobs = []  # [(창 번호, job id)]
+        self.window_segments = {}  # 창 번호 -> 세그먼트 목록
+        self.errors = []
+
+        self._decoder = self._start_decoder()
+        self._reader = threading.Thread(target=self._read_pcm, name=f"live-pcm-{token}", daemon=True)
+        self._reader.start()
+
+    def _start_decoder(self):
+        return subprocess.Popen(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+             "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+
+    # 브라우저에서 받은 조각 기록 (seq는 0부터 순서대로)
+    def feed(self, seq, data):
+        with self._lock:
+            if self.status != RECORDING:
+                raise ValueError("녹음이 이미 종료되었습니다.")
+            if seq < self.next_seq:
+                return False  # 재전송된 조각
+            if seq > self.next_seq:
+                raise ValueError(f"조각 순서가 맞지 않습니다: {seq} (기대값 {self.next_seq})")
+            if self.bytes_received + len(data) > config.LIVE_MAX_BYTES:
+                raise ValueError("녹음 크기 한도를 넘었습니다.")
+            try:
+                self._decoder.stdin.write(data)
+                self._decoder.stdin.flush()
+            except OSError as e:
+                self.errors.append(f"실시간 디코딩 중단: {e}")
+            else:
+                # 원본에는 디코더가 받은 조각만 기록 (실패한 조각을 다시 보내도 중복되지 않도록)
+                self._raw.write(data)
+                self.next_seq += 1
+                self.bytes_received += len(data)
+                self.updated_at = time.time()
+                return True
+        # 디코더가 종료되면 지금까지 받은 오디오로 녹음을 마무리
+        self.finish()
+        raise LiveDecoderError("오디오 디코더가 종료되었습니다. 녹음이 끝나면 녹음 파일을 업로드해주세요.")
+
+    def _read_pcm(self):
+        leftover = b""
+        while True:
+            data = self._decoder.stdout.read1(PCM_READ_SIZE)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % 2
+            leftover = data[usable:]
+            samples = np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+            self.add_pcm(samples)
+
+    # 디코딩된 PCM 추가, 창 길이가 차면 제출
+    def add_pcm(self, samples):
+        with self._lock:
+            self._pending.append(samples)
+            self._pending_samples += len(samples)
+            if self._pending_samples < self.window_samples:
+                return
+            audio = np.concatenate(self._pending)
+            cut = find_cut(audio)
+            self._pending = [audio[cut:]]
+            self._pending_samples = len(audio) - cut
+            self._submit(audio[:cut])
+
+    # 잠금을 잡은 상태에서 호출
+    def _submit(self, audio):
+        if len(audio) == 0:
+            return
+        index = len(self.window_jobs)
+        offset = self._offset_samples / SAMPLE_RATE
+        self._offset_samples += len(audio)
+        try:
+            job_id = self.submit_window(audio, offset, self.settings)
+            self.window_jobs.append((index, job_id))
+        except Exception as e:
+            self.errors.append(str(e))
+
+    # 녹음 종료: 디코더를 닫고 남은 오디오를 마지막 창으로 제출
+    def finish(self):
+        with self._lock:
+            if self.status != RECORDING:
+                return
+            self.status = FINISHING
+            self._raw.close()
+            try:
+                self._decoder.stdin.close()
+            except OSError:
+                pass  # 이미 종료된 디코더
+        self._reader.join(timeout=30)
+        self._decoder.wait(timeout=30)
+        with self._lock:
+            if self._pending:
+                self._submit(np.concatenate(self._pending))
+            self._pending, self._pending_samples = [], 0
+            self.updated_at = time.time()
+
+    # 끝난 창 작업의 결과 반영
+    def refresh(self, fetch_job):
+        with self._lock:
+            jobs = [(index, job_id) for index, job_id in self.window_jobs if index not in self.window_segments]
+        for index, job_id in jobs:
+            job = fetch_job(job_id)
+            if job is None or job["status"] == "failed":
+                with self._lock:
+                    self.window_segments[index] = []
+                    self.errors.append(job["error"] if job else f"작업을 찾을 수 없습니다: {job_id}")
+            elif job["status"] == "done":
+                with self._lock:
+                    self.window_segments[index] = job["result"]["segments"]
+        with self._lock:
+            if self.status == FINISHING and len(self.window_segments) == len(self.window_jobs):
+                self.status = FINISHED
+
+    def segments(self):
+        with self._lock:
+            return [segment for index in sorted(self.window_segments) for segment in self.window_segments[index]]
+
+    def transcript(self):
+        return "".join(segment["text"] for segment in self.segments())
+
+    def progress(self):
+        with self._lock:
+            return {
+                "status": self.status,
+                "seconds": (self._offset_samples + self._pending_samples) / SAMPLE_RATE,
+                "windows": len(self.window_jobs),
+                "windows_done": len(self.window_segments),
+                "bytes": self.bytes_received,
+            }
+
+    def close(self):
+        with self._lock:
+            if not self._raw.closed:
+                self._raw.close()
+            if self._decoder.poll() is None:
+                self._decoder.kill()
+        if os.path.exists(self.raw_path):
+            os.remove(self.raw_path)
+
+
+class LiveIngestHandler(BaseHTTPRequestHandler):
+    # 요청한 페이지의 Origin이 Streamlit 앱이면 그 값, 아니면 None
+    def _allowed_origin(self):
+        origin = self.headers.get("Origin")
+        if origin and self.server.ingest.origin_allowed(origin, self.headers.get("Host", "")):
+            return origin
+        return None
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self._cors_headers()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _cors_headers(self):
+        # Streamlit 컴포넌트 iframe에서 다른 포트로 보내므로 앱의 Origin만 허용
+        origin = self._allowed_origin()
+        self.send_header("Vary", "Origin")
+        if origin:
+            self.send_header("Access-Control-Allow-Origin", origin)
+            self.send_header("Access-Control-Allow-Methods", "POST, GET, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.end_headers()
+
+    # /live/<token>/<action>
+    def _route(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "live":
+            return None, None, {}
+        return parts[1], parts[2], parse_qs(url.query)
+
+    # 진행 상황과 지금까지의 변환 결과 (녹음 화면에서 주기적으로 조회)
+    def do_GET(self):
+        token, action, _ = self._route()
+        ingest = self.server.ingest
+        session = ingest.get(token) if token else None
+        if action != "status" or session is None:
+            self._send_json(404, {"error": "not found"})
+            return
+        session.refresh(ingest.fetch_job)
+        self._send_json(200, dict(session.progress(), transcript=session.transcript()))
+
+    def do_POST(self):
+        token, action, query = self._route()
+        ingest = self.server.ingest
+        # 다른 사이트의 페이지가 보내는 요청은 거부
+        if self.headers.get("Origin") and not self._allowed_origin():
+            self._send_json(403, {"error": "origin not allowed"})
+            return
+        if token is None or not ingest.is_registered(token):
+            self._send_json(404, {"error": "unknown session"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        data = self.rfile.read(length) if length else b""
+        try:
+            if action == "start":
+                session = ingest.start(token)
+            elif action == "chunk":
+                session = ingest.get(token)
+                if session is None:
+                    raise ValueError("녹음이 시작되지 않았습니다.")
+                session.feed(int(query.get("seq", ["0"])[0]), data)
+            elif action == "finish":
+                session = ingest.get(token)
+                if session is None:
+                    raise ValueError("녹음이 시작되지 않았습니다.")
+                session.finish()
+            else:
+                self._send_json(404, {"error": "unknown action"})
+                return
+        except ValueError as e:
+            self._send_json(409, {"error": str(e)})
+            return
+        except LiveDecoderError as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, session.progress())
+
+    def log_message(self, format, *args):
+        pass
+
+
+# 녹음 조각을 바이너리로 받는 HTTP 서버 (Streamlit 프로세스 안에서 별도 포트로 실행)
+# allowed_origins가 있으면 그 Origin만, 없으면 수신 서버에 접속한 호스트의 app_port(Streamlit 포트) 페이지만 허용
+class LiveIngestServer:
+    def __init__(self, host, port, spool_dir, submit_window, fetch_job, session_ttl=None, allowed_origins=(),
+                 app_port=None):
+        self.spool_dir = spool_dir
+        self.allowed_origins = {origin.rstrip("/") for origin in allowed_origins if origin}
+        self.app_port = app_port
+        self.submit_window = submit_window
+        self.fetch_job = fetch_job
+        self.session_ttl = session_ttl or config.LIVE_SESSION_TTL_SECONDS
+        self._settings = {}  # token -> (변환 설정, 마지막 등록 시각)
+        self._sessions = {}
+        self._lock = threading.Lock()
+        os.makedirs(spool_dir, exist_ok=True)
+
+        self.httpd = ThreadingHTTPServer((host, port), LiveIngestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.ingest = self
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="live-ingest", daemon=True)
+        self._thread.start()
+
+    # 녹음 화면은 수신 서버와 같은 호스트의 Streamlit 포트에서 열림 (브라우저가 접속한 호스트 이름으로 수신 서버 주소를 만듦)
+    def origin_allowed(self, origin, host):
+        origin = origin.rstrip("/")
+        if self.allowed_origins:
+            return origin in self.allowed_origins
+        parsed = urlparse(origin)
+        try:
+            origin_port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        except ValueError:
+            return False
+        return parsed.hostname is not None and parsed.hostname == urlparse(f"//{host}").hostname and \
+            (self.app_port is None or origin_port == self.app_port)
+
+    @staticmethod
+    def available():
+        return shutil.which("ffmpeg") is not None
+
+    # Streamlit 세션이 녹음 화면을 그릴 때 등록 (변환 설정 갱신, 다음 녹음부터 적용)
+    def register(self, token, settings):
+        with self._lock:
+            self._settings[token] = (dict(settings), time.time())
+        self.sweep()
+
+    def is_registered(self, token):
+        with self._lock:
+            return token in self._settings
+
+    def start(self, token):
+        with self._lock:
+            settings = self._settings[token][0]
+            previous = self._sessions.pop(token, None)
+        if previous is not None:
+            previous.close()
+        session = LiveSession(token, self.spool_dir, self.submit_window, settings)
+        with self._lock:
+            self._sessions[token] = session
+        return session
+
+    def get(self, token):
+        with self._lock:
+            return self._sessions.get(token)
+
+    # 세션이 결과를 가져간 뒤 정리
+    def discard(self, token):
+        with self._lock:
+            session = self._sessions.pop(token, None)
+        if session is not None:
+            session.close()
+
+    # 오래 사용하지 않은 세션 정리
+    def sweep(self):
+        now = time.time()
+        with self._lock:
+            expired = [token for token, session in self._sessions.items()
+                       if now - session.updated_at > self.session_ttl]
+            sessions = [self._sessions.pop(token) for token in expired]
+            for token in [token for token, (_, registered_at) in self._settings.items()
+                          if token not in self._sessions and now - registered_at > self.session_ttl]:
+                del self._settings[token]
+        for session in sessions:
+            session.close()
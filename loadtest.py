@@ -0,0 +1,581 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import socket
+import sqlite3
+import argparse
+import asyncio
+import tempfile
+import threading
+import subprocess
+
+import numpy as np
+import requests
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import FileURLs, UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+import claude_stub
+from benchmark import make_transcript, synth_speech, write_wav
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+# 작업 워커가 openai-whisper/torch 대신 불러올 대역 모듈
+STUBS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest_stubs")
+WIDGET_ID_PREFIX = "$$WIDGET_ID"
+FLOWS = ("text", "upload")
+PERCENTILES = (50, 90, 95, 99)
+SCRIPT_FINISHED = ForwardMsg.FINISHED_SUCCESSFULLY
+# 실행 결과에 이 문구가 있으면 요약이 끝난 것으로 봄 (claude_stub.default_responder 응답)
+SUMMARY_MARKER = "스텁 응답"
+
+# 멀티 세션 부하 테스트
+# - 앱을 실제 Streamlit 서버로 띄우고, 브라우저 대신 웹소켓으로 붙는 헤드리스 세션 N개를 동시에 실행
+# - 세션마다 텍스트 직접 입력 -> 요약, 파일 업로드 -> 텍스트 변환 -> 요약 흐름을 반복
+# - Claude는 로컬 스텁 서버, Whisper는 loadtest_stubs의 대역(녹음 길이에 비례해 CPU 사용)
+# - 세션 수 단계마다 서버를 새로 띄워 세션당 메모리, 재실행 지연 백분위수, 처리량을 재고 포화점을 찾음
+#
+# 사용 예:
+#   python loadtest.py --sessions 1 2 4 8 16
+#   python loadtest.py --sessions 4 --flows text --iterations 3 --output loadtest.json
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _child_pids(pid):
+    children = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # 실행 파일 이름에 공백이 있을 수 있어 마지막 ')' 뒤에서 부모 pid를 읽음
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(name))
+    return children
+
+
+# 자식의 자식까지 (작업 워커가 띄운 병렬 변환 워커 포함)
+def _descendant_pids(pid):
+    pids = []
+    pending = _child_pids(pid)
+    while pending:
+        child = pending.pop()
+        pids.append(child)
+        pending.extend(_child_pids(child))
+    return pids
+
+
+# (Streamlit 서버 RSS, 작업 워커 RSS 합계) MB, Linux의 /proc 기준
+def process_rss_mb(pid):
+    workers = sum(_rss_mb(child) for child in _descendant_pids(pid))
+    return _rss_mb(pid), workers
+
+
+# 부하를 거는 동안 서버/워커 RSS 최대값 기록
+class MemorySampler:
+    def __init__(self, pid, interval=0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak_server_mb = 0.0
+        self.peak_total_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadtest-memory", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            server, workers = process_rss_mb(self.pid)
+            self.peak_server_mb = max(self.peak_server_mb, server)
+            self.peak_total_mb = max(self.peak_total_mb, server + workers)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+
+# 단계마다 새 캐시/작업 DB로 Streamlit 서버 실행 (XSRF 보호는 헤드리스 업로드를 위해 끔)
+# 서버 로그는 파이프 대신 work_dir/streamlit.log에 기록 (파이프를 읽지 않으면 버퍼가 차서 서버가 멈춤)
+def start_app_server(work_dir, claude_url, args):
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join(filter(None, [STUBS_DIR, env.get("PYTHONPATH")])),
+        "NOTETAKER_CACHE_DIR": os.path.join(work_dir, "cache"),
+        "NOTETAKER_SPOOL_DIR": os.path.join(work_dir, "spool"),
+        "NOTETAKER_CLAUDE_API_URL": claude_url,
+        "NOTETAKER_DEFAULT_MODEL_SIZE": args.model,
+        "NOTETAKER_LIVE_ENABLED": "0",
+        "NOTETAKER_CRM_INSTANCE_URL": "",
+        "NOTETAKER_LOADTEST_WHISPER_RTF": str(args.whisper_rtf),
+        "NOTETAKER_LOADTEST_WHISPER_MB": str(args.whisper_mb),
+    })
+    if args.job_workers:
+        env["NOTETAKER_JOB_WORKERS"] = str(args.job_workers)
+    log_path = os.path.join(work_dir, "streamlit.log")
+    with open(log_path, "wb") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless=true",
+             f"--server.port={port}", "--server.address=127.0.0.1", "--server.enableXsrfProtection=false",
+             "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+            env=env, stdout=subprocess.DEVNULL, stderr=log,
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 시작 실패: {_log_tail(log_path)}")
+        try:
+            if requests.get(f"{base_url}/_stcore/health", timeout=1).ok:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    process.wait()
+    raise RuntimeError(f"서버가 60초 안에 응답하지 않습니다: {_log_tail(log_path)}")
+
+
+def _log_tail(path, limit=2000):
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - limit))
+            return f.read().decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+
+def stop_app_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# 브라우저 대신 Streamlit 웹소켓 프로토콜로 앱을 조작하는 세션
+# - 위젯 값은 브라우저처럼 세션에서 기억했다가 재실행 요청마다 보냄 (버튼은 한 번만 True)
+# - 스크립트 실행마다 (요청~마지막 화면 갱신, 요청~실행 종료) 시간을 기록
+class HeadlessSession:
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.ws = None
+        self.session_id = None
+        self.states = {}
+        self.widgets = {}
+        self.runs = []
+        self.texts = []
+        self.errors = []
+        self._run = None
+        self._requested_at = None
+        self._cache = {}
+
+    async def connect(self):
+        url = self.base_url.replace("http://", "ws://") + "/_stcore/stream"
+        self.ws = await websocket_connect(url, max_message_size=256 * 1024 * 1024)
+        await self.rerun()
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+            self.ws = None
+
+    def visible(self, key):
+        return key in self.widgets
+
+    def set_value(self, key, **value):
+        widget_id = self.widgets[key]
+        state = WidgetState(id=widget_id, **value)
+        self.states[widget_id] = state
+
+    async def click(self, key):
+        if not self.visible(key):
+            raise RuntimeError(f"화면에 '{key}' 버튼이 없습니다.")
+        await self.rerun(triggers=[WidgetState(id=self.widgets[key], trigger_value=True)])
+
+    # 재실행 요청 후 자동 재실행(작업 상태 확인)까지 끝나고 화면이 멈출 때까지 대기
+    async def rerun(self, triggers=()):
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(list(self.states.values()) + list(triggers))
+        self._requested_at = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        await self._wait(lambda forward: forward.WhichOneof("type") == "script_finished"
+                         and forward.script_finished == SCRIPT_FINISHED and self._run is None
+                         and self._requested_at is None)
+
+    # 업로드 URL을 받아 파일을 올리고 key의 file_uploader 위젯 상태로 지정 (paths가 목록이면 여러 파일)
+    async def upload(self, paths, key="audio_upload", content_type="audio/wav"):
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        msg = BackMsg()
+        msg.file_urls_request.request_id = uuid.uuid4().hex
+        msg.file_urls_request.session_id = self.session_id
+        msg.file_urls_request.file_names.extend(os.path.basename(path) for path in paths)
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        response = await self._wait(lambda forward: forward.WhichOneof("type") == "file_urls_response"
+                                    and forward.file_urls_response.response_id == msg.file_urls_request.request_id)
+
+        state = WidgetState(id=self.widgets[key])
+        for index, (path, file_urls) in enumerate(zip(paths, response.file_urls_response.file_urls), start=1):
+            name = os.path.basename(path)
+            with open(path, "rb") as f:
+                data = f.read()
+            boundary = uuid.uuid4().hex
+            body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+                    f"Content-Type: {content_type}\r\n\r\n").encode("utf-8") + data + \
+                f"\r\n--{boundary}--\r\n".encode()
+            await AsyncHTTPClient().fetch(HTTPRequest(
+                self.base_url + file_urls.upload_url, method="PUT", body=body,
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}, request_timeout=self.timeout,
+            ))
+            state.file_uploader_state_value.max_file_id = index
+            state.file_uploader_state_value.uploaded_file_info.append(UploadedFileInfo(
+                id=index, name=name, size=len(data), file_id=file_urls.file_id,
+                file_urls=FileURLs(file_id=file_urls.file_id, upload_url=file_urls.upload_url,
+                                   delete_url=file_urls.delete_url),
+            ))
+        self.states[state.id] = state
+        await self.rerun()
+
+    async def _wait(self, done):
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"{self.timeout:.0f}초 안에 응답이 끝나지 않았습니다.")
+            data = await asyncio.wait_for(self.ws.read_message(), remaining)
+            if data is None:
+                raise ConnectionError("서버와 연결이 끊겼습니다.")
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            if forward.WhichOneof("type") == "ref_hash":
+                forward = self._cache[forward.ref_hash]
+            elif forward.hash:
+                self._cache[forward.hash] = forward
+            self._handle(forward)
+            if done(forward):
+                return forward
+
+    def _handle(self, forward):
+        kind = forward.WhichOneof("type")
+        now = time.perf_counter()
+        if kind == "new_session":
+            self.session_id = self.session_id or forward.new_session.initialize.session_id
+            # 요청으로 시작한 실행은 요청 시각부터, 작업 확인용 자동 재실행은 실행 시작부터 잼
+            self._run = {"user": self._requested_at is not None, "started": self._requested_at or now,
+                         "rendered": now, "widgets": {}, "texts": []}
+            self._requested_at = None
+        elif kind == "delta" and self._run is not None:
+            self._run["rendered"] = now
+            if forward.delta.WhichOneof("type") == "new_element":
+                self._collect(forward.delta.new_element)
+        elif kind == "script_finished" and self._run is not None:
+            run, self._run = self._run, None
+            run.update(finished=now, status=forward.script_finished)
+            self.runs.append({"user": run["user"], "render_seconds": run["rendered"] - run["started"],
+                              "run_seconds": run["finished"] - run["started"]})
+            # 자동 재실행 직전 실행도 화면에 그려진 상태이므로 마지막 실행의 위젯/텍스트를 현재 화면으로 봄
+            self.widgets = run["widgets"]
+            self.texts = run["texts"]
+
+    def _collect(self, element):
+        kind = element.WhichOneof("type")
+        widget_id = getattr(getattr(element, kind), "id", "") if kind else ""
+        if isinstance(widget_id, str) and widget_id.startswith(WIDGET_ID_PREFIX):
+            key = widget_id.split("-", 2)[2]
+            if key != "None":
+                self._run["widgets"][key] = widget_id
+        if kind == "exception":
+            self.errors.append(f"{element.exception.type}: {element.exception.message}")
+        elif kind == "alert":
+            if element.alert.format == element.alert.ERROR:
+                self.errors.append(element.alert.body)
+            self._run["texts"].append(element.alert.body)
+        elif kind in ("markdown", "text", "heading"):
+            self._run["texts"].append(getattr(element, kind).body)
+
+    def shows(self, text):
+        return any(text in body for body in self.texts)
+
+
+# 텍스트 직접 입력 -> 저장 -> 요약
+async def text_flow(session, transcript):
+    session.set_value("direct_input_text", string_value=transcript)
+    await session.click("save_text")
+    await session.click("summarize_button")
+    return session.shows(SUMMARY_MARKER)
+
+
+# 오디오 업로드 -> 텍스트 변환 -> 요약
+async def upload_flow(session, audio_path):
+    await session.upload(audio_path)
+    await session.click("convert_audio")
+    if not session.visible("summarize_button"):
+        return False
+    await session.click("summarize_button")
+    return session.shows(SUMMARY_MARKER)
+
+
+# 세션 하나: 접속 -> API 키 입력 -> 흐름 반복, 흐름별 소요 시간 기록
+async def run_session(index, base_url, inputs, args, start_delay, results):
+    await asyncio.sleep(start_delay)
+    session = HeadlessSession(base_url, args.timeout)
+    flows = []
+    try:
+        await session.connect()
+        session.set_value("claude_api_key", string_value="loadtest")
+        await session.rerun()
+        for iteration in range(args.iterations):
+            for flow in args.flows:
+                started = time.perf_counter()
+                try:
+                    # 변환 결과는 세션마다 같으므로 브랜드명을 바꿔 요약 캐시에 걸리지 않게 함
+                    session.set_value("brand_name", string_value=f"부하테스트 {index}-{iteration}-{flow}")
+                    if flow == "text":
+                        ok = await text_flow(session, inputs["text"][index][iteration])
+                    else:
+                        ok = await upload_flow(session, inputs["audio"][index][iteration])
+                except Exception as e:
+                    session.errors.append(f"{flow}: {e}")
+                    ok = False
+                flows.append({"flow": flow, "ok": ok, "seconds": time.perf_counter() - started,
+                              "finished": time.perf_counter()})
+    except Exception as e:
+        session.errors.append(f"session: {e}")
+    results.append({"session": session, "flows": flows})
+
+
+# 세션/반복마다 다른 입력 (요약/변환 캐시에 걸리지 않도록)
+def make_inputs(directory, sessions, args, level):
+    inputs = {"text": [], "audio": []}
+    base_text = make_transcript(args.text_tokens)
+    for index in range(sessions):
+        inputs["text"].append([f"[부하 테스트 {level}-{index}-{iteration}] {base_text}"
+                               for iteration in range(args.iterations)])
+        paths = []
+        if "upload" in args.flows:
+            for iteration in range(args.iterations):
+                path = os.path.join(directory, f"session{index}_{iteration}.wav")
+                write_wav(path, synth_speech(args.audio_seconds, seed=level * 10000 + index * 100 + iteration))
+                paths.append(path)
+        inputs["audio"].append(paths)
+    return inputs
+
+
+def percentiles(values):
+    if not values:
+        return {f"p{p}": None for p in PERCENTILES}
+    return {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+
+
+# 작업 DB에서 종류별 대기열 대기 시간과 실행 시간
+def job_timings(db_path):
+    if not os.path.exists(db_path):
+        return {}
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT kind, started_at - created_at, finished_at - started_at FROM jobs "
+                            "WHERE status = 'done'").fetchall()
+    timings = {}
+    for kind in sorted({row[0] for row in rows}):
+        timings[kind] = {
+            "count": sum(1 for row in rows if row[0] == kind),
+            "queue_wait_seconds": percentiles([row[1] for row in rows if row[0] == kind]),
+            "run_seconds": percentiles([row[2] for row in rows if row[0] == kind]),
+        }
+    return timings
+
+
+# 첫 화면으로 모듈 import와 캐시 리소스 생성을 끝내 둠 (기준 메모리에 포함)
+async def _warm_up(base_url, args):
+    session = HeadlessSession(base_url, args.timeout)
+    await session.connect()
+    session.close()
+    await asyncio.sleep(1.0)
+
+
+async def _run_sessions(base_url, sessions, inputs, args):
+    results = []
+    ramp = args.ramp_seconds / sessions
+    await asyncio.gather(*[run_session(index, base_url, inputs, args, index * ramp, results)
+                           for index in range(sessions)])
+    return results
+
+
+# 세션 수 한 단계 실행: 서버 시작 -> 기준 메모리 -> N개 세션 동시 실행 -> 접속 유지 상태 메모리 -> 종료
+def run_level(sessions, claude_url, args, level):
+    work_dir = tempfile.mkdtemp(prefix=f"loadtest-{sessions}-")
+    try:
+        inputs = make_inputs(work_dir, sessions, args, level)
+        process, base_url = start_app_server(work_dir, claude_url, args)
+        try:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(_warm_up(base_url, args))
+                baseline_server, baseline_workers = process_rss_mb(process.pid)
+                with MemorySampler(process.pid) as sampler:
+                    started = time.perf_counter()
+                    results = loop.run_until_complete(_run_sessions(base_url, sessions, inputs, args))
+                    elapsed = time.perf_counter() - started
+                # 세션을 닫기 전에 재야 세션 상태가 서버에 남아 있음
+                loaded_server, loaded_workers = process_rss_mb(process.pid)
+                for result in results:
+                    result["session"].close()
+            finally:
+                loop.close()
+            timings = job_timings(os.path.join(work_dir, "cache", "jobs.sqlite3"))
+        finally:
+            stop_app_server(process)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    runs = [run for result in results for run in result["session"].runs]
+    flows = [flow for result in results for flow in result["flows"]]
+    errors = [error for result in results for error in result["session"].errors]
+    completed = [flow for flow in flows if flow["ok"]]
+    report = {
+        "sessions": sessions,
+        "elapsed_seconds": elapsed,
+        "flows": len(flows),
+        "flows_ok": len(completed),
+        "flows_per_minute": len(completed) / elapsed * 60 if elapsed else 0.0,
+        "errors": errors[:20],
+        "error_count": len(errors) + len(flows) - len(completed),
+        # 사용자가 누른 뒤 화면이 다 그려질 때까지 (작업 확인용 자동 재실행의 대기 시간은 제외)
+        "interaction_seconds": percentiles([run["render_seconds"] for run in runs if run["user"]]),
+        # 모든 스크립트 실행 (자동 재실행 포함)의 실행 시간
+        "rerun_seconds": percentiles([run["run_seconds"] for run in runs]),
+        "reruns": len(runs),
+        "flow_seconds": {flow: percentiles([item["seconds"] for item in completed if item["flow"] == flow])
+                         for flow in args.flows},
+        "jobs": timings,
+        "memory": {
+            "baseline_server_mb": baseline_server,
+            "baseline_workers_mb": baseline_workers,
+            "loaded_server_mb": loaded_server,
+            "loaded_workers_mb": loaded_workers,
+            "peak_server_mb": sampler.peak_server_mb,
+            "peak_total_mb": sampler.peak_total_mb,
+            "per_session_mb": max(0.0, loaded_server - baseline_server) / sessions,
+        },
+    }
+    return report
+
+
+# 포화점: 상호작용 p95나 메모리가 한도를 넘거나, 오류가 나거나, 세션을 늘려도 처리량이 늘지 않는 첫 단계
+def find_saturation(levels, max_p95, max_rss_mb, min_gain):
+    previous = None
+    for level in levels:
+        reasons = []
+        p95 = level["interaction_seconds"]["p95"]
+        if p95 is not None and p95 > max_p95:
+            reasons.append(f"상호작용 p95 {p95:.2f}초 > {max_p95:.2f}초")
+        if max_rss_mb and level["memory"]["peak_total_mb"] > max_rss_mb:
+            reasons.append(f"최대 메모리 {level['memory']['peak_total_mb']:.0f}MB > {max_rss_mb:.0f}MB")
+        if level["error_count"]:
+            reasons.append(f"오류 {level['error_count']}건")
+        if previous and level["flows_per_minute"] < previous["flows_per_minute"] * (1 + min_gain):
+            reasons.append(f"처리량 {previous['flows_per_minute']:.1f} -> {level['flows_per_minute']:.1f}건/분")
+        if reasons:
+            return {"sessions": level["sessions"], "last_ok_sessions": previous["sessions"] if previous else None,
+                    "reasons": reasons}
+        previous = level
+    return None
+
+
+def _format_seconds(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def print_report(levels, saturation):
+    header = f"{'세션':>4}  {'흐름/분':>7}  {'성공':>7}  {'상호작용 p50/p95/p99(초)':>24}  " \
+             f"{'재실행 p95':>9}  {'세션당MB':>8}  {'서버MB':>7}  {'최대MB':>7}  오류"
+    print(header)
+    for level in levels:
+        interaction = level["interaction_seconds"]
+        memory = level["memory"]
+        print(f"{level['sessions']:>4}  {level['flows_per_minute']:>7.1f}  "
+              f"{level['flows_ok']:>3}/{level['flows']:<3}  "
+              f"{'/'.join(_format_seconds(interaction[p]) for p in ('p50', 'p95', 'p99')):>24}  "
+              f"{_format_seconds(level['rerun_seconds']['p95']):>9}  {memory['per_session_mb']:>8.1f}  "
+              f"{memory['loaded_server_mb']:>7.0f}  {memory['peak_total_mb']:>7.0f}  {level['error_count']}")
+    if saturation:
+        last_ok = saturation["last_ok_sessions"]
+        print(f"포화점: {saturation['sessions']}세션 ({', '.join(saturation['reasons'])})"
+              + (f", 안정적으로 처리한 최대 {last_ok}세션" if last_ok else ""))
+    else:
+        print(f"포화점: 측정한 범위({levels[-1]['sessions']}세션)에서 찾지 못함")
+    for level in levels:
+        for error in level["errors"][:3]:
+            print(f"  [{level['sessions']}세션] {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streamlit 앱 멀티 세션 부하 테스트")
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 2, 4, 8], help="동시 세션 수 단계")
+    parser.add_argument("--flows", nargs="+", default=list(FLOWS), choices=FLOWS, help="세션마다 실행할 흐름")
+    parser.add_argument("--iterations", type=int, default=2, help="세션마다 흐름 반복 횟수")
+    parser.add_argument("--ramp-seconds", type=float, default=2.0, help="세션 접속을 나눠 시작하는 시간")
+    parser.add_argument("--audio-seconds", type=int, default=30, help="업로드할 합성 녹음 길이 (초)")
+    parser.add_argument("--text-tokens", type=int, default=2000, help="직접 입력할 미팅록 길이 (토큰)")
+    parser.add_argument("--model", default="tiny", help="변환에 쓸 모델 크기 (Whisper 대역)")
+    parser.add_argument("--whisper-rtf", type=float, default=0.05, help="Whisper 대역의 실시간 배율 (CPU 시간/녹음 길이)")
+    parser.add_argument("--whisper-mb", type=int, default=32, help="Whisper 대역 모델이 차지하는 메모리 (MB)")
+    parser.add_argument("--job-workers", type=int, default=0, help="작업 워커 수 (0이면 앱 설정 사용)")
+    parser.add_argument("--stub-delay", type=float, default=0.5, help="스텁 Claude 응답 지연 (초)")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="스텁 Claude 스트리밍 조각 사이 지연 (초)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="동작 하나를 기다리는 최대 시간 (초)")
+    parser.add_argument("--max-p95", type=float, default=2.0, help="포화로 보는 상호작용 p95 (초)")
+    parser.add_argument("--max-rss-mb", type=float, default=0.0, help="포화로 보는 서버+워커 최대 메모리 (MB, 0이면 무시)")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="세션을 늘렸을 때 기대하는 최소 처리량 증가 비율")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    stub, claude_url = claude_stub.start_stub_server(delay=args.stub_delay, token_delay=args.token_delay)
+    levels = []
+    try:
+        for level, sessions in enumerate(sorted(set(args.sessions))):
+            print(f"{sessions}세션 실행 중...", file=sys.stderr)
+            levels.append(run_level(sessions, claude_url, args, level))
+    finally:
+        stub.shutdown()
+
+    saturation = find_saturation(levels, args.max_p95, args.max_rss_mb, args.min_gain)
+    print_report(levels, saturation)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "levels": levels, "saturation": saturation}, f,
+                      ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
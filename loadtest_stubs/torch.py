@@ -0,0 +1,32 @@
+import contextlib
+
+# 부하 테스트용 torch 대역 (작업 워커가 쓰는 스레드 설정, 추론 컨텍스트, int8 양자화 호출만 구현)
+
+qint8 = "qint8"
+
+
+def set_num_threads(threads):
+    pass
+
+
+def set_num_interop_threads(threads):
+    pass
+
+
+@contextlib.contextmanager
+def inference_mode():
+    yield
+
+
+no_grad = inference_mode
+
+
+class nn:
+    class Linear:
+        pass
+
+
+class quantization:
+    @staticmethod
+    def quantize_dynamic(model, modules, dtype=None):
+        return model
@@ -0,0 +1,89 @@
+import os
+import time
+import wave
+
+import numpy as np
+
+# 부하 테스트용 Whisper 대역 (openai-whisper와 같은 이름으로 loadtest.py가 작업 워커의 PYTHONPATH 앞에 둠)
+# - load_model: 모델 크기만큼 메모리를 잡아 워커 상주 메모리를 흉내냄
+# - transcribe: 녹음 길이 × 실시간 배율만큼 CPU를 쓰고 5초 단위 세그먼트를 돌려줌
+# NOTETAKER_LOADTEST_WHISPER_RTF, NOTETAKER_LOADTEST_WHISPER_MB로 조절
+
+SAMPLE_RATE = 16000
+RTF = float(os.environ.get("NOTETAKER_LOADTEST_WHISPER_RTF", "0.05"))
+MODEL_MB = int(os.environ.get("NOTETAKER_LOADTEST_WHISPER_MB", "32"))
+SEGMENT_SECONDS = 5
+
+SENTENCES = [
+    "안녕하세요 저희는 브랜더진이고 인플루언서 마케팅을 도와드리고 있습니다.",
+    "올해 신제품 출시에 맞춰 캠페인을 준비하고 있어요.",
+    "예산은 분기별로 책정하고 있고 성과를 보고 다음 분기에 조정합니다.",
+    "다음 주까지 제안서를 보내주시면 내부 검토 후에 회신드리겠습니다.",
+]
+
+
+# model.parameters()가 돌려주는 텐서 대역 (model_registry.measure_model_bytes용)
+class _Tensor:
+    def __init__(self, array):
+        self.array = array
+
+    def numel(self):
+        return self.array.size
+
+    def element_size(self):
+        return self.array.itemsize
+
+
+class StandInModel:
+    def __init__(self, name):
+        self.name = name
+        self.weights = np.ones(MODEL_MB * 1024 * 1024 // 4, dtype=np.float32)
+
+    def eval(self):
+        return self
+
+    def modules(self):
+        return [self]
+
+    def parameters(self):
+        return [_Tensor(self.weights)]
+
+    def buffers(self):
+        return []
+
+    def transcribe(self, audio, language=None, **kwargs):
+        if isinstance(audio, str):
+            audio = load_audio(audio)
+        seconds = len(audio) / SAMPLE_RATE
+        _burn_cpu(seconds * RTF)
+        segments = []
+        for index, start in enumerate(range(0, int(np.ceil(seconds)), SEGMENT_SECONDS)):
+            segments.append({
+                "start": float(start),
+                "end": float(min(start + SEGMENT_SECONDS, seconds)),
+                "text": " " + SENTENCES[index % len(SENTENCES)],
+                "avg_logprob": -0.2,
+                "compression_ratio": 1.2,
+                "no_speech_prob": 0.1,
+            })
+        return {"text": "".join(segment["text"] for segment in segments), "segments": segments,
+                "language": language or "ko"}
+
+
+# 실제 추론처럼 CPU를 점유 (sleep과 달리 코어 수가 포화점에 반영됨)
+def _burn_cpu(seconds):
+    deadline = time.process_time() + seconds
+    block = np.ones((64, 64), dtype=np.float32)
+    while time.process_time() < deadline:
+        block = np.tanh(block @ block)
+
+
+def load_model(name, device=None, download_root=None, in_memory=False):
+    return StandInModel(name)
+
+
+# 16kHz mono 16-bit wav만 지원 (부하 테스트가 만드는 입력 형식)
+def load_audio(file, sr=SAMPLE_RATE):
+    with wave.open(file, "rb") as f:
+        frames = f.readframes(f.getnframes())
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
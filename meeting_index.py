@@ -0,0 +1,188 @@
+import os
+import time
+import sqlite3
+
+from cache_store import make_cache_key
+
+# 검색 결과 본문 발췌 길이 (토큰 수)
+SNIPPET_TOKENS = 16
+# 필드별 검색 가중치 (brand_name, our_participants, transcript, summary 순서)
+FIELD_WEIGHTS = (8.0, 2.0, 1.0, 3.0)
+
+
+# 미팅 하나의 식별 키 (같은 미팅록과 미팅 정보를 다시 요약하면 같은 행을 갱신)
+def make_meeting_key(transcript, meeting_info):
+    return make_cache_key(
+        transcript,
+        meeting_info.get("brand_name", ""),
+        meeting_info.get("meeting_date", ""),
+        meeting_info.get("our_participants", ""),
+    )
+
+
+# 검색어를 FTS5 MATCH 식으로 변환
+# - 한국어는 조사가 붙어 띄어쓰기 단위로 색인되므로 단어마다 접두어 검색 ("예산" -> "예산을", "예산이")
+# - 따옴표로 감싼 구절은 그대로, 나머지 특수문자는 FTS 문법으로 해석되지 않도록 따옴표 처리
+def build_match_query(text):
+    terms = []
+    for index, part in enumerate(text.split('"')):
+        if index % 2:
+            if part.strip():
+                terms.append('"' + part.strip() + '"')
+            continue
+        for word in part.split():
+            if word.upper() == "OR" and terms:
+                terms.append("OR")
+            else:
+                terms.append('"' + word.replace('"', "") + '"*')
+    while terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms)
+
+
+# 지난 미팅록과 요약 검색 색인 (SQLite FTS5)
+# - 본문은 meetings 테이블에 한 번만 저장하고 FTS 테이블은 그 행을 가리키는 외부 콘텐츠 색인
+# - 트리거로 추가/수정/삭제된 행만 색인에 반영 (전체 재색인 없음)
+# - 검색은 상위 N건의 메타데이터와 발췌만 읽고, 본문은 get()으로 한 건씩 조회
+class MeetingIndex:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS meetings (
+                    id INTEGER PRIMARY KEY,
+                    meeting_key TEXT UNIQUE NOT NULL,
+                    brand_name TEXT NOT NULL DEFAULT '',
+                    meeting_date TEXT NOT NULL DEFAULT '',
+                    company_name TEXT NOT NULL DEFAULT '',
+                    our_participants TEXT NOT NULL DEFAULT '',
+                    transcript TEXT NOT NULL DEFAULT '',
+                    summary TEXT NOT NULL DEFAULT '',
+                    source TEXT NOT NULL DEFAULT '',
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS meetings_date ON meetings (meeting_date)")
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+                    brand_name, our_participants, transcript, summary,
+                    content='meetings', content_rowid='id', tokenize='unicode61'
+                )
+            """)
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS meetings_ai AFTER INSERT ON meetings BEGIN
+                    INSERT INTO meetings_fts (rowid, brand_name, our_participants, transcript, summary)
+                    VALUES (new.id, new.brand_name, new.our_participants, new.transcript, new.summary);
+                END;
+                CREATE TRIGGER IF NOT EXISTS meetings_ad AFTER DELETE ON meetings BEGIN
+                    INSERT INTO meetings_fts (meetings_fts, rowid, brand_name, our_participants, transcript, summary)
+                    VALUES ('delete', old.id, old.brand_name, old.our_participants, old.transcript, old.summary);
+                END;
+                CREATE TRIGGER IF NOT EXISTS meetings_au AFTER UPDATE OF brand_name, our_participants, transcript, summary
+                ON meetings BEGIN
+                    INSERT INTO meetings_fts (meetings_fts, rowid, brand_name, our_participants, transcript, summary)
+                    VALUES ('delete', old.id, old.brand_name, old.our_participants, old.transcript, old.summary);
+                    INSERT INTO meetings_fts (rowid, brand_name, our_participants, transcript, summary)
+                    VALUES (new.id, new.brand_name, new.our_participants, new.transcript, new.summary);
+                END;
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # 미팅 저장 (같은 키가 있으면 바뀐 경우에만 갱신), 행 id 반환
+    def add(self, transcript, summary, meeting_info, source=""):
+        meeting_key = make_meeting_key(transcript, meeting_info)
+        fields = {
+            "brand_name": meeting_info.get("brand_name", ""),
+            "meeting_date": meeting_info.get("meeting_date", ""),
+            "company_name": meeting_info.get("company_name", ""),
+            "our_participants": meeting_info.get("our_participants", ""),
+            "transcript": transcript or "",
+            "summary": summary or "",
+            "source": source,
+        }
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT id, summary FROM meetings WHERE meeting_key = ?", (meeting_key,)).fetchone()
+            if row is None:
+                cursor = conn.execute(
+                    f"INSERT INTO meetings (meeting_key, {', '.join(fields)}, created_at, updated_at) "
+                    f"VALUES (?, {', '.join('?' for _ in fields)}, ?, ?)",
+                    (meeting_key, *fields.values(), now, now),
+                )
+                return cursor.lastrowid
+            # 키에 미팅록과 미팅 정보가 포함되므로 바뀔 수 있는 것은 요약(과 출처)뿐
+            if row["summary"] != fields["summary"]:
+                conn.execute("UPDATE meetings SET summary = ?, source = ?, updated_at = ? WHERE id = ?",
+                             (fields["summary"], source, now, row["id"]))
+            return row["id"]
+
+    # 관련도순 검색 결과 (본문 대신 발췌만 포함)
+    def search(self, text, limit=20, brand_name="", date_from="", date_to=""):
+        match = build_match_query(text)
+        if not match:
+            return []
+        conditions = ["meetings_fts MATCH ?"]
+        params = [match]
+        if brand_name:
+            conditions.append("m.brand_name LIKE ?")
+            params.append(f"%{brand_name}%")
+        if date_from:
+            conditions.append("m.meeting_date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("m.meeting_date <= ?")
+            params.append(date_to)
+        weights = ", ".join(str(weight) for weight in FIELD_WEIGHTS)
+        query = f"""
+            SELECT m.id, m.brand_name, m.meeting_date, m.our_participants, m.source,
+                   snippet(meetings_fts, -1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet,
+                   bm25(meetings_fts, {weights}) AS score
+            FROM meetings_fts JOIN meetings m ON m.id = meetings_fts.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score
+            LIMIT ?
+        """
+        with self._connect() as conn:
+            try:
+                rows = conn.execute(query, (*params, limit)).fetchall()
+            except sqlite3.OperationalError:
+                # 따옴표 짝이 안 맞는 등 해석할 수 없는 검색어
+                return []
+        return [dict(row) for row in rows]
+
+    # 기간 내 미팅 전체 (날짜순, 한 번에 다 읽지 않고 한 건씩)
+    def iter_meetings(self, date_from="", date_to=""):
+        conditions, params = [], []
+        if date_from:
+            conditions.append("meeting_date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("meeting_date <= ?")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = self._connect()
+        try:
+            for row in conn.execute(f"SELECT * FROM meetings {where} ORDER BY meeting_date, id", params):
+                yield dict(row)
+        finally:
+            conn.close()
+
+    def get(self, meeting_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        return dict(row) if row else None
+
+    def delete(self, meeting_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
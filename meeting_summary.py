@@ -0,0 +1,164 @@
+from datetime import datetime
+
+import config
+from cache_store import make_cache_key
+from metrics import get_metrics
+from summarizer import (EXTRACT_PROMPT_TEMPLATE, call_claude, diff_units, estimate_tokens, segment_hash,
+                        segments_from_text, summarize_map_reduce)
+from transcript_compactor import compact_segments, compaction_signature
+
+
+# 요약 프롬프트 템플릿
+SUMMARY_PROMPT_TEMPLATE = """
+너에게 브랜드 세일즈 미팅록을 전달했어. 너는 브랜드 세일즈 미팅록을 요약하여 세일즈포스에 기입할거야. 적절하게 우리의 Knowledge로 만들 수 있도록 요약본을 만들어 줘야해.
+
+(초반에 {company_name}에 대해 설명하는 Participant는 우리 세일즈맨이야. 우리 팀원 얘기 보다는 다른 Participant(고객) 목소리를 좀 더 담아서 요약 부탁.)
+
+💡 요약 시 포함할 내용:
+1. 미팅 개요: 미팅 날짜({meeting_date}), 참석자 (우리 측 & 브랜드 측), 브랜드명 및 담당자 역할
+2. 브랜드 배경: 브랜드의 마케팅 및 세일즈 현황, 현재 고민 또는 니즈
+3. (이 내역은 각각 구조화해서 작성해줘.) 
+   A. 마케터 인원수 혹은 구성 
+   B. 전체 마케팅 중 인플루언서 마케팅의 비중은 어느 정도인지 
+   C. 예산 책정 방식 
+   D. 이외에 어떤 마케팅을 전개하고 있는지 / 어떤 업무에 리소스를 투여하고 있는지
+4. 미팅 주요 논의 사항: 브랜드가 관심을 가진 서비스, 협업 가능성, 가격 협상 여부, 요청 사항
+5. 결론 및 액션 아이템: 브랜드의 관심 수준 (Hot, Warm, Cold), 다음 단계, 우리가 해야 할 일, 브랜드가 해야 할 일
+
+📌 간결하고 핵심적인 내용으로 정리하되, 의미가 명확하게 전달될 수 있도록 작성할 것.
+📌 목록 형식(Bullet Points) 또는 구조화된 섹션으로 정리하여 가독성을 높일 것.
+
+우리 측 참석자: {our_participants}
+브랜드명: {brand_name}
+
+{content_label}:
+{transcript}
+"""
+
+
+# 미팅록 일부를 고친 뒤 이전 요약을 고치는 프롬프트 (바뀐 부분의 수정 전/후만 전달)
+UPDATE_PROMPT_TEMPLATE = """
+아래는 브랜드 세일즈 미팅록으로 만든 기존 요약이야. 그 뒤에 미팅록 일부가 수정되었어 (주로 잘못 받아 적은 단어 수정). 수정 전/후 내용을 반영해서 기존 요약을 고쳐줘.
+
+📌 수정된 내용과 관련된 부분만 고치고, 나머지 문장과 섹션 구성(1~5번, 3번의 A~D 항목)은 그대로 유지할 것.
+📌 수정 전 내용에만 근거한 정보는 빼고, 수정 후 내용에 새로 나온 정보는 알맞은 섹션에 반영할 것.
+📌 설명 없이 고친 요약 전체만 출력할 것.
+
+미팅 날짜: {meeting_date}
+우리 측 참석자: {our_participants}
+브랜드명: {brand_name}
+
+기존 요약:
+{previous_summary}
+
+수정 전 {unit_label}:
+{before}
+
+수정 후 {unit_label}:
+{after}
+"""
+
+
+# 프롬프트 버전 (템플릿이 바뀌면 요약 캐시가 자동으로 무효화됨)
+# 미팅록 정리 설정도 요청 내용을 바꾸므로 함께 포함
+PROMPT_VERSION = make_cache_key(SUMMARY_PROMPT_TEMPLATE, EXTRACT_PROMPT_TEMPLATE, UPDATE_PROMPT_TEMPLATE,
+                                compaction_signature())[:16]
+
+
+# 요약 프롬프트 구성 (content_label: 본문 앞에 붙는 제목)
+def build_summary_prompt(transcript, meeting_info, content_label="미팅록 내용"):
+    # 미팅 정보 구성
+    company_name = meeting_info.get("company_name", "브랜더진")
+    our_participants = meeting_info.get("our_participants", "")
+    meeting_date = meeting_info.get("meeting_date", datetime.now().strftime("%Y-%m-%d"))
+    brand_name = meeting_info.get("brand_name", "")
+    
+    return SUMMARY_PROMPT_TEMPLATE.format(
+        company_name=company_name,
+        our_participants=our_participants,
+        meeting_date=meeting_date,
+        brand_name=brand_name,
+        content_label=content_label,
+        transcript=transcript,
+    )
+
+
+# 이전 요약 수정 프롬프트 구성 (before/after: 바뀐 문장 또는 바뀐 구간의 추출 내용)
+def build_update_prompt(previous_summary, before, after, meeting_info, unit_label="미팅록 문장"):
+    return UPDATE_PROMPT_TEMPLATE.format(
+        meeting_date=meeting_info.get("meeting_date", datetime.now().strftime("%Y-%m-%d")),
+        our_participants=meeting_info.get("our_participants", ""),
+        brand_name=meeting_info.get("brand_name", ""),
+        previous_summary=previous_summary,
+        unit_label=unit_label,
+        before=before or "(없음)",
+        after=after or "(없음)",
+    )
+
+
+# 요청 전 미팅록 정리 (군말/반복 제거, 토큰 예산), (정리된 세그먼트, 보고) 반환
+def compact_transcript(segments):
+    if not config.COMPACT_ENABLED:
+        tokens = sum(estimate_tokens(text) for text in segments)
+        return segments, {"tokens_before": tokens, "tokens_after": tokens, "tokens_saved": 0}
+    with get_metrics().stage("compact") as fields:
+        compacted, report = compact_segments(segments)
+        fields.update(tokens_before=report["tokens_before"], tokens_after=report["tokens_after"],
+                      tokens_saved=report["tokens_saved"])
+    return compacted, report
+
+
+# 요약 함수 (Claude API 사용, on_text가 있으면 최종 요약을 스트리밍으로 전달)
+# segments: 미팅록 세그먼트 텍스트 목록 (없으면 문장 단위로 나눔)
+# previous: 같은 미팅의 이전 요약 {"summary", "segments"}, 고친 부분이 적으면 그 부분만으로 이전 요약을 수정
+# report: 주어지면 미팅록 정리 결과(절감한 입력 토큰 등)를 기록
+def summarize_with_claude(transcript, api_key, meeting_info, on_text=None, segments=None, previous=None,
+                          report=None):
+    if not api_key:
+        return "Claude API 키가 제공되지 않았습니다."
+    
+    try:
+        # 실제 토큰 사용량은 요청마다 claude_request 단계로 따로 기록됨
+        with get_metrics().stage("summarize", model=config.CLAUDE_MODEL) as fields:
+            segments, compaction = compact_transcript(segments or segments_from_text(transcript))
+            if report is not None:
+                report.update(compaction)
+            if previous:
+                previous = dict(previous, segments=compact_transcript(previous["segments"])[0])
+            transcript = " ".join(segments)
+            fields["transcript_tokens"] = compaction["tokens_after"]
+            fields["tokens_saved"] = compaction["tokens_saved"]
+            # 한 번에 보낼 수 있는 길이면 단일 요청
+            if fields["transcript_tokens"] <= config.SUMMARY_SINGLE_PASS_TOKENS:
+                if previous:
+                    removed, added = diff_units(
+                        [(segment_hash(text), text.strip()) for text in previous["segments"]],
+                        [(segment_hash(text), text.strip()) for text in segments],
+                    )
+                    changed_tokens = estimate_tokens(" ".join(added))
+                    if changed_tokens <= fields["transcript_tokens"] * config.SUMMARY_UPDATE_MAX_RATIO:
+                        fields["incremental"] = True
+                        if not removed and not added:
+                            return previous["summary"]
+                        prompt = build_update_prompt(previous["summary"], "\n".join(removed), "\n".join(added),
+                                                     meeting_info)
+                        return call_claude(prompt, api_key, max_tokens=4000, on_text=on_text)
+                return call_claude(build_summary_prompt(transcript, meeting_info), api_key, max_tokens=4000,
+                                   on_text=on_text)
+            
+            # 긴 미팅록은 구간별 추출 후 최종 템플릿으로 통합 (내용이 같은 구간의 추출 결과는 재사용)
+            fields["map_reduce"] = True
+            return summarize_map_reduce(
+                transcript,
+                api_key,
+                lambda notes: build_summary_prompt(notes, meeting_info, "구간별로 추출한 미팅록 핵심 내용"),
+                company_name=meeting_info.get("company_name", "브랜더진"),
+                on_text=on_text,
+                segments=segments,
+                previous=previous,
+                build_update_prompt=lambda before, after: build_update_prompt(
+                    previous["summary"], before, after, meeting_info, "구간별 추출 내용"),
+                stats=fields,
+            )
+    except Exception as e:
+        return f"요약 생성 중 오류 발생: {str(e)}"
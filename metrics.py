@@ -0,0 +1,220 @@
+import os
+import json
+import math
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import config
+
+# 처리 시간 히스토그램 구간 (초)
+DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, math.inf)
+
+# 합계로 모으지 않는 기록 필드
+_NON_SUMMED_FIELDS = {"ts", "pid", "stage", "model", "ok", "rtf"}
+
+
+# 단계별 처리 시간 지표 (프로세스마다 하나, 워커 프로세스의 값은 작업 대기열을 통해 모음)
+# - stage()로 감싼 구간의 wall/CPU 시간과 함께 오디오 길이, 토큰 수 등 숫자 필드를 단계별로 합산
+# - log_path가 있으면 기록 하나마다 JSONL 한 줄 추가 (여러 프로세스가 같은 파일에 append)
+class Metrics:
+    def __init__(self, log_path=None, log_max_bytes=None):
+        self.log_path = log_path
+        self.log_max_bytes = log_max_bytes
+        self._stages = {}  # (단계, 모델) -> 집계
+        self._lock = threading.Lock()
+
+    # 측정 구간: with metrics.stage("whisper", model="base", audio_seconds=...) as fields: ...
+    # 블록 안에서 fields에 값을 추가하면 함께 기록됨
+    # CPU 시간은 프로세스 전체 기준이라 같은 프로세스에서 동시에 실행된 단계의 사용량이 섞일 수 있음
+    @contextmanager
+    def stage(self, name, model="", **fields):
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        ok = True
+        try:
+            yield fields
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.record(name, time.perf_counter() - wall_started, time.process_time() - cpu_started,
+                        model=model, ok=ok, **fields)
+
+    def record(self, stage, wall_seconds, cpu_seconds, model="", ok=True, **fields):
+        entry = {
+            "ts": time.time(),
+            "pid": os.getpid(),
+            "stage": stage,
+            "model": model or "",
+            "ok": ok,
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+        }
+        entry.update(fields)
+        if fields.get("audio_seconds"):
+            # 실시간 배율: 1초 분량의 오디오 처리에 걸린 시간 (1보다 작으면 실시간보다 빠름)
+            entry["rtf"] = wall_seconds / fields["audio_seconds"]
+
+        with self._lock:
+            aggregate = self._stages.setdefault((stage, entry["model"]), {
+                "count": 0,
+                "errors": 0,
+                "sums": {},
+                "buckets": [0] * len(DURATION_BUCKETS),
+            })
+            aggregate["count"] += 1
+            if not ok:
+                aggregate["errors"] += 1
+            for key, value in entry.items():
+                if key not in _NON_SUMMED_FIELDS and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    aggregate["sums"][key] = aggregate["sums"].get(key, 0) + value
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if wall_seconds <= bound:
+                    aggregate["buckets"][index] += 1
+                    break
+        self._append_log(entry)
+        return entry
+
+    def _append_log(self, entry):
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            if self.log_max_bytes and os.path.exists(self.log_path) \
+                    and os.path.getsize(self.log_path) > self.log_max_bytes:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            # 지표 기록 실패로 변환/요약이 실패하지 않도록 무시
+            pass
+
+    # JSON으로 옮길 수 있는 집계 목록 (작업 대기열의 워커 상태에 실어 보냄)
+    def snapshot(self):
+        with self._lock:
+            return [
+                {
+                    "stage": stage,
+                    "model": model,
+                    "count": aggregate["count"],
+                    "errors": aggregate["errors"],
+                    "sums": dict(aggregate["sums"]),
+                    "buckets": list(aggregate["buckets"]),
+                }
+                for (stage, model), aggregate in self._stages.items()
+            ]
+
+
+# 여러 프로세스의 집계를 단계/모델별로 합침
+def merge_snapshots(snapshots):
+    merged = {}
+    for snapshot in snapshots:
+        for item in snapshot:
+            key = (item["stage"], item["model"])
+            target = merged.setdefault(key, {
+                "stage": item["stage"],
+                "model": item["model"],
+                "count": 0,
+                "errors": 0,
+                "sums": {},
+                "buckets": [0] * len(DURATION_BUCKETS),
+            })
+            target["count"] += item["count"]
+            target["errors"] += item["errors"]
+            for name, value in item["sums"].items():
+                target["sums"][name] = target["sums"].get(name, 0) + value
+            for index, value in enumerate(item["buckets"][:len(DURATION_BUCKETS)]):
+                target["buckets"][index] += value
+    return sorted(merged.values(), key=lambda item: (item["stage"], item["model"]))
+
+
+def _labels(item, **extra):
+    labels = {"stage": item["stage"], "model": item["model"], **extra}
+    body = ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                    for name, value in labels.items())
+    return "{" + body + "}"
+
+
+# Prometheus 텍스트 형식으로 변환 (node_exporter textfile collector 등에서 수집)
+def render_prometheus(snapshots):
+    items = merge_snapshots(snapshots)
+    lines = [
+        "# HELP notetaker_stage_runs_total Completed pipeline stage runs.",
+        "# TYPE notetaker_stage_runs_total counter",
+    ]
+    lines += [f"notetaker_stage_runs_total{_labels(item)} {item['count']}" for item in items]
+    lines += [
+        "# HELP notetaker_stage_errors_total Pipeline stage runs that raised.",
+        "# TYPE notetaker_stage_errors_total counter",
+    ]
+    lines += [f"notetaker_stage_errors_total{_labels(item)} {item['errors']}" for item in items]
+
+    for name in sorted({name for item in items for name in item["sums"]}):
+        metric = f"notetaker_stage_{name}_total"
+        lines += [f"# HELP {metric} Sum of {name} over pipeline stage runs.", f"# TYPE {metric} counter"]
+        lines += [f"{metric}{_labels(item)} {item['sums'][name]:g}" for item in items if name in item["sums"]]
+
+    lines += [
+        "# HELP notetaker_stage_duration_seconds Wall time of pipeline stage runs.",
+        "# TYPE notetaker_stage_duration_seconds histogram",
+    ]
+    for item in items:
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, item["buckets"]):
+            cumulative += count
+            le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+            lines.append(f"notetaker_stage_duration_seconds_bucket{_labels(item, le=le)} {cumulative}")
+        lines.append(f"notetaker_stage_duration_seconds_sum{_labels(item)} {item['sums'].get('wall_seconds', 0):g}")
+        lines.append(f"notetaker_stage_duration_seconds_count{_labels(item)} {item['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# 수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+def write_prometheus(path, text):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# collect()가 돌려주는 집계 목록을 주기적으로 Prometheus 파일에 기록하는 스레드
+class PrometheusFileExporter:
+    def __init__(self, path, collect, interval):
+        self.path = path
+        self.collect = collect
+        self.interval = interval
+        self._thread = threading.Thread(target=self._loop, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self):
+        write_prometheus(self.path, render_prometheus(self.collect()))
+
+    def _loop(self):
+        while True:
+            try:
+                self.export()
+            except Exception:
+                pass
+            time.sleep(self.interval)
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 지표 (Streamlit 서버와 각 워커 프로세스에 하나씩)
+def get_metrics():
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics(config.METRICS_LOG_PATH or None, config.METRICS_LOG_MAX_MB * 1024 * 1024)
+        return _metrics
@@ -0,0 +1,208 @@
+import gc
+import time
+import threading
+from collections import OrderedDict
+
+import config
+
+# 모델 크기별 대략적인 fp32 가중치 메모리 (로드 전 예산 계산용, 로드 후에는 실측값 사용)
+ESTIMATED_MODEL_BYTES = {
+    "tiny": 39_000_000 * 4,
+    "base": 74_000_000 * 4,
+    "small": 244_000_000 * 4,
+    "medium": 769_000_000 * 4,
+    "large": 1_550_000_000 * 4,
+}
+
+# 추론 정밀도: fp32 원본, int8 동적 양자화 (Linear 층 가중치만 int8, CPU 전용)
+PRECISIONS = ("fp32", "int8")
+# int8 양자화 후 대략적인 메모리 비율 (임베딩/합성곱 층은 fp32로 남음)
+INT8_BYTES_RATIO = 0.35
+
+_torch_configured = False
+_torch_lock = threading.Lock()
+
+
+# 레지스트리와 작업에서 쓰는 모델 키 ("base", "base-int8")
+def model_key(model_size, precision="fp32"):
+    return model_size if precision in ("", "fp32") else f"{model_size}-{precision}"
+
+
+def parse_model_key(key):
+    model_size, _, precision = key.partition("-")
+    return model_size, precision or "fp32"
+
+
+def estimate_model_bytes(key):
+    model_size, precision = parse_model_key(key)
+    estimated = ESTIMATED_MODEL_BYTES.get(model_size, 0)
+    return int(estimated * INT8_BYTES_RATIO) if precision == "int8" else estimated
+
+
+# 프로세스당 한 번 torch 연산 스레드 수 고정 (여러 변환이 겹쳐도 코어를 나눠 쓰도록)
+def configure_torch_threads(threads=None):
+    global _torch_configured
+    import torch
+    with _torch_lock:
+        if _torch_configured:
+            return
+        torch.set_num_threads(threads or config.WHISPER_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # 이미 병렬 연산이 한 번 실행된 뒤에는 바꿀 수 없음
+            pass
+        _torch_configured = True
+
+
+# Linear 층을 int8 동적 양자화
+# whisper는 nn.Linear를 상속한 자체 Linear를 쓰는데 quantize_dynamic은 정확한 타입만 바꾸므로
+# (CPU fp32에서는 동작이 같은) nn.Linear로 되돌린 뒤 양자화
+def quantize_int8(model):
+    import torch
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# 기본 로더 (whisper는 처음 로드할 때 import), 키에 int8이 붙어 있으면 CPU로 불러와 양자화
+def load_whisper(key):
+    from transcription import get_whisper
+    model_size, precision = parse_model_key(key)
+    configure_torch_threads()
+    if precision == "int8":
+        return quantize_int8(get_whisper().load_model(model_size, device="cpu"))
+    return get_whisper().load_model(model_size)
+
+
+# 로드된 모델의 파라미터/버퍼 메모리 합계 (양자화된 Linear의 packed 가중치 포함)
+def measure_model_bytes(model):
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        for module in model.modules():
+            weight = getattr(module, "weight", None)
+            if callable(weight):
+                tensors.append(weight())
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+    except AttributeError:
+        return 0
+
+
+# 메모리 예산 안에서 Whisper 모델을 크기별로 상주시키는 레지스트리
+# - checkout/release로 참조 수를 관리하고, 사용 중인 모델은 내리지 않음
+# - 예산을 넘으면 참조가 없는 모델 중 가장 오래 사용하지 않은 것부터 해제
+# - 같은 크기를 동시에 요청하면 한 번만 로드
+class ModelRegistry:
+    def __init__(self, budget_bytes, loader=None):
+        self.budget_bytes = budget_bytes
+        self.loader = loader or load_whisper
+        self._entries = OrderedDict()  # 크기 -> {"model", "bytes", "refs", "load_seconds", "last_used"}
+        self._loading = set()
+        self._cond = threading.Condition()
+
+    def _resident_bytes(self):
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    # 새로 올릴 모델 공간 확보 (잠금을 잡은 상태에서 호출)
+    def _evict_for(self, incoming_bytes):
+        evicted = []
+        for size in list(self._entries):
+            if self._resident_bytes() + incoming_bytes <= self.budget_bytes:
+                break
+            if self._entries[size]["refs"] == 0:
+                evicted.append(self._entries.pop(size))
+        return evicted
+
+    def checkout(self, model_size):
+        with self._cond:
+            while model_size in self._loading:
+                self._cond.wait()
+            entry = self._entries.get(model_size)
+            if entry is not None:
+                entry["refs"] += 1
+                entry["last_used"] = time.time()
+                self._entries.move_to_end(model_size)
+                return entry["model"]
+            self._loading.add(model_size)
+            evicted = self._evict_for(estimate_model_bytes(model_size))
+
+        # 해제한 모델의 메모리를 먼저 돌려받은 뒤 로드
+        del evicted
+        gc.collect()
+        try:
+            started = time.time()
+            model = self.loader(model_size)
+            load_seconds = time.time() - started
+        except BaseException:
+            with self._cond:
+                self._loading.discard(model_size)
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._entries[model_size] = {
+                "model": model,
+                "bytes": measure_model_bytes(model) or estimate_model_bytes(model_size),
+                "refs": 1,
+                "load_seconds": load_seconds,
+                "last_used": time.time(),
+            }
+            self._loading.discard(model_size)
+            self._cond.notify_all()
+        return model
+
+    def release(self, model_size):
+        with self._cond:
+            entry = self._entries.get(model_size)
+            if entry is None:
+                return
+            entry["refs"] = max(0, entry["refs"] - 1)
+            evicted = self._evict_for(0)
+        if evicted:
+            del evicted
+            gc.collect()
+
+    # 백그라운드에서 미리 로드 (앱 시작 시 기본 모델)
+    def preload(self, model_size):
+        def load():
+            try:
+                self.checkout(model_size)
+                self.release(model_size)
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=load, name=f"whisper-preload-{model_size}", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        with self._cond:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": self._resident_bytes(),
+                "loading": sorted(self._loading),
+                "models": [
+                    {
+                        "model_size": size,
+                        "bytes": entry["bytes"],
+                        "refs": entry["refs"],
+                        "load_seconds": entry["load_seconds"],
+                        "last_used": entry["last_used"],
+                    }
+                    for size, entry in self._entries.items()
+                ],
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 레지스트리 (Streamlit 서버 밖의 워커 프로세스에서도 하나만 사용)
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(config.MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+        return _registry
@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import uuid
+import pickle
+import shutil
+import weakref
+import threading
+
+# 디스크로 내릴 수 있는 세션 상태 항목 (미팅록, 세그먼트, 요약, 여러 파일 변환 결과처럼 큰 값)
+# 위젯 값은 Streamlit이 관리하므로 크기만 집계하고 내리지 않음
+SPILL_KEYS = ("processed_data", "transcript_text", "transcript_segments", "summary_result", "summary_source",
+              "batch_results")
+
+
+# 세션 상태에 원래 값 대신 남겨 두는 표시 (값은 path의 pickle 파일에 있음)
+class Spilled:
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+    def __repr__(self):
+        return f"Spilled({self.size} bytes)"
+
+
+# 값이 차지하는 메모리 (dict/list/tuple/set은 안의 값까지, 같은 객체는 한 번만)
+def deep_sizeof(value, seen=None):
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    return size
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# Streamlit 세션 상태 객체 (실행마다 새로 만들어지는 SafeSessionState가 아니라 세션 내내 유지되는 내부 SessionState)
+def _raw_state(state):
+    return getattr(state, "_state", state)
+
+
+# 세션 상태 메모리 관리
+# - 실행이 끝날 때마다 세션 상태 항목별 크기를 집계
+# - 세션 합계가 session_max_bytes를 넘으면 그 세션의 큰 항목부터 디스크로 내림
+# - idle_seconds 동안 실행이 없던 세션의 큰 항목은 모두 내림
+# - 전체 합계가 total_max_bytes를 넘으면 가장 오래 쓰지 않은 세션부터 내림
+# - 내린 항목은 읽을 때(load) 다시 불러오고, 세션이 사라지면 파일을 지움
+class SessionMemoryGovernor:
+    def __init__(self, directory, session_max_bytes, total_max_bytes, idle_seconds, min_spill_bytes=0,
+                 sweep_interval=30):
+        self.directory = directory
+        self.session_max_bytes = session_max_bytes
+        self.total_max_bytes = total_max_bytes
+        self.idle_seconds = idle_seconds
+        self.min_spill_bytes = min_spill_bytes
+        self.sweep_interval = sweep_interval
+        self.spills = 0
+        self.reloads = 0
+        self.evicted_sessions = 0
+        # session_id -> {"state": SessionState weakref, "sizes": {key: 바이트}, "spilled": {key: 원래 바이트},
+        #                "paths": {key: 파일 경로}, "used": 이번 실행에서 읽은 key, "seen": 마지막 실행 시각}
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._last_sweep = 0.0
+        # 서버 프로세스마다 하위 디렉터리를 따로 쓰고, 끝난 프로세스가 남긴 디렉터리는 정리 (되살릴 세션이 없음)
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.isdigit() and int(name) != os.getpid() and not _pid_alive(int(name)):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        self.directory = os.path.join(directory, str(os.getpid()))
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _record(self, session_id, raw):
+        with self._lock:
+            return self._sessions.setdefault(session_id, {
+                "state": weakref.ref(raw), "sizes": {}, "spilled": {}, "paths": {}, "used": set(), "seen": time.time(),
+            })
+
+    # 세션 상태 값 읽기 (디스크로 내린 값이면 다시 불러와 세션 상태에 되돌림)
+    def load(self, session_id, state, key, default=None):
+        record = self._record(session_id, _raw_state(state))
+        record["used"].add(key)
+        value = state[key] if key in state else default
+        if not isinstance(value, Spilled):
+            return value
+        try:
+            with open(value.path, "rb") as f:
+                loaded = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            loaded = default
+        state[key] = loaded
+        self._remove_file(value.path)
+        with self._lock:
+            self.reloads += 1
+            record = self._sessions.get(session_id)
+            if record:
+                record["spilled"].pop(key, None)
+                record["paths"].pop(key, None)
+                record["sizes"][key] = deep_sizeof(loaded)
+        return loaded
+
+    # 실행 끝에 호출: 크기 집계 후 세션/전체 한도와 유휴 세션 정리
+    def enforce(self, session_id, state):
+        raw = _raw_state(state)
+        values = raw.filtered_state
+        sizes = {key: deep_sizeof(value) for key, value in values.items()}
+        stale = []
+        record = self._record(session_id, raw)
+        with self._lock:
+            record["sizes"] = sizes
+            record["seen"] = time.time()
+            used, record["used"] = record["used"], set()
+            # 내린 뒤 새 값으로 바뀐 항목의 파일은 더 이상 필요 없음
+            for key, path in list(record["paths"].items()):
+                marker = values.get(key)
+                if not isinstance(marker, Spilled) or marker.path != path:
+                    stale.append(record["paths"].pop(key))
+                    record["spilled"].pop(key, None)
+        for path in stale:
+            self._remove_file(path)
+
+        # 세션 한도: 이번 실행에서 읽지 않은 큰 항목부터 (읽은 항목은 다음 실행에서도 쓸 가능성이 높음)
+        total = sum(sizes.values())
+        for key in sorted(self._spillable(sizes), key=lambda key: (key not in used, sizes[key]), reverse=True):
+            if total <= self.session_max_bytes:
+                break
+            total -= self._spill(session_id, raw, key)
+
+        self.sweep(force=False)
+
+    # 유휴 세션과 전체 한도 정리 (sweep_interval마다, force면 바로)
+    def sweep(self, force=True):
+        now = time.time()
+        if not force and now - self._last_sweep < self.sweep_interval and self.total_bytes() <= self.total_max_bytes:
+            return
+        self._last_sweep = now
+
+        for session_id, raw in self._live_sessions():
+            record = self._sessions.get(session_id)
+            if record and now - record["seen"] >= self.idle_seconds and self._spillable(record["sizes"]):
+                self._spill_all(session_id, raw)
+                with self._lock:
+                    self.evicted_sessions += 1
+
+        # 전체 한도: 가장 오래 쓰지 않은 세션부터 (지금 실행 중인 세션이 마지막)
+        if self.total_bytes() > self.total_max_bytes:
+            sessions = sorted(self._live_sessions(), key=lambda item: self._sessions.get(item[0], {}).get("seen", 0))
+            for session_id, raw in sessions:
+                if self.total_bytes() <= self.total_max_bytes:
+                    break
+                self._spill_all(session_id, raw)
+
+    # 살아 있는 세션 목록, 사라진 세션은 기록과 파일 정리
+    def _live_sessions(self):
+        live, dead = [], []
+        with self._lock:
+            for session_id, record in list(self._sessions.items()):
+                raw = record["state"]()
+                if raw is None:
+                    dead.append(self._sessions.pop(session_id))
+                else:
+                    live.append((session_id, raw))
+        for record in dead:
+            for path in record["paths"].values():
+                self._remove_file(path)
+        return live
+
+    def _spillable(self, sizes):
+        return [key for key in SPILL_KEYS if sizes.get(key, 0) >= max(self.min_spill_bytes, 1)]
+
+    def _spill_all(self, session_id, raw):
+        record = self._sessions.get(session_id)
+        for key in self._spillable(record["sizes"]) if record else []:
+            self._spill(session_id, raw, key)
+
+    # 항목 하나를 디스크로 내리고 줄어든 바이트 수 반환
+    # (실행 끝 정리와 백그라운드 정리가 같은 항목을 동시에 내리지 않도록 _spill_lock으로 직렬화)
+    def _spill(self, session_id, raw, key):
+        with self._spill_lock:
+            value = raw[key] if key in raw else None
+            record = self._sessions.get(session_id)
+            if value is None or isinstance(value, Spilled) or record is None:
+                return 0
+            path = os.path.join(self.directory, f"{session_id}-{key}-{uuid.uuid4().hex}.pkl")
+            try:
+                with open(path, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                self._remove_file(path)
+                return 0
+            with self._lock:
+                # 실행 중인 세션이 pickle을 쓰는 동안 새 값을 넣었으면 새 값을 표시로 덮지 않음
+                if key not in raw or raw[key] is not value:
+                    self._remove_file(path)
+                    return 0
+                size = record["sizes"].get(key, 0)
+                marker = Spilled(path, size)
+                raw[key] = marker
+                record["sizes"][key] = deep_sizeof(marker)
+                record["spilled"][key] = size
+                record["paths"][key] = path
+                self.spills += 1
+            return size - record["sizes"][key]
+
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(sum(record["sizes"].values()) for record in self._sessions.values())
+
+    # 세션 하나의 메모리/디스크 사용량과 큰 항목 순위
+    def session_stats(self, session_id, top=5):
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                return {"bytes": 0, "spilled_bytes": 0, "top": []}
+            sizes = dict(record["sizes"])
+            spilled = dict(record["spilled"])
+        return {
+            "bytes": sum(sizes.values()),
+            "spilled_bytes": sum(spilled.values()),
+            "top": sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:top],
+            "spilled": sorted(spilled),
+        }
+
+    def stats(self):
+        with self._lock:
+            records = list(self._sessions.values())
+            return {
+                "sessions": len(records),
+                "bytes": sum(sum(record["sizes"].values()) for record in records),
+                "spilled_bytes": sum(sum(record["spilled"].values()) for record in records),
+                "session_max_bytes": self.session_max_bytes,
+                "total_max_bytes": self.total_max_bytes,
+                "spills": self.spills,
+                "reloads": self.reloads,
+                "evicted_sessions": self.evicted_sessions,
+            }
+
+
+# 실행이 없어도 유휴 세션을 정리하는 백그라운드 스레드
+class SessionSweepThread:
+    def __init__(self, governor, interval):
+        self.governor = governor
+        self.interval = interval
+        self._thread = threading.Thread(target=self._loop, name="session-sweep", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.governor.sweep()
+            except Exception:
+                pass
@@ -0,0 +1,224 @@
+import os
+import re
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from cache_store import DiskCache, make_cache_key
+from claude_client import get_client
+
+# 구간별 사실 추출 프롬프트 (map 단계)
+EXTRACT_PROMPT_TEMPLATE = """
+아래는 브랜드 세일즈 미팅록의 일부({index}/{total} 구간)야. 나중에 전체 미팅 요약을 만들 수 있도록 이 구간에서 나온 사실을 빠짐없이 뽑아줘.
+
+(초반에 {company_name}에 대해 설명하는 Participant는 우리 세일즈맨이야. 우리 팀원 얘기 보다는 다른 Participant(고객) 발언 위주로 정리해줘.)
+
+💡 추출할 내용:
+- 참석자, 브랜드명, 담당자 역할
+- 브랜드의 마케팅 및 세일즈 현황, 현재 고민 또는 니즈
+- 마케터 인원수/구성, 인플루언서 마케팅 비중, 예산 책정 방식, 그 외 마케팅 활동과 리소스 투입 업무
+- 관심 있는 서비스, 협업 가능성, 가격 협상, 요청 사항
+- 관심 수준을 짐작할 수 있는 발언, 다음 단계, 양측이 해야 할 일
+
+📌 이 구간에 없는 항목은 생략하고, 추측하지 말고 글머리표(Bullet Points)로만 적을 것.
+
+미팅록 일부:
+{chunk}
+"""
+
+# 추출 프롬프트 버전 (템플릿이 바뀌면 구간별 추출 캐시가 자동으로 무효화됨)
+EXTRACT_PROMPT_VERSION = make_cache_key(EXTRACT_PROMPT_TEMPLATE)[:16]
+
+# 내용 기반 구간 경계 간격 계산용 세그먼트 평균 토큰 수 (Whisper 세그먼트 하나 ≈ 5초 발화)
+SEGMENT_TOKENS_ESTIMATE = 40
+
+_HANGUL_PATTERN = re.compile(r"[가-힣]")
+_SENTENCE_PATTERN = re.compile(r"(?<=[\.\?\!。])\s+|\n+")
+
+
+# 토큰 수 추정 (한글 음절은 1토큰, 그 외 문자는 4자당 1토큰으로 보수적으로 계산)
+def estimate_tokens(text):
+    if not text:
+        return 0
+    hangul = len(_HANGUL_PATTERN.findall(text))
+    others = len(re.sub(r"[가-힣\s]", "", text))
+    return hangul + (others + 3) // 4
+
+
+# 문장 단위로 나누고, 한 문장이 너무 길면 글자 수 기준으로 자름
+def _split_sentences(text, max_tokens):
+    sentences = []
+    for sentence in _SENTENCE_PATTERN.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while estimate_tokens(sentence) > max_tokens:
+            # 한글 기준 1자 ≈ 1토큰이므로 max_tokens 글자에서 자르면 한도를 넘지 않음
+            sentences.append(sentence[:max_tokens])
+            sentence = sentence[max_tokens:]
+        sentences.append(sentence)
+    return sentences
+
+
+# 세그먼트 내용 해시 (공백 차이는 무시)
+def segment_hash(text):
+    return hashlib.sha256(" ".join((text or "").split()).encode("utf-8")).hexdigest()[:16]
+
+
+# 세그먼트가 없는 미팅록(직접 입력, 텍스트 파일)은 문장을 세그먼트로 사용
+def segments_from_text(text):
+    return _split_sentences(text or "", config.SUMMARY_CHUNK_TOKENS)
+
+
+# 세그먼트를 토큰 한도에 맞는 구간으로 묶음 [{"hash", "text", "tokens"}]
+# 구간 경계는 세그먼트 내용(해시)으로 정해서, 일부 세그먼트를 고쳐도 그 세그먼트가 속한 구간만 바뀌고
+# 뒤쪽 구간의 경계는 그대로 유지됨 (토큰 수로만 자르면 고친 곳 뒤의 경계가 모두 밀림)
+# - 최소 길이(한도의 절반)를 넘긴 뒤 해시가 조건을 만족하는 세그먼트에서 끝내고, 한도에 닿으면 강제로 끝냄
+# - 구간 앞에는 문맥 유지를 위해 직전 구간의 마지막 세그먼트 일부를 붙이고, 해시에도 포함
+def chunk_segments(segments, max_tokens=None, overlap_tokens=None):
+    max_tokens = max_tokens or config.SUMMARY_CHUNK_TOKENS
+    overlap_tokens = config.SUMMARY_CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    min_tokens = max_tokens // 2
+    boundary_every = max(1, max_tokens // (4 * SEGMENT_TOKENS_ESTIMATE))
+
+    chunks = []
+    carried = []  # 직전 구간에서 가져온 (세그먼트, 해시, 토큰 수)
+    current, hashes, current_tokens = [], [], 0
+
+    def close():
+        if not current:
+            return []
+        context = [piece for piece, _, _ in carried]
+        context_hashes = [piece_hash for _, piece_hash, _ in carried]
+        chunks.append({
+            "hash": make_cache_key(context_hashes, hashes)[:16],
+            "text": " ".join(context + current),
+            "tokens": current_tokens + sum(tokens for _, _, tokens in carried),
+        })
+        tail, tail_tokens = [], 0
+        for piece, piece_hash in zip(reversed(current), reversed(hashes)):
+            tokens = estimate_tokens(piece)
+            if tail_tokens + tokens > overlap_tokens:
+                break
+            tail.insert(0, (piece, piece_hash, tokens))
+            tail_tokens += tokens
+        return tail
+
+    for segment in segments:
+        text = (segment or "").strip()
+        if not text:
+            continue
+        pieces = [text] if estimate_tokens(text) <= max_tokens else _split_sentences(text, max_tokens)
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > max_tokens:
+                carried = close()
+                current, hashes, current_tokens = [], [], 0
+            current.append(piece)
+            hashes.append(segment_hash(piece))
+            current_tokens += tokens
+            if current_tokens >= min_tokens and int(hashes[-1], 16) % boundary_every == 0:
+                carried = close()
+                current, hashes, current_tokens = [], [], 0
+    close()
+    return chunks
+
+
+# 이전/현재 목록에서 빠진 내용과 새로 생긴 내용 [(해시, 내용)] -> (빠진 내용, 추가된 내용)
+def diff_units(previous, current):
+    previous_hashes = {unit_hash for unit_hash, _ in previous}
+    current_hashes = {unit_hash for unit_hash, _ in current}
+    removed = [content for unit_hash, content in previous if unit_hash not in current_hashes]
+    added = [content for unit_hash, content in current if unit_hash not in previous_hashes]
+    return removed, added
+
+
+# Claude Messages API 호출 후 응답 텍스트 반환 (실패 시 ClaudeAPIError 발생)
+# on_text가 주어지면 스트리밍으로 받으면서 지금까지 받은 텍스트를 계속 전달
+def call_claude(prompt, api_key, max_tokens=4000, api_url=None, model=None, on_text=None):
+    client = get_client()
+    if on_text is None:
+        return client.create_message(prompt, api_key, max_tokens=max_tokens, model=model, api_url=api_url)
+
+    text = ""
+    for piece in client.stream_message(prompt, api_key, max_tokens=max_tokens, model=model, api_url=api_url):
+        text += piece
+        on_text(text)
+    return text
+
+
+_note_cache = None
+_note_cache_lock = threading.Lock()
+
+
+# 구간별 추출 결과 캐시 (구간 내용 해시 기준, 모든 세션/워커 프로세스가 공유)
+def get_note_cache():
+    global _note_cache
+    with _note_cache_lock:
+        if _note_cache is None:
+            _note_cache = DiskCache(
+                os.path.join(config.CACHE_DIR, "summary_notes"),
+                config.SUMMARY_CACHE_MAX_MB * 1024 * 1024,
+                ttl_seconds=config.SUMMARY_CACHE_TTL_SECONDS,
+            )
+        return _note_cache
+
+
+def _note_key(chunk_hash, company_name, model):
+    return make_cache_key(chunk_hash, company_name, model or config.CLAUDE_MODEL, EXTRACT_PROMPT_VERSION)
+
+
+# 긴 미팅록 요약: 구간별 사실 추출(map)을 병렬로 요청한 뒤 최종 템플릿 요약(reduce)
+# build_reduce_prompt(notes)는 추출 결과를 받아 최종 요약 프롬프트를 만드는 함수
+# - segments가 있으면 세그먼트 경계로 구간을 나누고, 내용이 같은 구간은 이전 추출 결과를 재사용
+# - previous({"summary", "segments"})와 build_update_prompt(before, after)가 있고 바뀐 구간이 적으면
+#   전체를 다시 통합하지 않고 바뀐 구간의 추출 결과 전/후만으로 이전 요약을 고침
+# - stats에 구간 수, 재사용/새로 추출한 구간 수를 기록
+def summarize_map_reduce(transcript, api_key, build_reduce_prompt, company_name="브랜더진",
+                         max_workers=None, api_url=None, on_text=None, segments=None, previous=None,
+                         build_update_prompt=None, model=None, stats=None):
+    stats = {} if stats is None else stats
+    chunks = chunk_segments(segments if segments else segments_from_text(transcript))
+    note_cache = get_note_cache()
+    keys = [_note_key(chunk["hash"], company_name, model) for chunk in chunks]
+    notes = [note_cache.get(key) for key in keys]
+    missing = [index for index, note in enumerate(notes) if note is None]
+    stats.update(chunks=len(chunks), reused_chunks=len(chunks) - len(missing), extracted_chunks=len(missing))
+
+    def extract(index):
+        prompt = EXTRACT_PROMPT_TEMPLATE.format(
+            index=index + 1, total=len(chunks), company_name=company_name, chunk=chunks[index]["text"]
+        )
+        note = call_claude(prompt, api_key, max_tokens=config.SUMMARY_MAP_MAX_TOKENS, api_url=api_url, model=model)
+        note_cache.put(keys[index], note)
+        return note
+
+    if missing:
+        max_workers = max(1, min(max_workers or config.SUMMARY_MAP_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for index, note in zip(missing, pool.map(extract, missing)):
+                notes[index] = note
+
+    if previous and build_update_prompt:
+        previous_chunks = chunk_segments(previous["segments"])
+        previous_notes = [note_cache.get(_note_key(chunk["hash"], company_name, model)) for chunk in previous_chunks]
+        removed, added = diff_units(
+            [(chunk["hash"], note) for chunk, note in zip(previous_chunks, previous_notes)],
+            [(chunk["hash"], note) for chunk, note in zip(chunks, notes)],
+        )
+        if not removed and not added:
+            stats["incremental"] = True
+            if on_text:
+                on_text(previous["summary"])
+            return previous["summary"]
+        # 이전 구간의 추출 결과가 캐시에서 지워졌으면 전체 통합으로 대체
+        if None not in removed and len(added) <= len(chunks) * config.SUMMARY_UPDATE_MAX_RATIO:
+            stats["incremental"] = True
+            prompt = build_update_prompt("\n\n".join(note.strip() for note in removed),
+                                         "\n\n".join(note.strip() for note in added))
+            return call_claude(prompt, api_key, max_tokens=4000, api_url=api_url, model=model, on_text=on_text)
+
+    combined = "\n\n".join(f"[구간 {index}]\n{note.strip()}" for index, note in enumerate(notes, start=1))
+    return call_claude(build_reduce_prompt(combined), api_key, max_tokens=4000, api_url=api_url, model=model,
+                       on_text=on_text)
@@ -0,0 +1,129 @@
+import re
+
+import config
+from summarizer import estimate_tokens
+
+# 의미 없이 끼어드는 말 (단독 어절일 때만 제거, "그 브랜드"의 "그"처럼 뜻이 있는 말은 제외)
+FILLERS = {
+    "음", "음음", "으음", "음…", "어", "어어", "어어어", "아", "아아", "에", "에에", "흠", "엄", "으",
+    "그러니까", "그니까", "뭐랄까", "뭐지", "있잖아요", "있잖아",
+}
+
+# 무음 구간에서 Whisper가 만들어내는 흔한 문장 (세그먼트 전체가 이 문장일 때만 제거)
+HALLUCINATIONS = {
+    "시청해주셔서감사합니다", "시청해주셔서고맙습니다", "구독과좋아요부탁드립니다", "구독과좋아요",
+    "다음영상에서만나요", "mbc뉴스이덕영입니다", "자막제공및자막편집",
+}
+
+# 어절 비교 시 무시하는 앞뒤 문장부호
+_PUNCTUATION = ".,!?~…·\"'“”‘’()[]"
+_NORMALIZE_PATTERN = re.compile(r"[\s\.,!?~…·\"'“”‘’()\[\]]+")
+
+
+def _normalize(text):
+    return _NORMALIZE_PATTERN.sub("", text or "").lower()
+
+
+def _strip_punctuation(token):
+    return token.strip(_PUNCTUATION)
+
+
+# 설정값 서명 (설정이 바뀌면 요약 캐시가 무효화되도록 캐시 키에 포함)
+def compaction_signature():
+    return (config.COMPACT_ENABLED, config.COMPACT_TOKEN_BUDGET, config.COMPACT_MAX_NGRAM,
+            config.COMPACT_OPENING_RATIO, config.COMPACT_OPENING_KEEP_TOKENS)
+
+
+# 연속으로 반복되는 n-그램을 한 번만 남김 ("네 네 네", Whisper의 같은 구절 반복 루프)
+# 각 위치에서 가장 많은 어절을 지울 수 있는 n을 골라 반복분을 건너뜀
+def collapse_repeats(tokens, max_ngram=None):
+    max_ngram = max_ngram or config.COMPACT_MAX_NGRAM
+    keys = [_strip_punctuation(token) for token in tokens]
+    kept = []
+    index = 0
+    while index < len(tokens):
+        best_n, best_repeats = 0, 0
+        for n in range(1, max_ngram + 1):
+            if index + 2 * n > len(tokens):
+                break
+            gram = keys[index:index + n]
+            if not any(gram):
+                continue
+            repeats = 1
+            while keys[index + repeats * n:index + (repeats + 1) * n] == gram:
+                repeats += 1
+            if repeats > 1 and (repeats - 1) * n > (best_repeats - 1) * best_n:
+                best_n, best_repeats = n, repeats
+        if best_n:
+            # 마지막 반복의 문장부호를 유지하도록 마지막 반복분을 남김
+            start = index + (best_repeats - 1) * best_n
+            kept.extend(tokens[start:start + best_n])
+            index += best_repeats * best_n
+        else:
+            kept.append(tokens[index])
+            index += 1
+    return kept
+
+
+# 세그먼트 목록 정리 후 (정리된 세그먼트, 보고) 반환
+# 1. 단독 어절 군말 제거  2. 세그먼트 안의 반복 루프 축약  3. 연속 중복 세그먼트/Whisper 환각 문장 제거
+# 4. 그래도 토큰 예산을 넘으면 앞부분(우리 회사 소개 구간)을 첫 인사/소개만 남기고 줄임
+#    앞부분을 줄여도 예산 안에 들어오지 않으면 줄이지 않고 분할 요약에 맡김 (고객 발언 구간은 항상 유지)
+def compact_segments(segments, budget=None):
+    budget = config.COMPACT_TOKEN_BUDGET if budget is None else budget
+    report = {"tokens_before": 0, "fillers": 0, "repeats": 0, "hallucinations": 0, "opening": 0}
+
+    compacted = []
+    previous_key = None
+    for segment in segments:
+        text = (segment or "").strip()
+        before = estimate_tokens(text)
+        report["tokens_before"] += before
+        if not text:
+            continue
+        if _normalize(text) in HALLUCINATIONS:
+            report["hallucinations"] += before
+            continue
+
+        tokens = [token for token in text.split() if _strip_punctuation(token) not in FILLERS]
+        without_fillers = " ".join(tokens)
+        report["fillers"] += before - estimate_tokens(without_fillers)
+        text = " ".join(collapse_repeats(tokens))
+        report["repeats"] += estimate_tokens(without_fillers) - estimate_tokens(text)
+
+        key = _normalize(text)
+        if not key:
+            continue
+        if key == previous_key:
+            report["repeats"] += estimate_tokens(text)
+            continue
+        previous_key = key
+        compacted.append(text)
+
+    counts = [estimate_tokens(text) for text in compacted]
+    total = sum(counts)
+    if budget and total > budget:
+        # 앞부분 구간: 전체 토큰의 COMPACT_OPENING_RATIO 안에서 시작하는 세그먼트
+        opening_end, position = 0, 0
+        while opening_end < len(compacted) and position < total * config.COMPACT_OPENING_RATIO:
+            position += counts[opening_end]
+            opening_end += 1
+        kept_tokens, droppable = 0, []
+        for index in range(opening_end):
+            if kept_tokens < config.COMPACT_OPENING_KEEP_TOKENS:
+                kept_tokens += counts[index]
+            else:
+                droppable.append(index)
+        dropped = set()
+        if total - sum(counts[index] for index in droppable) <= budget:
+            for index in droppable:
+                if total <= budget:
+                    break
+                dropped.add(index)
+                total -= counts[index]
+                report["opening"] += counts[index]
+        compacted = [text for index, text in enumerate(compacted) if index not in dropped]
+
+    report["tokens_after"] = sum(estimate_tokens(text) for text in compacted)
+    report["tokens_saved"] = report["tokens_before"] - report["tokens_after"]
+    return compacted, report
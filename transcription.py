@@ -0,0 +1,664 @@
+import os
+import re
+import time
+import threading
+import contextlib
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import config
+from audio_stream import PcmSpool, ffmpeg_available, read_pcm, to_float32
+from metrics import get_metrics
+from vad import remap_segments, remove_silence
+
+# Whisper 입력 샘플레이트 (whisper.audio.SAMPLE_RATE와 동일)
+SAMPLE_RATE = 16000
+# 무음 탐색용 에너지 프레임 길이 (초)
+FRAME_SECONDS = 0.03
+
+# 단계별 변환에서 재변환 구간을 묶는 길이 (Whisper 한 창)와 구간 사이에 넣는 무음 (초)
+PACK_SECONDS = 30.0
+PACK_GAP_SECONDS = 1.0
+
+# 묶음 변환에서 창을 자를 무음 탐색 범위 (창이 30초를 넘지 않도록 창 길이를 이만큼 줄여 잡음, 초)
+BATCH_SEARCH_SECONDS = 2.0
+# Whisper 타임스탬프 토큰 간격 (초)
+TIMESTAMP_SECONDS = 0.02
+# model.transcribe와 같은 기준: 말소리 없는 창, 온도를 올려 다시 디코딩할 창
+BATCH_NO_SPEECH_THRESHOLD = 0.6
+BATCH_LOGPROB_THRESHOLD = -1.0
+BATCH_COMPRESSION_THRESHOLD = 2.4
+
+# 결과에 보존하는 세그먼트 필드
+SEGMENT_FIELDS = ("start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob")
+
+# start/end: 실제 변환 구간, keep_start/keep_end: 이어붙일 때 이 창이 담당하는 구간 (샘플 단위)
+AudioWindow = namedtuple("AudioWindow", ["index", "start", "end", "keep_start", "keep_end"])
+
+
+_whisper = None
+_whisper_lock = threading.Lock()
+
+
+# whisper(와 torch)는 변환이 처음 필요할 때 import
+# 가져오는 데 수 초와 수백 MB가 들어서, 텍스트만 다루는 경로에서는 불러오지 않음
+def get_whisper():
+    global _whisper
+    with _whisper_lock:
+        if _whisper is None:
+            import whisper
+            _whisper = whisper
+        return _whisper
+
+
+# 첫 변환 요청 전에 백그라운드 스레드에서 미리 import
+def start_whisper_warmup():
+    thread = threading.Thread(target=get_whisper, name="whisper-import", daemon=True)
+    thread.start()
+    return thread
+
+
+# 추론 전용 컨텍스트 (autograd 기록과 버전 카운터를 끔, 변환 중에는 역전파가 필요 없음)
+def inference_context():
+    import torch
+    inference_mode = getattr(torch, "inference_mode", None)
+    return inference_mode() if inference_mode else torch.no_grad()
+
+
+# 모델 변환 호출 (CPU에서는 fp16을 지원하지 않으므로 경고 없이 fp32로 디코딩)
+def _run_model(model, audio, language):
+    with inference_context():
+        return model.transcribe(audio, language=language, fp16=False)
+
+
+# 오디오 파일을 16kHz mono float32 배열로 디코딩
+def load_audio(path):
+    return get_whisper().load_audio(path)
+
+
+# 프레임 단위 RMS 에너지 계산
+# PCM 스풀(int16)도 전체를 float32로 복사하지 않도록 block_frames 프레임씩 나눠 계산
+def frame_energy(audio, frame_length, block_frames=4096):
+    count = len(audio) // frame_length
+    energy = np.zeros(count, dtype=np.float32)
+    scale = 32768.0 if audio.dtype == np.int16 else 1.0
+    for start in range(0, count, block_frames):
+        end = min(count, start + block_frames)
+        frames = np.asarray(audio[start * frame_length:end * frame_length]).reshape(end - start, frame_length)
+        energy[start:end] = np.sqrt(np.mean((frames.astype(np.float32) / scale) ** 2, axis=1))
+    return energy
+
+
+# 목표 길이 근처의 무음 지점에서 오디오를 겹치는 창으로 분할
+def split_windows(audio, window_seconds=None, overlap_seconds=None, search_seconds=None):
+    window_seconds = window_seconds or config.TRANSCRIBE_WINDOW_SECONDS
+    overlap_seconds = config.TRANSCRIBE_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds
+    search_seconds = config.TRANSCRIBE_SILENCE_SEARCH_SECONDS if search_seconds is None else search_seconds
+
+    total = len(audio)
+    window = int(window_seconds * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    search = int(search_seconds * SAMPLE_RATE)
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+
+    cuts = [0]
+    if total > window:
+        energy = frame_energy(audio, frame)
+        while total - cuts[-1] > window:
+            target = cuts[-1] + window
+            # 창이 너무 짧아지지 않도록 탐색 범위의 하한을 창 길이의 절반으로 제한
+            low = max(cuts[-1] + window // 2, target - search) // frame
+            high = min(len(energy), (target + search) // frame)
+            if high <= low:
+                cut = target
+            else:
+                cut = (low + int(np.argmin(energy[low:high]))) * frame + frame // 2
+            if total - cut < frame:
+                break
+            cuts.append(cut)
+    cuts.append(total)
+
+    windows = []
+    for index in range(len(cuts) - 1):
+        keep_start, keep_end = cuts[index], cuts[index + 1]
+        windows.append(AudioWindow(
+            index=index,
+            start=max(0, keep_start - overlap),
+            end=min(total, keep_end + overlap),
+            keep_start=keep_start,
+            keep_end=keep_end,
+        ))
+    return windows
+
+
+# 이음매 중복 비교용 텍스트 정규화
+def _normalize_text(text):
+    return re.sub(r"[\s\.,!?~…\"']+", "", text or "")
+
+
+# 겹침 구간에서 같은 문장이 양쪽 창에 모두 잡힌 경우
+# (두 세그먼트가 모두 이음매(seam)에서 overlap초 안에 있고 시간이 겹치며 내용이 같을 때만, 연달아 나온 같은 말은 유지)
+def _is_seam_duplicate(previous, segment, seam, overlap):
+    if previous["end"] < seam - overlap or segment["start"] > seam + overlap:
+        return False
+    if segment["start"] >= previous["end"] or previous["start"] >= segment["end"]:
+        return False
+    return _normalize_text(segment["text"]) == _normalize_text(previous["text"])
+
+
+# 창별 세그먼트를 원본 타임라인 기준으로 이어붙이고 이음매 중복 제거
+def stitch_segments(windows, window_segments):
+    stitched = []
+    for window in windows:
+        keep_start = window.keep_start / SAMPLE_RATE
+        keep_end = window.keep_end / SAMPLE_RATE
+        overlap = (window.keep_start - window.start) / SAMPLE_RATE
+        # 이전 창에서 마지막으로 남긴 세그먼트 (이 창의 세그먼트와만 비교)
+        previous = stitched[-1] if stitched else None
+        for segment in window_segments.get(window.index, []):
+            middle = (segment["start"] + segment["end"]) / 2
+            if middle < keep_start or middle >= keep_end:
+                continue
+            if previous is not None and _is_seam_duplicate(previous, segment, keep_start, overlap):
+                continue
+            stitched.append(dict(segment))
+
+    for index, segment in enumerate(stitched):
+        segment["id"] = index
+    return stitched
+
+
+# Whisper 결과 세그먼트를 필요한 필드만 남기고 시간 오프셋 적용
+def _shift_segment(segment, offset):
+    shifted = {key: segment.get(key) for key in SEGMENT_FIELDS}
+    shifted["start"] = segment["start"] + offset
+    shifted["end"] = segment["end"] + offset
+    return shifted
+
+
+# 무음 제거 결과가 없을 때의 보고값
+def _no_vad_report(samples):
+    seconds = samples / SAMPLE_RATE
+    return {"original_seconds": seconds, "speech_seconds": seconds, "skipped_seconds": 0.0}
+
+
+# 오디오 디코딩 (처리 시간 지표 기록)
+def _decode(audio_file):
+    with get_metrics().stage("decode") as fields:
+        audio = load_audio(audio_file)
+        fields["audio_seconds"] = len(audio) / SAMPLE_RATE
+    return audio
+
+
+# 파일을 창 단위로 읽을 수 있는 오디오로 열기 (처리 시간 지표 기록)
+# 스트리밍 디코딩이면 디스크 PCM 스풀 (spool.path로 워커가 직접 읽음), 아니면 전체 배열
+@contextlib.contextmanager
+def _open_audio(audio_file):
+    if not streaming_enabled():
+        yield None, _decode(audio_file)
+        return
+    with get_metrics().stage("decode") as fields:
+        spool = PcmSpool(audio_file).__enter__()
+        fields["audio_seconds"] = spool.seconds
+        fields["streaming"] = 1
+    try:
+        yield spool.path, spool.audio
+    finally:
+        spool.close()
+
+
+def streaming_enabled():
+    return bool(config.STREAM_DECODE) and ffmpeg_available()
+
+
+# 창 하나의 float32 오디오 (스풀이면 해당 구간만 읽음)
+def _window_audio(audio, window):
+    return to_float32(audio[window.start:window.end]) if audio.dtype == np.int16 else audio[window.start:window.end]
+
+
+# 창별 무음 제거 보고 합산 (겹침 구간이 두 번 세어지지 않도록 창이 담당하는 구간 비율만큼)
+def _merge_vad_reports(total_samples, windows, reports):
+    skipped = 0.0
+    for window, report in zip(windows, reports):
+        length = window.end - window.start
+        if report and length:
+            skipped += report["skipped_seconds"] * (window.keep_end - window.keep_start) / length
+    seconds = total_samples / SAMPLE_RATE
+    return {"original_seconds": seconds, "speech_seconds": max(0.0, seconds - skipped), "skipped_seconds": skipped}
+
+
+# 무음 구간 제거 (처리 시간 지표 기록)
+def _remove_silence(audio):
+    with get_metrics().stage("vad", audio_seconds=len(audio) / SAMPLE_RATE) as fields:
+        compact, offset_map, report = remove_silence(audio)
+        fields["skipped_seconds"] = report["skipped_seconds"]
+    return compact, offset_map, report
+
+
+# 단일 모델로 파일 전체 변환 (vad=True면 무음 구간을 잘라낸 오디오를 디코딩하고 시각을 원본 기준으로 복원)
+# audio_file 대신 이미 디코딩된 16kHz 배열을 넘겨도 됨, model_size는 지표 구분용
+def transcribe_audio(model, audio_file, language="ko", vad=False, model_size=""):
+    if not isinstance(audio_file, np.ndarray) and streaming_enabled():
+        return _transcribe_stream(model, audio_file, language, vad, model_size)
+    audio = audio_file if isinstance(audio_file, np.ndarray) else _decode(audio_file)
+    offset_map = None
+    report = _no_vad_report(len(audio))
+    if vad:
+        audio, offset_map, report = _remove_silence(audio)
+        if len(audio) == 0:
+            return {"text": "", "segments": [], "language": language, "vad": report}
+
+    # 실시간 배율은 무음을 건너뛴 효과가 드러나도록 원본 길이 기준
+    with get_metrics().stage("whisper", model=model_size, audio_seconds=report["original_seconds"],
+                             speech_seconds=report["speech_seconds"]):
+        result = _run_model(model, audio, language)
+    segments = result.get("segments", [])
+    if offset_map is None:
+        return {"text": result["text"], "segments": segments, "language": language}
+    return {
+        "text": result["text"],
+        "segments": remap_segments(segments, offset_map),
+        "language": language,
+        "vad": report,
+    }
+
+
+# 파일을 STREAM_WINDOW_SECONDS 창으로 나눠 차례로 변환 (메모리에는 한 창만 올라감)
+# 창마다 무음 제거 후 시각을 원본 기준으로 옮기고 이음매 중복을 제거해 이어붙임
+def _transcribe_stream(model, audio_file, language, vad, model_size):
+    with _open_audio(audio_file) as (_, audio):
+        windows = split_windows(audio, window_seconds=config.STREAM_WINDOW_SECONDS)
+        window_segments, reports = {}, []
+        for window in windows:
+            result = transcribe_audio(model, _window_audio(audio, window), language=language, vad=vad,
+                                      model_size=model_size)
+            offset = window.start / SAMPLE_RATE
+            window_segments[window.index] = [_shift_segment(segment, offset) for segment in result["segments"]]
+            reports.append(result.get("vad"))
+        total = len(audio)
+    segments = stitch_segments(windows, window_segments)
+    result = {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language,
+    }
+    if vad:
+        result["vad"] = _merge_vad_reports(total, windows, reports)
+    return result
+
+
+# 신뢰도가 낮은 세그먼트 (모델이 확신하지 못했거나, 같은 말을 반복하는 환각 루프)
+def is_low_confidence(segment, logprob_threshold=None, compression_threshold=None):
+    logprob_threshold = config.CASCADE_LOGPROB_THRESHOLD if logprob_threshold is None else logprob_threshold
+    compression_threshold = config.CASCADE_COMPRESSION_THRESHOLD if compression_threshold is None else compression_threshold
+    logprob = segment.get("avg_logprob")
+    compression = segment.get("compression_ratio")
+    return (logprob is not None and logprob < logprob_threshold) or \
+        (compression is not None and compression > compression_threshold)
+
+
+# 재변환할 구간 목록 [(시작 초, 끝 초)]
+# 신뢰도가 낮은 세그먼트를 merge_gap보다 가까우면 하나로 합침 (짧은 구간을 여러 번 변환하지 않도록)
+def select_refine_spans(segments, merge_gap=None):
+    merge_gap = config.CASCADE_MERGE_GAP_SECONDS if merge_gap is None else merge_gap
+    spans = []
+    for segment in segments:
+        if not is_low_confidence(segment):
+            continue
+        if spans and segment["start"] - spans[-1][1] <= merge_gap:
+            spans[-1][1] = max(spans[-1][1], segment["end"])
+        else:
+            spans.append([segment["start"], segment["end"]])
+    return [tuple(span) for span in spans]
+
+
+# 짧은 재변환 구간들을 Whisper 한 창(30초) 안에 들어가도록 묶음 [[(구간 번호, 시작 샘플, 끝 샘플)]]
+# Whisper는 짧은 입력도 30초 창으로 채워 인코딩하므로 구간마다 따로 변환하면 그만큼 계산이 낭비됨
+def _pack_clips(clips, pack_samples, gap_samples):
+    groups = []
+    used = pack_samples
+    for clip in clips:
+        length = clip[2] - clip[1]
+        if groups and used + gap_samples + length <= pack_samples:
+            groups[-1].append(clip)
+            used += gap_samples + length
+        else:
+            groups.append([clip])
+            used = length
+    return groups
+
+
+# 초안 세그먼트 중 재변환 구간에 속한 것을 다시 변환한 세그먼트로 교체
+# 반환: (교체 목록 [{"indices": 초안 세그먼트 번호, "texts": 초안 문장, "segments": 새 세그먼트}], 보고)
+# - 구간 앞뒤로 padding만큼 더 잘라 짧은 무음을 사이에 두고 이어붙여 30초 단위로 변환, 시각은 원본 기준으로 복원
+# - 가운데 지점이 구간 안에 있는 세그먼트만 그 구간의 결과로 사용
+# - 앱에서 초안을 고친 사용자가 있을 수 있으므로 초안 문장도 함께 돌려줘 고치지 않은 세그먼트만 교체
+def refine_segments(model, audio_file, segments, language="ko", model_size="", padding=None, progress_callback=None):
+    padding = config.CASCADE_PADDING_SECONDS if padding is None else padding
+    spans = select_refine_spans(segments)
+    refined = {index: [] for index in range(len(spans))}
+    refined_seconds = 0.0
+    with _open_audio(audio_file) as (_, audio):
+        total_seconds = len(audio) / SAMPLE_RATE
+        clips = [(index, max(0, int((start - padding) * SAMPLE_RATE)), min(len(audio), int((end + padding) * SAMPLE_RATE)))
+                 for index, (start, end) in enumerate(spans)]
+        gap = np.zeros(int(PACK_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+        groups = _pack_clips(clips, int(PACK_SECONDS * SAMPLE_RATE), len(gap))
+        for done, group in enumerate(groups, start=1):
+            pieces, offset_map, position = [], [], 0
+            for _, clip_start, clip_end in group:
+                clip = audio[clip_start:clip_end]
+                pieces += [to_float32(clip) if clip.dtype == np.int16 else clip, gap]
+                offset_map.append((position / SAMPLE_RATE, clip_start / SAMPLE_RATE, len(clip) / SAMPLE_RATE))
+                position += len(clip) + len(gap)
+            packed = np.concatenate(pieces[:-1]).astype(np.float32)
+            refined_seconds += sum(clip_end - clip_start for _, clip_start, clip_end in group) / SAMPLE_RATE
+            with get_metrics().stage("whisper_refine", model=model_size, audio_seconds=len(packed) / SAMPLE_RATE,
+                                     spans=len(group)):
+                result = _run_model(model, packed, language)
+            for segment in remap_segments(result.get("segments", []), offset_map):
+                middle = (segment["start"] + segment["end"]) / 2
+                for index, _, _ in group:
+                    if spans[index][0] <= middle < spans[index][1]:
+                        refined[index].append(_shift_segment(segment, 0.0))
+                        break
+            if progress_callback:
+                progress_callback(done, len(groups))
+
+    # 다시 변환한 결과가 비어 있는 구간은 초안 유지 (무음으로 판단해 말을 통째로 잃지 않도록)
+    replacements = []
+    for index, (start, end) in enumerate(spans):
+        if not refined[index]:
+            continue
+        indices = [position for position, segment in enumerate(segments)
+                   if start <= (segment["start"] + segment["end"]) / 2 < end]
+        replacements.append({
+            "indices": indices,
+            "texts": [segments[position]["text"] for position in indices],
+            "segments": refined[index],
+        })
+    report = {
+        "spans": len(spans),
+        "model_calls": len(groups),
+        "replaced_spans": len(replacements),
+        "refined_segments": sum(len(replacement["indices"]) for replacement in replacements),
+        "total_segments": len(segments),
+        "refined_seconds": refined_seconds,
+        "total_seconds": total_seconds,
+    }
+    return replacements, report
+
+
+# 교체 목록을 초안에 적용 (keep(번호, 초안 문장)이 False인 세그먼트가 하나라도 있는 교체는 건너뜀)
+def splice_segments(segments, replacements, keep=None):
+    replaced = {}
+    for replacement in replacements:
+        if keep and not all(keep(index, text) for index, text in zip(replacement["indices"], replacement["texts"])):
+            continue
+        if not replacement["indices"]:
+            continue
+        for index in replacement["indices"]:
+            replaced[index] = None
+        replaced[replacement["indices"][0]] = replacement["segments"]
+
+    spliced = []
+    for index, segment in enumerate(segments):
+        if index not in replaced:
+            spliced.append(dict(segment))
+        elif replaced[index] is not None:
+            spliced.extend(dict(new_segment) for new_segment in replaced[index])
+    for index, segment in enumerate(spliced):
+        segment["id"] = index
+    return spliced
+
+
+# 타임스탬프 토큰 사이의 토큰을 세그먼트로 [(시작 초, 끝 초, 토큰)]
+# <|0.00|> 문장 <|2.40|><|2.40|> 문장 <|5.00|> 형식, 타임스탬프가 없으면 창 전체가 한 세그먼트
+def _timestamp_pieces(tokens, timestamp_begin, duration):
+    pieces, start, text_tokens = [], 0.0, []
+    for token in tokens:
+        if token < timestamp_begin:
+            text_tokens.append(token)
+            continue
+        position = min((token - timestamp_begin) * TIMESTAMP_SECONDS, duration)
+        if text_tokens:
+            pieces.append((start, max(start, position), text_tokens))
+            text_tokens = []
+        start = position
+    if text_tokens:
+        pieces.append((start, duration, text_tokens))
+    return pieces
+
+
+# 말소리가 없는 창 (model.transcribe처럼 온도를 올려 다시 디코딩하지 않고 건너뜀)
+def _is_no_speech(result):
+    return result.no_speech_prob > BATCH_NO_SPEECH_THRESHOLD and result.avg_logprob < BATCH_LOGPROB_THRESHOLD
+
+
+# 묶음 디코딩 결과 하나를 세그먼트 목록으로 (신뢰도 값은 model.transcribe와 같이 창 단위 값을 세그먼트마다 기록)
+def _batch_window_segments(tokenizer, result, duration):
+    segments = []
+    for start, end, tokens in _timestamp_pieces(result.tokens, tokenizer.timestamp_begin, duration):
+        text = tokenizer.decode(tokens)
+        if not text.strip():
+            continue
+        segments.append({
+            "start": start,
+            "end": end,
+            "text": text,
+            "avg_logprob": result.avg_logprob,
+            "compression_ratio": result.compression_ratio,
+            "no_speech_prob": result.no_speech_prob,
+        })
+    return segments
+
+
+# 온도 0 디코딩이 실패한 창 (model.transcribe라면 온도를 올려 다시 디코딩하는 경우)
+def _needs_fallback(result):
+    return result.compression_ratio > BATCH_COMPRESSION_THRESHOLD or result.avg_logprob < BATCH_LOGPROB_THRESHOLD
+
+
+# 묶음 디코딩을 쓸 수 없는 모델 (openai-whisper가 아니거나 decode API가 없는 버전)
+def batch_supported(model):
+    whisper = get_whisper()
+    return all(hasattr(whisper, name) for name in ("decode", "DecodingOptions", "log_mel_spectrogram")) and \
+        hasattr(model, "dims")
+
+
+def _batch_tokenizer(model, language):
+    from whisper.tokenizer import get_tokenizer
+    extra = {"num_languages": model.num_languages} if hasattr(model, "num_languages") else {}
+    return get_tokenizer(model.is_multilingual, language=language, task="transcribe", **extra)
+
+
+# 창 여러 개를 30초로 채운 멜 스펙트로그램으로 쌓아 한 번에 인코딩/디코딩
+def _decode_batch(model, chunks, language):
+    import torch
+    whisper = get_whisper()
+    mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(chunk), model.dims.n_mels) for chunk in chunks]
+    with inference_context():
+        return whisper.decode(model, torch.stack(mels).to(model.device),
+                              whisper.DecodingOptions(language=language, fp16=False))
+
+
+# 짧은 녹음 여러 개를 한 모델로 묶어 변환
+# - 파일마다 무음 지점에서 30초 이하 창으로 나누고, 모든 파일의 창을 batch_size개씩 쌓아 인코더/디코더를 한 번에 실행
+#   (model.transcribe는 30초 창 하나씩 처리해 짧은 파일이 많으면 행렬 연산 효율이 낮음)
+# - 창마다 (파일 번호, 창 번호)를 기억해 결과를 원래 파일로 돌려보내고 파일별로 이어붙임
+# - 온도 0 디코딩이 실패한 창만 model.transcribe로 다시 변환 (온도를 올려 재시도)
+# - 창끼리 앞 창의 문장을 프롬프트로 이어받지 않으므로 긴 녹음은 transcribe_audio가 더 정확함
+# 반환: (파일 순서대로 transcribe_audio와 같은 형식의 결과 목록, 보고)
+def transcribe_batch(model, audio_files, language="ko", vad=False, model_size="", batch_size=None,
+                     progress_callback=None):
+    batch_size = max(1, batch_size or config.BATCH_DECODE_SIZE)
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    if not batch_supported(model):
+        # 파일별 변환 (처리량 보고를 위해 묶음 변환처럼 파일마다 한 번 디코딩해 원본 길이를 합산)
+        results = []
+        audio_seconds = 0.0
+        for done, audio_file in enumerate(audio_files, start=1):
+            audio = audio_file if isinstance(audio_file, np.ndarray) else _decode(audio_file)
+            audio_seconds += len(audio) / SAMPLE_RATE
+            results.append(transcribe_audio(model, audio, language=language, vad=vad, model_size=model_size))
+            if progress_callback:
+                progress_callback(done, len(audio_files))
+        return results, _batch_report(len(audio_files), len(audio_files), 0, 0, audio_seconds, started, cpu_started,
+                                      batched=False)
+
+    files = []
+    items = []
+    for file_index, audio_file in enumerate(audio_files):
+        audio = audio_file if isinstance(audio_file, np.ndarray) else _decode(audio_file)
+        offset_map = None
+        report = _no_vad_report(len(audio))
+        if vad:
+            audio, offset_map, report = _remove_silence(audio)
+        windows = split_windows(audio, window_seconds=PACK_SECONDS - BATCH_SEARCH_SECONDS, overlap_seconds=0,
+                                search_seconds=BATCH_SEARCH_SECONDS) if len(audio) else []
+        files.append({"audio": audio, "windows": windows, "offset_map": offset_map, "vad": report, "segments": {}})
+        items += [(file_index, window) for window in windows]
+
+    tokenizer = _batch_tokenizer(model, language)
+    audio_seconds = sum(item["vad"]["original_seconds"] for item in files)
+    fallback = 0
+    batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+    with get_metrics().stage("whisper_batch", model=model_size, audio_seconds=audio_seconds, files=len(files),
+                             windows=len(items)) as fields:
+        for done, batch in enumerate(batches, start=1):
+            chunks = [files[file_index]["audio"][window.start:window.end] for file_index, window in batch]
+            for (file_index, window), chunk, result in zip(batch, chunks, _decode_batch(model, chunks, language)):
+                offset = window.start / SAMPLE_RATE
+                if _is_no_speech(result):
+                    segments = []
+                elif _needs_fallback(result):
+                    fallback += 1
+                    segments = _run_model(model, chunk, language).get("segments", [])
+                else:
+                    segments = _batch_window_segments(tokenizer, result, len(chunk) / SAMPLE_RATE)
+                files[file_index]["segments"][window.index] = [_shift_segment(segment, offset) for segment in segments]
+            if progress_callback:
+                progress_callback(done, len(batches))
+        fields["batches"] = len(batches)
+        fields["fallback_windows"] = fallback
+
+    results = []
+    for item in files:
+        segments = stitch_segments(item["windows"], item["segments"])
+        if item["offset_map"] is not None:
+            segments = remap_segments(segments, item["offset_map"])
+        result = {"text": "".join(segment["text"] for segment in segments), "segments": segments,
+                  "language": language}
+        if vad:
+            result["vad"] = item["vad"]
+        results.append(result)
+    return results, _batch_report(len(files), len(items), len(batches), fallback, audio_seconds, started, cpu_started)
+
+
+# 묶음 변환 보고 (처리량은 분당 파일 수)
+def _batch_report(files, windows, batches, fallback, audio_seconds, started, cpu_started, batched=True):
+    seconds = time.perf_counter() - started
+    return {
+        "files": files,
+        "windows": windows,
+        "batches": batches,
+        "fallback_windows": fallback,
+        "audio_seconds": audio_seconds,
+        "seconds": seconds,
+        "cpu_seconds": time.process_time() - cpu_started,
+        "files_per_minute": files * 60 / seconds if seconds else 0.0,
+        "batched": batched,
+    }
+
+
+# 워커 프로세스별 Whisper 모델
+_worker_model = None
+
+
+def _init_worker(model_size, threads):
+    global _worker_model
+    from model_registry import configure_torch_threads, load_whisper
+    # 워커끼리 코어를 나눠 쓰도록 프로세스당 연산 스레드 수 고정
+    configure_torch_threads(threads)
+    _worker_model = load_whisper(model_size)
+
+
+# 창 하나 변환, 워커 프로세스의 CPU 시간을 함께 반환 (부모 프로세스에서 합산)
+# source는 창의 float32 배열이거나 PCM 스풀 경로 (이 경우 워커가 [start, end) 구간만 직접 읽음)
+def _transcribe_window(index, source, start, end, language, vad):
+    cpu_started = time.process_time()
+    audio = read_pcm(source, start, end) if isinstance(source, str) else source
+    report = None
+    offset_map = None
+    if vad:
+        audio, offset_map, report = remove_silence(audio)
+    segments = _run_model(_worker_model, audio, language)["segments"] if len(audio) else []
+    if offset_map is not None:
+        segments = remap_segments(segments, offset_map)
+    segments = [_shift_segment(segment, start / SAMPLE_RATE) for segment in segments]
+    return index, segments, report, time.process_time() - cpu_started
+
+
+# 병렬 변환 워커 수 상한 (워커마다 모델을 따로 로드하므로 코어와 모델 메모리 예산을 slots개 변환이 나눠 씀)
+def parallel_worker_limit(model_size, slots=1):
+    from model_registry import estimate_model_bytes
+    slots = max(1, slots)
+    cores = max(1, (os.cpu_count() or 1) // slots)
+    model_bytes = estimate_model_bytes(model_size)
+    if not model_bytes:
+        return cores
+    budget = config.MODEL_MEMORY_BUDGET_MB * 1024 * 1024 // slots
+    return max(1, min(cores, budget // model_bytes))
+
+
+# 긴 오디오를 무음 지점 기준 창으로 나눠 프로세스 풀에서 병렬 변환
+# 창마다 무음을 제거하고, 스트리밍 디코딩이면 워커가 스풀에서 자기 창만 읽어 부모 프로세스는 오디오를 들고 있지 않음
+# slots: 동시에 실행될 수 있는 변환 수 (작업 대기열 워커 수), 워커 수와 스레드 수를 그만큼 나눠 잡음
+def transcribe_parallel(audio_file, model_size, language="ko", workers=None, progress_callback=None, vad=False,
+                        slots=1):
+    with _open_audio(audio_file) as (pcm_path, audio):
+        total = len(audio)
+        windows = split_windows(audio)
+
+        cores = max(1, (os.cpu_count() or 1) // max(1, slots))
+        workers = min(workers or config.TRANSCRIBE_WORKERS, len(windows), parallel_worker_limit(model_size, slots))
+        workers = max(1, workers)
+        threads = max(1, cores // workers)
+
+        window_segments = {}
+        reports = [None] * len(windows)
+        worker_cpu_seconds = 0.0
+        started = time.perf_counter()
+        # Streamlit 서버 스레드를 fork하지 않도록 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(model_size, threads)) as pool:
+            futures = [
+                pool.submit(_transcribe_window, window.index, pcm_path or audio[window.start:window.end],
+                            window.start, window.end, language, vad)
+                for window in windows
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                index, segments, report, cpu_seconds = future.result()
+                window_segments[index] = segments
+                reports[index] = report
+                worker_cpu_seconds += cpu_seconds
+                if progress_callback:
+                    progress_callback(done, len(windows))
+
+    report = _merge_vad_reports(total, windows, reports) if vad else _no_vad_report(total)
+    # 모델 로드를 포함한 전체 시간, CPU는 워커 프로세스들의 변환 시간 합계
+    get_metrics().record("whisper_parallel", time.perf_counter() - started, worker_cpu_seconds, model=model_size,
+                         audio_seconds=report["original_seconds"], speech_seconds=report["speech_seconds"],
+                         windows=len(windows), workers=workers)
+
+    segments = stitch_segments(windows, window_segments)
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language,
+        "vad": report,
+    }
@@ -0,0 +1,169 @@
+import os
+import stat
+import time
+import hashlib
+import threading
+
+# 업로드 복사 단위
+CHUNK_SIZE = 1024 * 1024
+# 쓰는 중인 파일 접미사
+PARTIAL_SUFFIX = ".part"
+
+
+class SpoolFullError(Exception):
+    pass
+
+
+# 업로드 오디오를 내용 해시 이름으로 보관하는 스풀 디렉터리
+# - 같은 내용은 재실행/세션과 관계없이 한 번만 저장
+# - 세션별 참조(마지막 사용 시각)가 TTL 안에 있는 파일은 삭제하지 않음
+# - 참조가 없고 TTL이 지난 파일, 또는 용량 초과 시 오래된 파일부터 정리
+# - 하위 디렉터리(live/, session/, pcm/)는 각 기능이 직접 관리하므로 정리하지 않고 용량 합계에만 포함
+class UploadSpool:
+    def __init__(self, directory, quota_bytes, ttl_seconds, sweep_interval=60):
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._refs = {}  # path -> {session_id: 마지막 사용 시각}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    # 파일 객체를 고정 크기 청크로 복사하면서 해시를 계산하고 스풀 경로를 반환
+    def ingest(self, fileobj, suffix, session_id, chunk_size=CHUNK_SIZE):
+        self.sweep(force=False)
+        digest = hashlib.sha256()
+        partial_path = os.path.join(self.directory, f"{session_id}-{time.time_ns()}{PARTIAL_SUFFIX}")
+        written = 0
+        try:
+            with open(partial_path, "wb") as out:
+                for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+                    written += len(chunk)
+                    if written > self.quota_bytes:
+                        raise SpoolFullError("업로드 파일이 스풀 용량 한도보다 큽니다.")
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            path = os.path.join(self.directory, digest.hexdigest() + suffix)
+            if os.path.exists(path):
+                # 이미 같은 내용이 스풀에 있으면 새로 쓴 사본은 버림
+                os.remove(partial_path)
+                os.utime(path, None)
+            else:
+                self._ensure_space(written)
+                os.replace(partial_path, path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        self.acquire(path, session_id)
+        return path
+
+    def acquire(self, path, session_id):
+        with self._lock:
+            self._refs.setdefault(path, {})[session_id] = time.time()
+
+    # 세션이 더 이상 사용하지 않는 파일의 참조 해제 (path가 없으면 세션의 모든 참조)
+    def release(self, session_id, path=None):
+        with self._lock:
+            paths = [path] if path else list(self._refs)
+            for ref_path in paths:
+                sessions = self._refs.get(ref_path)
+                if sessions is None:
+                    continue
+                sessions.pop(session_id, None)
+                if not sessions:
+                    del self._refs[ref_path]
+
+    def ref_count(self, path):
+        now = time.time()
+        with self._lock:
+            sessions = self._refs.get(path, {})
+            return sum(1 for seen in sessions.values() if now - seen < self.ttl_seconds)
+
+    # 스풀 최상위의 업로드 파일 (mtime, 크기, 경로), 오래된 순
+    def _files(self):
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(info.st_mode):
+                files.append((info.st_mtime, info.st_size, path))
+        return sorted(files)
+
+    # 하위 디렉터리의 파일 크기 합계 (실시간 녹음, 세션 상태, PCM 스풀)
+    def _subdirectory_bytes(self):
+        total = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path) or os.path.islink(path):
+                continue
+            for root, _, names in os.walk(path):
+                for file_name in names:
+                    try:
+                        total += os.lstat(os.path.join(root, file_name)).st_size
+                    except OSError:
+                        continue
+        return total
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        with self._lock:
+            self._refs.pop(path, None)
+        return True
+
+    # 새 파일을 넣을 공간 확보 (참조 중인 파일과 하위 디렉터리는 건드리지 않음)
+    def _ensure_space(self, incoming_bytes):
+        files = [f for f in self._files() if not f[2].endswith(PARTIAL_SUFFIX)]
+        total = sum(size for _, size, _ in files) + self._subdirectory_bytes()
+        for _, size, path in files:
+            if total + incoming_bytes <= self.quota_bytes:
+                return
+            if self.ref_count(path):
+                continue
+            if self._remove(path):
+                total -= size
+        if total + incoming_bytes > self.quota_bytes:
+            raise SpoolFullError("업로드 스풀 용량이 부족합니다. 잠시 후 다시 시도해주세요.")
+
+    # 만료된 참조와 TTL이 지난 미참조 파일 정리
+    def sweep(self, force=True):
+        now = time.time()
+        if not force and now - self._last_sweep < self.sweep_interval:
+            return 0
+        self._last_sweep = now
+
+        with self._lock:
+            for path in list(self._refs):
+                sessions = self._refs[path]
+                for session_id, seen in list(sessions.items()):
+                    if now - seen >= self.ttl_seconds:
+                        del sessions[session_id]
+                if not sessions:
+                    del self._refs[path]
+
+        removed = 0
+        for mtime, _, path in self._files():
+            if now - mtime < self.ttl_seconds or self.ref_count(path):
+                continue
+            if self._remove(path):
+                removed += 1
+        return removed
+
+    def usage(self):
+        files = [f for f in self._files() if not f[2].endswith(PARTIAL_SUFFIX)]
+        return {
+            "files": len(files),
+            "bytes": sum(size for _, size, _ in files),
+            "other_bytes": self._subdirectory_bytes(),
+            "quota_bytes": self.quota_bytes,
+            "referenced": sum(1 for _, _, path in files if self.ref_count(path)),
+        }
@@ -0,0 +1,120 @@
+import numpy as np
+
+import config
+
+SAMPLE_RATE = 16000
+# 이 값(dB) 이하의 프레임은 항상 무음으로 취급
+ABSOLUTE_SILENCE_DB = -50.0
+
+
+# 프레임별 에너지(dB) 계산
+def frame_energy_db(audio, frame_length):
+    count = len(audio) // frame_length
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame_length].reshape(count, frame_length).astype(np.float32)
+    power = np.mean(frames * frames, axis=1)
+    return 10.0 * np.log10(power + 1e-10)
+
+
+# True/False 프레임 배열을 (시작, 끝) 프레임 구간 목록으로 변환
+def _runs(mask):
+    padded = np.concatenate(([False], mask, [False]))
+    changes = np.flatnonzero(padded[1:] != padded[:-1])
+    return changes.reshape(-1, 2)
+
+
+# 에너지 기반 음성 구간 검출 (샘플 단위 (시작, 끝) 배열)
+# - 잡음 바닥(하위 백분위 에너지)보다 threshold_db 이상 큰 프레임을 음성으로 판단
+# - 짧은 무음은 이어 붙이고, 짧은 음성은 버리고, 앞뒤로 여유(padding)를 둠
+def detect_speech(audio, frame_seconds=None, threshold_db=None, min_silence_seconds=None,
+                  min_speech_seconds=None, padding_seconds=None):
+    frame_seconds = frame_seconds or config.VAD_FRAME_SECONDS
+    threshold_db = config.VAD_THRESHOLD_DB if threshold_db is None else threshold_db
+    min_silence_seconds = config.VAD_MIN_SILENCE_SECONDS if min_silence_seconds is None else min_silence_seconds
+    min_speech_seconds = config.VAD_MIN_SPEECH_SECONDS if min_speech_seconds is None else min_speech_seconds
+    padding_seconds = config.VAD_PADDING_SECONDS if padding_seconds is None else padding_seconds
+
+    frame = int(frame_seconds * SAMPLE_RATE)
+    energy = frame_energy_db(audio, frame)
+    if len(energy) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    noise_floor, loud = np.percentile(energy, [10, 90])
+    if loud - noise_floor < threshold_db:
+        # 조용한 구간이 거의 없는 녹음(쉬지 않고 말하는 경우 등)은 절대 기준으로만 판단
+        threshold = ABSOLUTE_SILENCE_DB
+    else:
+        # 완전 무음 파일에서 잡음 바닥이 너무 낮게 잡히지 않도록 절대 하한 적용
+        threshold = max(noise_floor + threshold_db, ABSOLUTE_SILENCE_DB)
+    speech = energy > threshold
+
+    # 짧은 무음 구간 메우기
+    min_silence = int(round(min_silence_seconds / frame_seconds))
+    for start, end in _runs(~speech):
+        if start > 0 and end < len(speech) and end - start < min_silence:
+            speech[start:end] = True
+
+    # 짧은 음성 구간 제거
+    min_speech = int(round(min_speech_seconds / frame_seconds))
+    for start, end in _runs(speech):
+        if end - start < min_speech:
+            speech[start:end] = False
+
+    padding = int(padding_seconds * SAMPLE_RATE)
+    spans = _runs(speech) * frame
+    if len(spans) == 0:
+        return spans
+    spans[:, 0] = np.maximum(spans[:, 0] - padding, 0)
+    spans[:, 1] = np.minimum(spans[:, 1] + padding, len(audio))
+
+    # 여유를 둔 뒤 겹치는 구간 병합
+    merged = [spans[0].copy()]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append(np.array([start, end]))
+    return np.array(merged, dtype=np.int64)
+
+
+# 무음 구간을 잘라낸 오디오와 오프셋 맵 반환
+# 오프셋 맵: [(압축 오디오 시작 초, 원본 시작 초, 길이 초), ...]
+def remove_silence(audio):
+    spans = detect_speech(audio)
+    offset_map = []
+    pieces = []
+    position = 0
+    for start, end in spans:
+        pieces.append(audio[start:end])
+        offset_map.append((position / SAMPLE_RATE, start / SAMPLE_RATE, (end - start) / SAMPLE_RATE))
+        position += end - start
+
+    compact = np.concatenate(pieces) if pieces else np.zeros(0, dtype=audio.dtype)
+    report = {
+        "original_seconds": len(audio) / SAMPLE_RATE,
+        "speech_seconds": len(compact) / SAMPLE_RATE,
+        "skipped_seconds": (len(audio) - len(compact)) / SAMPLE_RATE,
+    }
+    return compact, offset_map, report
+
+
+# 압축 오디오 기준 시각을 원본 녹음 기준 시각으로 변환
+def to_original_time(seconds, offset_map):
+    if not offset_map:
+        return seconds
+    starts = [compact_start for compact_start, _, _ in offset_map]
+    index = max(0, int(np.searchsorted(starts, seconds, side="right")) - 1)
+    compact_start, original_start, duration = offset_map[index]
+    return original_start + min(seconds - compact_start, duration)
+
+
+# 세그먼트 타임스탬프를 원본 녹음 기준으로 변환
+def remap_segments(segments, offset_map):
+    remapped = []
+    for segment in segments:
+        segment = dict(segment)
+        segment["start"] = to_original_time(segment["start"], offset_map)
+        segment["end"] = to_original_time(segment["end"], offset_map)
+        remapped.append(segment)
+    return remapped